@@ -0,0 +1,86 @@
+# benchmarks/bench_import_time.py
+"""
+Cold-start cost of each backend: the time a fresh interpreter takes to import app.py, and the
+modules that dominate it (from python -X importtime).
+
+    python benchmarks/bench_import_time.py [--runs 5] [--top 10] [--warm-up off|background|eager]
+
+Every run is a new process, so nothing is served from an already-imported module. The warm-up
+defaults to off to measure the import alone; --warm-up eager shows the cost the lazy imports defer.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKENDS = ('resume-enhancer-backend', 'career-guidance-backend')
+
+IMPORT_APP = (
+    "import sys, time\n"
+    "started = time.perf_counter()\n"
+    "import app\n"
+    "print((time.perf_counter() - started) * 1000)\n"
+)
+
+
+def backend_env(tmp, warm_up):
+    env = dict(os.environ)
+    env.update(
+        GROQ_API_KEY=env.get('GROQ_API_KEY', 'import-time-benchmark'),
+        WARM_UP=warm_up,
+        # No job workers, and throwaway cache and queue files
+        JOB_WORKERS='0',
+        LLM_CACHE_PATH=os.path.join(tmp, 'llm_cache.sqlite3'),
+        JOB_QUEUE_PATH=os.path.join(tmp, 'jobs.sqlite3'),
+        RESUME_TEXT_CACHE_PATH=os.path.join(tmp, 'resume_text.sqlite3'),
+    )
+    return env
+
+
+def import_ms(backend, env):
+    """Milliseconds to import the backend's app module in a fresh interpreter"""
+    result = subprocess.run([sys.executable, '-c', IMPORT_APP], cwd=os.path.join(ROOT, backend), env=env,
+                            capture_output=True, text=True, check=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def slowest_modules(backend, env, top):
+    """Top-level packages by cumulative import time, from one -X importtime run"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'], cwd=os.path.join(ROOT, backend),
+                            env=env, capture_output=True, text=True, check=True)
+    totals = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Nesting is shown by indentation; only modules imported directly by app are counted, so nothing
+        # is counted twice
+        if name.startswith('   ') and not name.startswith('    '):
+            name = name.strip().split('.')[0]
+            totals[name] = totals.get(name, 0) + int(cumulative)
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10, help='slowest imported packages to list')
+    parser.add_argument('--warm-up', default='off', choices=('off', 'background', 'eager'))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = backend_env(tmp, args.warm_up)
+        for backend in BACKENDS:
+            times = [import_ms(backend, env) for _ in range(args.runs)]
+            print(f"{backend}: median {statistics.median(times):.0f} ms, "
+                  f"min {min(times):.0f} ms, max {max(times):.0f} ms over {args.runs} runs")
+            for name, cumulative_us in slowest_modules(backend, env, args.top):
+                print(f"  {name:<24}{cumulative_us / 1000:>8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+# benchmarks/bench_json_extract.py
+"""
+Correctness and speed of career-guidance JSON extraction on a corpus of malformed model
+responses (benchmarks/json_corpus.json), comparing the single-pass extractor with the
+cleanup cascade it replaced.
+
+    python benchmarks/bench_json_extract.py [iterations]
+
+Exits non-zero if the extractor gets any corpus case wrong.
+"""
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resume_core.json_extract import JsonExtractionError, extract_json_object
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "json_corpus.json")
+
+
+def legacy_extract(response):
+    """The cleanup cascade analyze_career_guidance used before the single-pass extractor"""
+    # Clean the response to extract JSON
+    json_str = response.strip()
+    
+    # Remove any leading/trailing whitespace and newlines
+    json_str = json_str.strip()
+    
+    # Remove markdown code blocks if present
+    if "json" in json_str:
+        json_start = json_str.find("json") + 7
+        json_end = json_str.find("", json_start)
+        json_str = json_str[json_start:json_end].strip()
+    elif "" in json_str:
+        json_start = json_str.find("") + 3
+        json_end = json_str.find("```", json_start)
+        json_str = json_str[json_start:json_end].strip()
+    
+    # Find JSON object boundaries - look for the first { and last }
+    if "{" in json_str and "}" in json_str:
+        json_start = json_str.find("{")
+        json_end = json_str.rfind("}") + 1
+        json_str = json_str[json_start:json_end]
+    
+    # Remove any text before the first { or after the last }
+    json_str = json_str.strip()
+    if json_str.startswith('"') or json_str.startswith("'"):
+        # Find the first { after any quotes
+        brace_pos = json_str.find('{')
+        if brace_pos > 0:
+            json_str = json_str[brace_pos:]
+    
+    # Clean up common JSON issues more aggressively
+    json_str = re.sub(r'\\n', '', json_str)  # Remove literal \n
+    json_str = re.sub(r'\n', '', json_str)   # Remove actual newlines
+    json_str = re.sub(r'\r', '', json_str)   # Remove carriage returns
+    json_str = re.sub(r'\\"', '"', json_str) # Fix escaped quotes
+    json_str = re.sub(r'\\t', '', json_str)  # Remove tabs
+    json_str = re.sub(r'\\r', '', json_str)  # Remove literal \r
+    
+    # Remove any leading/trailing whitespace again
+    json_str = json_str.strip()
+    
+    # Try to fix common JSON formatting issues
+    json_str = json_str.replace('"', '"').replace('"', '"')
+    json_str = json_str.replace(''', "'").replace(''', "'")
+    
+    # Final cleanup - remove any remaining non-JSON text
+    if json_str.startswith('"') or json_str.startswith("'"):
+        # Find the first { after any quotes
+        brace_pos = json_str.find('{')
+        if brace_pos > 0:
+            json_str = json_str[brace_pos:]
+    
+    # Handle specific error patterns like " and end with "
+    if " and end with " in json_str:
+        # Find the JSON part after this text
+        parts = json_str.split(" and end with ")
+        if len(parts) > 1:
+            json_str = parts[1].strip()
+    
+    # Remove any text that starts with quotes or common error patterns
+    error_patterns = ["' and end with '", '" and end with "', "Here is the JSON:", "The JSON response:", "JSON:"]
+    for pattern in error_patterns:
+        if pattern in json_str:
+            json_str = json_str.split(pattern)[-1].strip()
+    
+    # Ensure we have a complete JSON object
+    if not json_str.startswith('{') or not json_str.endswith('}'):
+        # Try to find the complete JSON object
+        start_pos = json_str.find('{')
+        end_pos = json_str.rfind('}')
+        if start_pos >= 0 and end_pos > start_pos:
+            json_str = json_str[start_pos:end_pos + 1]
+    
+    # Debug: Print the cleaned JSON string
+    
+    # Validate JSON before parsing
+    if not json_str or len(json_str) < 10:
+        raise ValueError("JSON string is too short or empty")
+    
+    # Parse JSON
+    return json.loads(json_str)
+
+
+def run(extract, response):
+    try:
+        return extract(response)
+    except (JsonExtractionError, ValueError):
+        return None
+
+
+def measure(extract, response, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        run(extract, response)
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def large_response(members, broken=False):
+    """A response with many long members, to show how cost grows with size"""
+    value = "Lead a migration project.\n- Define milestones\n- Mentor two engineers " * 4
+    response = json.dumps({f"section_{index}": value for index in range(members)})
+    # A trailing comma sends the response through the repair pass
+    return response[:-1] + ',}' if broken else response
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        corpus = json.load(f)
+
+    failures = 0
+    legacy_correct = 0
+    print(f"{'case':<26}{'extractor':>10}{'legacy':>8}{'extractor (us)':>16}{'legacy (us)':>13}")
+    for case in corpus:
+        ok = run(extract_json_object, case["response"]) == case["expected"]
+        legacy_ok = run(legacy_extract, case["response"]) == case["expected"]
+        failures += not ok
+        legacy_correct += legacy_ok
+        print(f"{case['name']:<26}{'ok' if ok else 'FAIL':>10}{'ok' if legacy_ok else 'wrong':>8}"
+              f"{measure(extract_json_object, case['response'], iterations):>16.1f}"
+              f"{measure(legacy_extract, case['response'], iterations):>13.1f}")
+    print(f"\nextractor: {len(corpus) - failures}/{len(corpus)} correct, legacy: {legacy_correct}/{len(corpus)}")
+
+    print(f"\n{'response size':<16}{'valid (us/KB)':>15}{'repaired (us/KB)':>18}")
+    for members in (10, 40, 160):
+        valid, broken = large_response(members), large_response(members, broken=True)
+        size_kb = len(valid) / 1024
+        valid_us = measure(extract_json_object, valid, max(1, iterations // 10)) / size_kb
+        broken_us = measure(extract_json_object, broken, max(1, iterations // 10)) / size_kb
+        print(f"{size_kb:>13.0f} KB{valid_us:>15.1f}{broken_us:>18.1f}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+# benchmarks/bench_render_assets.py
+"""
+Per-render cost of font and paragraph-style setup, before and after the shared registry.
+
+    python benchmarks/bench_render_assets.py [iterations]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import ImageFont
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+from resume_core import render_assets
+
+
+def uncached_fonts():
+    """The probing the JPG renderer used to do on every call"""
+    try:
+        return [ImageFont.truetype("arial.ttf", size) for size in (48, 32, 24)]
+    except Exception:
+        try:
+            return [ImageFont.truetype("/System/Library/Fonts/Arial.ttf", size) for size in (48, 32, 24)]
+        except Exception:
+            return [ImageFont.load_default() for _ in range(3)]
+
+
+def uncached_styles():
+    """The style sheet the PDF renderer used to rebuild on every call"""
+    styles = getSampleStyleSheet()
+    return [
+        ParagraphStyle('CustomTitle', parent=styles['Heading1'], fontSize=24, spaceAfter=30,
+                       alignment=1, textColor=colors.darkblue),
+        ParagraphStyle('CustomHeading', parent=styles['Heading2'], fontSize=14, spaceAfter=12,
+                       spaceBefore=12, textColor=colors.darkblue),
+        ParagraphStyle('CustomNormal', parent=styles['Normal'], fontSize=10, spaceAfter=6),
+    ]
+
+
+def cached_fonts():
+    return [render_assets.get_font(size) for size in render_assets.JPG_FONT_SIZES.values()]
+
+
+def cached_styles():
+    return render_assets.get_paragraph_styles()
+
+
+def measure(func, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    render_assets.warm_up()
+    print(f"{'setup':<10}{'per-render before (us)':>26}{'after (us)':>14}{'saved (us)':>14}")
+    for name, before, after in (("fonts", uncached_fonts, cached_fonts), ("styles", uncached_styles, cached_styles)):
+        before_us = measure(before, iterations)
+        after_us = measure(after, iterations)
+        print(f"{name:<10}{before_us:>26.1f}{after_us:>14.2f}{before_us - after_us:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,273 @@
+# benchmarks/loadtest.py
+"""
+End-to-end load test of both backends against the offline Groq mock (benchmarks/mock_groq.py).
+
+    python benchmarks/loadtest.py --spawn [--scenarios tool_fast,career_guidance] [--concurrency 1,4,16]
+        [--requests 40] [--mock-args "--error-rate 0.02 --malformed-rate 0.1"] [--json results.json]
+
+With --spawn the mock and both backends are started as subprocesses on free local ports, with
+their caches and job queue in a temporary directory, so a run needs no network, API key or
+running services. Without it, --enhancer-url and --career-url point at backends already running
+(start them with GROQ_BASE_URL set to a mock). Every scenario runs --requests requests at each
+concurrency level and reports throughput and p50/p95/p99 latency. LLM responses are never
+served from the cache (no_cache=1), so /tool numbers include the mock's latency every time.
+"""
+import argparse
+import json
+import os
+import shlex
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from resume_core.rendering import create_pdf_resume
+
+DEFAULT_MOCK_ARGS = "--latency lognormal:400:0.5 --model-latency llama-3.1-70b-versatile=lognormal:1500:0.4 " \
+                    "--tokens-per-second 400 --seed 1"
+READY_TIMEOUT_SECONDS = 60
+
+SAMPLE_RESUME = """Jane Doe
+jane.doe@example.com | +1 555 010 0199 | linkedin.com/in/janedoe
+
+Summary
+Backend engineer with 6 years of experience building Python services on AWS.
+
+Experience
+Senior Software Engineer, Acme Corp, 2021 - Present
+- Led the migration of 40 services to Kubernetes, cutting deploy time by 60%
+- Designed a PostgreSQL event pipeline processing 2M events per day
+- Mentored 4 engineers
+
+Software Engineer, Initech, 2018 - 2021
+- Built REST APIs in Flask serving 10k requests per minute
+- Reduced cloud costs by 25% through caching
+
+Education
+B.S. Computer Science, State University, 2018
+
+Skills
+Python, Flask, PostgreSQL, Docker, Kubernetes, AWS, Redis
+"""
+
+SAMPLE_JD = """Senior Backend Engineer
+We are looking for a backend engineer to design and operate Python services at scale.
+Requirements: 5+ years with Python and Flask or Django, PostgreSQL, Docker and Kubernetes,
+AWS, CI/CD and Terraform. Experience with event-driven systems and mentoring is a plus."""
+
+
+def _tool(mode):
+    def request(client, urls, sample):
+        return client.post(urls['enhancer'] + '/tool',
+                           data={'jd': SAMPLE_JD, 'resume': SAMPLE_RESUME, 'mode': mode, 'no_cache': '1'})
+    return request
+
+
+def _tool_stream(client, urls, sample):
+    # Read the whole event stream: latency is time to the last event
+    with client.stream('POST', urls['enhancer'] + '/tool/stream',
+                       data={'jd': SAMPLE_JD, 'resume': SAMPLE_RESUME}) as response:
+        for _ in response.iter_bytes():
+            pass
+    return response
+
+
+def _career_guidance(client, urls, sample):
+    return client.post(urls['career'] + '/career_guidance',
+                       files={'resume_file': ('resume.pdf', sample['pdf'], 'application/pdf')})
+
+
+def _ats_score(client, urls, sample):
+    return client.post(urls['career'] + '/ats_score', json={'resume': SAMPLE_RESUME, 'jd': SAMPLE_JD})
+
+
+def _download(kind):
+    def request(client, urls, sample):
+        return client.post(urls['enhancer'] + f'/download_{kind}', json={'text': sample['enhanced']})
+    return request
+
+
+SCENARIOS = {
+    'tool_fast': _tool('fast'),
+    'tool_standard': _tool('standard'),
+    'tool_thorough': _tool('thorough'),
+    'tool_stream': _tool_stream,
+    'career_guidance': _career_guidance,
+    'ats_score': _ats_score,
+    'download_pdf': _download('pdf'),
+    'download_docx': _download('docx'),
+    'download_jpg': _download('jpg'),
+}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def run_level(request, urls, sample, concurrency, total):
+    """Send total requests from concurrency threads; returns the level's summary"""
+    latencies, statuses = [], {}
+    lock = threading.Lock()
+    remaining = [total]
+
+    def worker():
+        with httpx.Client(timeout=300) as client:
+            while True:
+                with lock:
+                    if not remaining[0]:
+                        return
+                    remaining[0] -= 1
+                start = time.perf_counter()
+                try:
+                    status = request(client, urls, sample).status_code
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                elapsed = (time.perf_counter() - start) * 1000
+                with lock:
+                    latencies.append(elapsed)
+                    statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    errors = sum(count for status, count in statuses.items() if not (isinstance(status, int) and status < 400))
+    return {
+        'concurrency': concurrency,
+        'requests': total,
+        'errors': errors,
+        'statuses': {str(status): count for status, count in sorted(statuses.items(), key=str)},
+        'throughput_rps': round(total / wall, 2),
+        'p50_ms': round(percentile(latencies, 50), 1),
+        'p95_ms': round(percentile(latencies, 95), 1),
+        'p99_ms': round(percentile(latencies, 99), 1),
+    }
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _wait_ready(url, process, log_path):
+    deadline = time.monotonic() + READY_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{url} exited during startup; see {log_path}")
+        try:
+            httpx.get(url, timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} not ready after {READY_TIMEOUT_SECONDS}s; see {log_path}")
+
+
+def spawn_stack(mock_args, workdir):
+    """Start the mock and both backends; returns (urls, processes)"""
+    processes = []
+
+    def start(name, argv, cwd, env=None):
+        log_path = os.path.join(workdir, f"{name}.log")
+        log = open(log_path, 'w')
+        process = subprocess.Popen(argv, cwd=cwd, env=env, stdout=log, stderr=subprocess.STDOUT)
+        processes.append(process)
+        return process, log_path
+
+    mock_port = _free_port()
+    mock, log_path = start('mock_groq', [sys.executable, os.path.join(ROOT, 'benchmarks', 'mock_groq.py'),
+                                         '--port', str(mock_port)] + shlex.split(mock_args), ROOT)
+    mock_url = f"http://127.0.0.1:{mock_port}"
+    _wait_ready(mock_url + '/stats', mock, log_path)
+
+    env = dict(os.environ,
+               GROQ_BASE_URL=mock_url,
+               GROQ_API_KEY='mock-key',
+               LLM_CACHE_PATH=os.path.join(workdir, 'llm_cache.sqlite3'),
+               JOB_QUEUE_PATH=os.path.join(workdir, 'jobs.sqlite3'),
+               RESUME_TEXT_CACHE_PATH=os.path.join(workdir, 'resume_text_cache.sqlite3'))
+    urls = {'mock': mock_url}
+    for name, backend, health in (('enhancer', 'resume-enhancer-backend', '/model_health'),
+                                  ('career', 'career-guidance-backend', '/render_stats')):
+        port = _free_port()
+        process, log_path = start(name, [sys.executable, '-m', 'flask', '--app', 'app', 'run',
+                                         '--host', '127.0.0.1', '--port', str(port), '--with-threads'],
+                                  os.path.join(ROOT, backend), env)
+        urls[name] = f"http://127.0.0.1:{port}"
+        _wait_ready(urls[name] + health, process, log_path)
+    return urls, processes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test both backends against the offline Groq mock")
+    parser.add_argument('--spawn', action='store_true', help="start the mock and both backends locally")
+    parser.add_argument('--enhancer-url', default='http://127.0.0.1:5000')
+    parser.add_argument('--career-url', default='http://127.0.0.1:5001')
+    parser.add_argument('--mock-args', default=DEFAULT_MOCK_ARGS, help="arguments for mock_groq.py with --spawn")
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help="comma-separated, from: " + ', '.join(SCENARIOS))
+    parser.add_argument('--concurrency', default='1,4,16', help="comma-separated concurrency levels")
+    parser.add_argument('--requests', type=int, default=40, help="requests per scenario and level")
+    parser.add_argument('--json', help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(unknown)}")
+    levels = [int(level) for level in args.concurrency.split(',')]
+
+    processes = []
+    workdir = tempfile.mkdtemp(prefix='loadtest-')
+    try:
+        if args.spawn:
+            urls, processes = spawn_stack(args.mock_args, workdir)
+            print(f"Spawned mock and backends (logs in {workdir})")
+        else:
+            urls = {'enhancer': args.enhancer_url.rstrip('/'), 'career': args.career_url.rstrip('/')}
+        sample = {'pdf': create_pdf_resume(SAMPLE_RESUME).getvalue(), 'enhanced': SAMPLE_RESUME}
+
+        results = []
+        print(f"{'scenario':<16} {'conc':>4} {'reqs':>5} {'errors':>6} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        for name in scenarios:
+            # One untimed request first, so lazy start-up costs are not counted
+            with httpx.Client(timeout=300) as client:
+                SCENARIOS[name](client, urls, sample)
+            for level in levels:
+                summary = dict(run_level(SCENARIOS[name], urls, sample, level, args.requests), scenario=name)
+                results.append(summary)
+                print(f"{name:<16} {level:>4} {summary['requests']:>5} {summary['errors']:>6} "
+                      f"{summary['throughput_rps']:>8.2f} {summary['p50_ms']:>9.1f} {summary['p95_ms']:>9.1f} "
+                      f"{summary['p99_ms']:>9.1f}", flush=True)
+
+        if args.spawn:
+            results_mock = httpx.get(urls['mock'] + '/stats').json()
+            print(f"Mock Groq requests: {results_mock}")
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump({'mock_args': args.mock_args if args.spawn else None, 'results': results}, f, indent=2)
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+    return 1 if any(result['errors'] for result in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
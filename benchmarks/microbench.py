@@ -0,0 +1,157 @@
+# benchmarks/microbench.py
+"""
+Micro-benchmarks for the CPU-bound hot paths (rendering, text extraction, guidance markdown, JSON
+extraction) over the small, typical and huge resumes in benchmarks/fixtures/, with a stored
+baseline and a regression gate.
+
+    python benchmarks/microbench.py --save-baseline      # record the baseline on this machine
+    python benchmarks/microbench.py [-k render_pdf] [--threshold 0.25] [--baseline PATH]
+
+Each benchmark reports the best per-call time over several rounds. Compared with the baseline,
+a benchmark more than --threshold slower (default 25%) counts as a regression and the run exits 1.
+Baselines are machine-specific: record one before optimizing and compare on the same machine. The
+default baseline file is gitignored, so a local one is never committed.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import markdown
+
+from resume_core import render_assets
+from resume_core.ats import score_resume
+from resume_core.extraction import extract_text
+from resume_core.json_extract import extract_json_object
+from resume_core.prompt_budget import RESUME_TOKEN_BUDGET, fit_text, normalize_text
+from resume_core.rendering import create_docx_resume, create_jpg_resume, create_pdf_resume
+from resume_core.skills import extract_skills
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "microbench_baseline.json")
+SIZES = ("small", "typical", "huge")
+# Bullets per career guidance section for each size
+GUIDANCE_BULLETS = {"small": 2, "typical": 6, "huge": 40}
+GUIDANCE_KEYS = ("future_projects", "skill_upgrade", "career_roadmap", "strengths", "weaknesses",
+                 "resume_analysis", "ats_feedback", "resume_feedback")
+# Same extensions analyze_career_guidance renders each section with
+GUIDANCE_MARKDOWN_EXTENSIONS = ['nl2br', 'tables', 'fenced_code']
+
+
+def load_fixtures():
+    """Per size: resume text, its PDF and DOCX bytes, and a career guidance response"""
+    fixtures = {}
+    for size in SIZES:
+        with open(os.path.join(FIXTURES_DIR, f"resume_{size}.txt"), encoding="utf-8") as f:
+            text = f.read()
+        bullets = "\n".join(f"- **Step {i + 1}:** build a project with measurable impact and document the results"
+                            for i in range(GUIDANCE_BULLETS[size]))
+        sections = {key: f"### {key.replace('_', ' ').title()}\n\n{bullets}" for key in GUIDANCE_KEYS}
+        response = json.dumps(sections)
+        fixtures[size] = {
+            "text": text,
+            "pdf": create_pdf_resume(text).getvalue(),
+            "docx": create_docx_resume(text).getvalue(),
+            "sections": list(sections.values()),
+            "response": response,
+            # A trailing comma inside a code fence sends the response through the repair pass
+            "broken_response": "```json\n" + response[:-1] + ",}\n```",
+        }
+    return fixtures
+
+
+def benchmarks(fixtures):
+    """name -> zero-argument callable"""
+    cases = {}
+    for size, fx in fixtures.items():
+        text = fx["text"]
+        cases[f"render_pdf[{size}]"] = lambda text=text: create_pdf_resume(text)
+        cases[f"render_jpg[{size}]"] = lambda text=text: create_jpg_resume(text)
+        cases[f"render_docx[{size}]"] = lambda text=text: create_docx_resume(text)
+        cases[f"extract_pdf[{size}]"] = lambda data=fx["pdf"]: extract_text(data, "resume.pdf", max_pages=1000)
+        cases[f"extract_docx[{size}]"] = lambda data=fx["docx"]: extract_text(data, "resume.docx")
+        cases[f"guidance_markdown[{size}]"] = lambda sections=fx["sections"]: [
+            markdown.markdown(section, extensions=GUIDANCE_MARKDOWN_EXTENSIONS) for section in sections]
+        cases[f"json_extract[{size}]"] = lambda response=fx["response"]: extract_json_object(response)
+        cases[f"json_repair[{size}]"] = lambda response=fx["broken_response"]: extract_json_object(response)
+        cases[f"compact_text[{size}]"] = lambda text=text: fit_text(normalize_text(text), RESUME_TOKEN_BUDGET)
+        cases[f"ats_score[{size}]"] = lambda text=text: score_resume(text, fixtures["typical"]["text"])
+        cases[f"extract_skills[{size}]"] = lambda text=text: extract_skills(text)
+    return cases
+
+
+def measure(func, rounds, round_seconds):
+    """Best per-call time in microseconds over rounds of about round_seconds each"""
+    started = time.perf_counter()
+    func()
+    once = time.perf_counter() - started
+    iterations = max(1, int(round_seconds / max(once, 1e-9)))
+    best = once
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        best = min(best, (time.perf_counter() - started) / iterations)
+    return best * 1e6
+
+
+def machine():
+    return {"python": platform.python_version(), "platform": platform.platform(), "processor": platform.machine()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hot-path micro-benchmarks with a regression gate")
+    parser.add_argument("-k", dest="pattern", default="", help="only benchmarks whose name contains this")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown, as a fraction")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--round-seconds", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    render_assets.warm_up()
+    cases = {name: func for name, func in benchmarks(load_fixtures()).items() if args.pattern in name}
+
+    baseline = {}
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            stored = json.load(f)
+        baseline = stored["results"]
+        if stored.get("machine") != machine():
+            print(f"Warning: baseline was recorded on {stored.get('machine')}; comparisons may not be meaningful")
+
+    results = {}
+    regressions = []
+    print(f"{'benchmark':<28}{'time (us)':>14}{'baseline (us)':>16}{'change':>10}")
+    for name, func in cases.items():
+        results[name] = round(measure(func, args.rounds, args.round_seconds), 2)
+        line = f"{name:<28}{results[name]:>14.1f}"
+        if name in baseline:
+            change = results[name] / baseline[name] - 1
+            regressed = change > args.threshold
+            regressions += [name] if regressed else []
+            line += f"{baseline[name]:>16.1f}{change:>+9.0%}" + ("  REGRESSED" if regressed else "")
+        print(line, flush=True)
+
+    if args.save_baseline:
+        if args.pattern and os.path.exists(args.baseline):
+            # Re-recording a subset keeps the other benchmarks' baselines
+            with open(args.baseline, encoding="utf-8") as f:
+                results = dict(json.load(f)["results"], **results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"machine": machine(), "results": results}, f, indent=2, sort_keys=True)
+        print(f"\nBaseline saved to {args.baseline}")
+    elif not baseline:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to record one")
+    elif regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,411 @@
+# benchmarks/mock_groq.py
+"""
+Offline stand-in for the Groq (OpenAI-compatible) chat completions API, for load tests and
+local development without a GROQ_API_KEY or network access.
+
+    python benchmarks/mock_groq.py [--port 8765] [--latency lognormal:400:0.5] [--tokens-per-second 400]
+        [--model-latency llama-3.1-70b-versatile=lognormal:2500:0.4] [--error-rate 0.02]
+        [--rate-limit-rate 0.01] [--malformed-rate 0.1] [--rpm 30] [--tpm 6000] [--seed 1]
+
+Point a backend at it with GROQ_BASE_URL=http://127.0.0.1:8765 and any GROQ_API_KEY.
+
+Each response waits for a time-to-first-token drawn from the latency distribution (per model if
+overridden), then for its completion tokens at the token rate; streamed responses are paced
+chunk by chunk. Responses are canned per prompt type: career guidance JSON (malformed at
+--malformed-rate), an enhanced resume with an "Enhancement Summary:", or a structured analysis.
+Draws come from one seeded generator, so a run at the same settings sees the same latencies,
+errors and defects. GET /stats returns request counts by outcome.
+
+--rpm and --tpm enforce per-model limits over a rolling minute the way Groq does: every response
+carries x-ratelimit-{limit,remaining,reset}-{requests,tokens} headers (the request headers count the
+mock's minute rather than Groq's day), and a request over either limit is answered 429 with retry-after.
+"""
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CHAT_PATH = "/openai/v1/chat/completions"
+MODELS_PATH = "/openai/v1/models"
+MODELS = ("llama-3.1-70b-versatile", "llama-3.1-8b-instant")
+# Roughly four characters per token, as in resume_core.prompt_budget
+CHARS_PER_TOKEN = 4
+STREAM_CHUNK_TOKENS = 8
+
+CAREER_KEYS = ("future_projects", "skill_upgrade", "career_roadmap", "strengths", "weaknesses",
+               "resume_analysis", "ats_feedback", "resume_feedback")
+
+ENHANCED_RESUME = """# Jane Doe
+jane.doe@example.com | +1 555 010 0199 | linkedin.com/in/janedoe
+
+## Professional Summary
+Backend engineer with 6 years of experience building Python services and data pipelines on AWS.
+
+## Experience
+**Senior Software Engineer** | Acme Corp | 2021 - Present
+- Led the migration of 40 services to Kubernetes, cutting deploy time by 60%
+- Designed a PostgreSQL-backed event pipeline processing 2M events per day
+- Mentored 4 engineers and introduced code review guidelines
+
+**Software Engineer** | Initech | 2018 - 2021
+- Built REST APIs in Flask serving 10k requests per minute
+- Reduced cloud costs by 25% through caching and right-sizing
+
+## Education
+B.S. Computer Science | State University | 2018
+
+## Skills
+Python, Flask, PostgreSQL, Docker, Kubernetes, AWS, Redis, CI/CD
+
+Enhancement Summary:
+1. Rewrote the summary around the target role's core requirements
+2. Quantified achievements and led every bullet with an action verb
+3. Reordered skills to put the job's required technologies first
+"""
+
+ANALYSIS = """**Required Technical Skills:** Python, Flask, PostgreSQL, Docker, Kubernetes, AWS
+**Required Soft Skills:** Communication, mentoring, ownership
+**Key Technologies & Tools:** CI/CD, Terraform, Redis
+**Important Keywords for ATS:** backend services, distributed systems, scalability
+**Experience Level Required:** Senior
+**Industry/Company Type:** SaaS, mid-size
+**Key Responsibilities:** Design and operate backend services; mentor engineers
+**Preferred Qualifications:** Event-driven architecture, cost optimization
+**Project Types:** API platforms, data pipelines
+**Certification Preferences:** AWS Certified Developer (preferred)
+"""
+
+CAREER_SECTION = ("### {title}\n- **Focus:** build on demonstrated backend and cloud experience\n"
+                  "- **Next step:** ship one measurable project in the next quarter\n"
+                  "- **Resources:** official documentation, open-source contributions, mentoring")
+
+
+def career_guidance_json():
+    return json.dumps({key: CAREER_SECTION.format(title=key.replace('_', ' ').title()) for key in CAREER_KEYS})
+
+
+# Defects real models produce, applied to JSON responses at --malformed-rate
+def _trailing_comma(text):
+    return text[:-1] + ',}'
+
+
+def _code_fence(text):
+    return "Here is the analysis you asked for:\n```json\n" + text + "\n```\nLet me know if you need more."
+
+
+def _truncated(text):
+    return text[:int(len(text) * 0.7)]
+
+
+def _single_quotes(text):
+    return text.replace('"', "'")
+
+
+def _raw_newlines(text):
+    return text.replace('\\n', '\n')
+
+
+MALFORMATIONS = (_trailing_comma, _code_fence, _truncated, _single_quotes, _raw_newlines)
+
+
+def parse_latency(spec):
+    """
+    Latency distribution from "fixed:MS", "uniform:LOW:HIGH", "lognormal:MEDIAN:SIGMA" or a bare
+    number of milliseconds; returns a function of a random.Random giving seconds
+    """
+    kind, _, args = spec.partition(':')
+    try:
+        if not args:
+            value = float(kind)
+            return lambda rng: value / 1000
+        values = [float(arg) for arg in args.split(':')]
+        if kind == 'fixed':
+            return lambda rng: values[0] / 1000
+        if kind == 'uniform':
+            return lambda rng: rng.uniform(values[0], values[1]) / 1000
+        if kind == 'lognormal':
+            mu = math.log(values[0])
+            return lambda rng: rng.lognormvariate(mu, values[1]) / 1000
+    except (ValueError, IndexError):
+        pass
+    raise argparse.ArgumentTypeError(f"Invalid latency spec: {spec}")
+
+
+class RateWindow:
+    """Requests and tokens one model has accepted over the last minute"""
+
+    def __init__(self, rpm, tpm):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._events = deque()  # (timestamp, tokens)
+        self._tokens = 0
+
+    def _trim(self, now):
+        while self._events and now - self._events[0][0] >= 60.0:
+            self._tokens -= self._events.popleft()[1]
+
+    def _reset_after(self, now, requests=0, tokens=0):
+        # Seconds until enough of the window expires to free that many requests and tokens
+        if requests <= 0 and tokens <= 0:
+            return 0.0
+        freed_requests = freed_tokens = 0
+        for timestamp, cost in self._events:
+            freed_requests += 1
+            freed_tokens += cost
+            if freed_requests >= requests and freed_tokens >= tokens:
+                return max(0.0, timestamp + 60.0 - now)
+        return 0.0
+
+    def admit(self, tokens, now):
+        """(admitted, headers) for a request costing tokens"""
+        self._trim(now)
+        over_requests = len(self._events) + 1 - self.rpm if self.rpm else 0
+        over_tokens = self._tokens + tokens - self.tpm if self.tpm else 0
+        admitted = over_requests <= 0 and over_tokens <= 0
+        if admitted:
+            self._events.append((now, tokens))
+            self._tokens += tokens
+        headers = {}
+        if self.rpm:
+            headers.update({
+                "x-ratelimit-limit-requests": str(self.rpm),
+                "x-ratelimit-remaining-requests": str(max(0, self.rpm - len(self._events))),
+                "x-ratelimit-reset-requests": f"{self._reset_after(now, requests=1):.2f}s",
+            })
+        if self.tpm:
+            headers.update({
+                "x-ratelimit-limit-tokens": str(self.tpm),
+                "x-ratelimit-remaining-tokens": str(max(0, self.tpm - self._tokens)),
+                "x-ratelimit-reset-tokens": f"{self._reset_after(now, tokens=self._tokens):.2f}s",
+            })
+        if not admitted:
+            wait = self._reset_after(now, requests=max(0, over_requests), tokens=max(0, over_tokens))
+            headers["retry-after"] = str(max(1, math.ceil(wait)))
+        return admitted, headers
+
+
+class MockGroq:
+    """Response policy and counters shared by all request handler threads"""
+
+    def __init__(self, latency, model_latency=None, tokens_per_second=400.0, error_rate=0.0,
+                 rate_limit_rate=0.0, malformed_rate=0.0, seed=1, rpm=0, tpm=0):
+        self.latency = latency
+        self.model_latency = model_latency or {}
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.malformed_rate = malformed_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.counts = {}
+        self.rpm = rpm
+        self.tpm = tpm
+        self._windows = {}
+
+    def count(self, outcome):
+        with self._lock:
+            self.counts[outcome] = self.counts.get(outcome, 0) + 1
+
+    def admit(self, model, tokens):
+        """(admitted, rate-limit headers) under --rpm/--tpm; everything is admitted without them"""
+        if not self.rpm and not self.tpm:
+            return True, {}
+        with self._lock:
+            window = self._windows.setdefault(model, RateWindow(self.rpm, self.tpm))
+            return window.admit(tokens, time.time())
+
+    def plan(self, body):
+        """Decide one request's outcome: (status, first_token_seconds, content)"""
+        model = body.get('model', '')
+        with self._lock:
+            # One draw sequence per run keeps results reproducible for a given seed
+            roll = self._rng.random()
+            first_token = self.model_latency.get(model, self.latency)(self._rng)
+            defect = self._rng.random() < self.malformed_rate
+            malformation = self._rng.choice(MALFORMATIONS)
+        if roll < self.rate_limit_rate:
+            return 429, 0.0, None
+        if roll < self.rate_limit_rate + self.error_rate:
+            return 500, first_token, None
+        content = self.content(body)
+        if defect and content.startswith('{'):
+            content = malformation(content)
+        max_tokens = body.get('max_tokens')
+        if max_tokens:
+            content = content[:max_tokens * CHARS_PER_TOKEN]
+        return 200, first_token, content
+
+    @staticmethod
+    def content(body):
+        messages = body.get('messages') or []
+        system = ' '.join(m.get('content', '') for m in messages if m.get('role') == 'system')
+        prompt = ' '.join(m.get('content', '') for m in messages if m.get('role') != 'system')
+        if 'JSON' in system or 'JSON format' in prompt:
+            return career_guidance_json()
+        if 'Enhancement Summary' in prompt or 'Changes Made' in prompt:
+            return ENHANCED_RESUME
+        if prompt.strip() == 'ping':
+            return 'pong'
+        return ANALYSIS
+
+    def generation_seconds(self, tokens):
+        return tokens / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+
+def _tokens(text):
+    return max(1, math.ceil(len(text) / CHARS_PER_TOKEN))
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    mock = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _json(self, status, payload, headers=None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == MODELS_PATH:
+            self._json(200, {"object": "list", "data": [{"id": m, "object": "model"} for m in MODELS]})
+        elif self.path == "/stats":
+            self._json(200, dict(self.mock.counts))
+        else:
+            self._json(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return self._json(400, {"error": {"message": "Invalid JSON body", "type": "invalid_request_error"}})
+        if self.path != CHAT_PATH:
+            return self._json(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+
+        status, first_token, content = self.mock.plan(body)
+        model = body.get("model", MODELS[0])
+        prompt_tokens = sum(_tokens(m.get("content", "")) for m in body.get("messages") or [])
+        limit_headers = {"retry-after": "1"}
+        if status == 200:
+            admitted, limit_headers = self.mock.admit(model, prompt_tokens + _tokens(content))
+            if not admitted:
+                status, first_token = 429, 0.0
+        time.sleep(first_token)
+        if status == 429:
+            self.mock.count("rate_limited")
+            return self._json(429, {"error": {"message": "Rate limit reached", "type": "tokens",
+                                              "code": "rate_limit_exceeded"}}, limit_headers)
+        if status != 200:
+            self.mock.count("error")
+            return self._json(status, {"error": {"message": "Injected server error", "type": "internal_server_error"}})
+
+        self.mock.count("stream" if body.get("stream") else "ok")
+        completion_tokens = _tokens(content)
+        completion_id = "chatcmpl-" + uuid.uuid4().hex[:24]
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                 "total_tokens": prompt_tokens + completion_tokens}
+        if body.get("stream"):
+            self._stream(completion_id, model, content, usage, limit_headers)
+        else:
+            time.sleep(self.mock.generation_seconds(completion_tokens))
+            self._json(200, {
+                "id": completion_id, "object": "chat.completion", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                             "finish_reason": "stop"}],
+                "usage": usage,
+            }, limit_headers)
+
+    def _stream(self, completion_id, model, content, usage, headers):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.close_connection = True
+        step = STREAM_CHUNK_TOKENS * CHARS_PER_TOKEN
+        pieces = [content[i:i + step] for i in range(0, len(content), step)] or [""]
+        delay = self.mock.generation_seconds(STREAM_CHUNK_TOKENS)
+        for index, piece in enumerate(pieces):
+            last = index == len(pieces) - 1
+            chunk = {
+                "id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": "stop" if last else None}],
+            }
+            if last:
+                chunk["x_groq"] = {"usage": usage}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+            if not last:
+                time.sleep(delay)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+class MockServer(ThreadingHTTPServer):
+    # The default listen backlog (5) resets connections when hundreds of requests arrive at once
+    request_queue_size = 1024
+    daemon_threads = True
+
+
+def serve(mock, host="127.0.0.1", port=8765):
+    """Start the mock in a background thread; returns the server (call shutdown() to stop)"""
+    handler = type("MockGroqHandler", (Handler,), {"mock": mock})
+    server = MockServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _model_latency(spec):
+    model, sep, latency = spec.partition('=')
+    if not sep:
+        raise argparse.ArgumentTypeError(f"Expected MODEL=SPEC, got: {spec}")
+    return model, parse_latency(latency)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline Groq-compatible mock server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=parse_latency, default=parse_latency("lognormal:400:0.5"),
+                        help="time to first token (default lognormal:400:0.5)")
+    parser.add_argument("--model-latency", type=_model_latency, action="append", default=[],
+                        help="per-model override, MODEL=SPEC (repeatable)")
+    parser.add_argument("--tokens-per-second", type=float, default=400.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share answered 429")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="share of JSON responses malformed")
+    parser.add_argument("--rpm", type=int, default=0, help="requests per minute per model (0 = unlimited)")
+    parser.add_argument("--tpm", type=int, default=0, help="tokens per minute per model (0 = unlimited)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    mock = MockGroq(args.latency, dict(args.model_latency), args.tokens_per_second, args.error_rate,
+                    args.rate_limit_rate, args.malformed_rate, args.seed, args.rpm, args.tpm)
+    server = serve(mock, args.host, args.port)
+    print(f"Mock Groq API on http://{args.host}:{args.port} (GROQ_BASE_URL)", flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
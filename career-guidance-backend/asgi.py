@@ -0,0 +1,53 @@
+# backend/asgi.py
+# Async serving mode: the same API as app.py, with the LLM-bound endpoints (/career_guidance, /tool)
+# awaiting app.py's analyses on the server's event loop, so a request waiting on Groq holds no
+# thread or worker process. Everything else (downloads, /ats_score, bulk jobs) is served by the
+# Flask app on a thread pool. Run with:
+#
+#     uvicorn asgi:application --port 5001
+from flask import jsonify, request
+
+import app as backend
+from resume_core.asgi_bridge import AsgiBridge
+from resume_core.event_loop import run_sync
+from resume_core.llm_scheduler import RateLimitedError
+from resume_core.singleflight import IdempotencyError, replay_headers, request_key
+
+application = AsgiBridge(backend.app)
+application.on_startup(backend.start_background_work)
+
+
+@application.route('/tool', methods=['POST'])
+async def tool():
+    """/tool (see app.tool) with the enhancement awaited; upload extraction runs on the blocking pool"""
+    inputs, error_response = await run_sync(backend.read_tool_request)
+    if error_response:
+        return error_response
+
+    (enhanced_resume, notes), replayed = await backend.tool_flight.do_async(
+        backend.tool_flight_key(inputs), backend.enhance_resume_async, inputs['jd'], inputs['resume'],
+        idempotency_key=request.headers.get('Idempotency-Key'))
+    return await run_sync(backend.tool_response, enhanced_resume, notes, inputs['resume_id']), replay_headers(replayed)
+
+
+@application.route('/career_guidance', methods=['POST'])
+async def career_guidance():
+    """/career_guidance (see app.career_guidance) with the analysis awaited"""
+    resume_text, resume_id, error_response = await run_sync(backend.read_career_guidance_input)
+    if error_response:
+        return error_response
+
+    try:
+        print(f"Starting career guidance analysis for resume with {len(resume_text)} characters")
+        guidance_results, replayed = await backend.guidance_flight.do_async(
+            request_key({'resume': resume_text}), backend.analyze_career_guidance_async, resume_text,
+            idempotency_key=request.headers.get('Idempotency-Key'))
+        print(f"Analysis completed successfully. Keys: {list(guidance_results.keys())}")
+        return jsonify({**guidance_results, 'resume_id': resume_id}), replay_headers(replayed)
+    except (IdempotencyError, RateLimitedError):
+        raise
+    except Exception as e:
+        print(f"Error in career guidance analysis: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'error': f'Error analyzing resume: {str(e)}'}), 500
@@ -0,0 +1,215 @@
+# backend/bulk.py
+import os
+import tempfile
+import zipfile
+
+from resume_core.extraction import MAX_UPLOAD_BYTES, ExtractionError, FileTooLargeError, extract_resume_bytes
+from resume_core.job_queue import JobQueue
+from resume_core.storage import data_path, private_dir
+
+# Job queue workers for bulk items. Their LLM calls run at BULK priority, so the shared rate
+# limits in llm_scheduler pace them across every process, behind interactive requests.
+BULK_WORKERS = int(os.environ.get("BULK_WORKERS", "4"))
+BULK_MAX_ITEMS = int(os.environ.get("BULK_MAX_ITEMS", "500"))
+# Bulk jobs that may be in progress at once; further uploads are answered 503 until one finishes
+BULK_MAX_ACTIVE_JOBS = int(os.environ.get("BULK_MAX_ACTIVE_JOBS", "20"))
+# How long a finished bulk job stays available for polling
+BULK_RETENTION_SECONDS = float(os.environ.get("BULK_RETENTION_SECONDS", str(24 * 3600)))
+BULK_RETRY_AFTER_SECONDS = 60
+# Largest ZIP archive accepted, and the most resume bytes (inflated) one upload may queue
+BULK_MAX_ARCHIVE_BYTES = int(os.environ.get("BULK_MAX_ARCHIVE_BYTES", str(100 * 1024 * 1024)))
+BULK_MAX_TOTAL_BYTES = int(os.environ.get("BULK_MAX_TOTAL_BYTES", str(500 * 1024 * 1024)))
+# Request body limit for bulk uploads, above the app-wide one for single files
+BULK_MAX_REQUEST_BYTES = int(os.environ.get("BULK_MAX_REQUEST_BYTES", str(BULK_MAX_ARCHIVE_BYTES + 1024 * 1024)))
+# Queued resumes wait here on disk until their analysis runs, rather than in memory. Queued jobs
+# survive a restart, so this is in the private data directory rather than the temp dir.
+BULK_SPOOL_DIR = os.environ.get("BULK_SPOOL_DIR", data_path("bulk_spool"))
+_COPY_CHUNK = 1024 * 1024
+
+
+class BulkUploadError(ValueError):
+    """Raised for bulk uploads that cannot be queued at all"""
+
+
+class BulkBusyError(Exception):
+    """Raised when BULK_MAX_ACTIVE_JOBS bulk jobs are already in progress"""
+    retry_after = BULK_RETRY_AFTER_SECONDS
+
+
+def _spool(source, max_bytes):
+    """Copy up to max_bytes from a file object to a temporary file; returns (path, size), or None if it is larger"""
+    handle, path = tempfile.mkstemp(prefix="bulk-", dir=private_dir(BULK_SPOOL_DIR))
+    size = 0
+    try:
+        with os.fdopen(handle, "wb") as out:
+            while True:
+                chunk = source.read(min(_COPY_CHUNK, max_bytes + 1 - size))
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    break
+                out.write(chunk)
+    except BaseException:
+        os.remove(path)
+        raise
+    if size > max_bytes:
+        os.remove(path)
+        return None
+    return path, size
+
+
+def discard_uploads(uploads):
+    """Delete the spooled files of (filename, path) uploads"""
+    for _, path in uploads:
+        if path is not None:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def collect_uploads(files):
+    """
+    Spool uploaded files to disk as a list of (filename, path). ZIP archives are expanded into
+    their PDF members; anything else is kept as-is and rejected per item later. path is None for
+    an upload over MAX_UPLOAD_BYTES, which fails as an individual item. Raises BulkUploadError
+    (leaving nothing on disk) past BULK_MAX_ITEMS, BULK_MAX_ARCHIVE_BYTES or BULK_MAX_TOTAL_BYTES.
+    """
+    items = []
+    total = 0
+
+    def add(filename, source):
+        nonlocal total
+        if len(items) >= BULK_MAX_ITEMS:
+            raise BulkUploadError(f"Too many resumes. The limit is {BULK_MAX_ITEMS} per upload.")
+        spooled = _spool(source, MAX_UPLOAD_BYTES) if source is not None else None
+        if spooled is not None:
+            total += spooled[1]
+        items.append((filename, spooled and spooled[0]))
+        if total > BULK_MAX_TOTAL_BYTES:
+            raise BulkUploadError(
+                f"Upload is too large. The limit is {BULK_MAX_TOTAL_BYTES // (1024 * 1024)} MB of resumes.")
+
+    try:
+        for file in files:
+            if not file or not file.filename:
+                continue
+            if not file.filename.lower().endswith('.zip'):
+                add(file.filename, file)
+                continue
+            spooled = _spool(file, BULK_MAX_ARCHIVE_BYTES)
+            if spooled is None:
+                raise BulkUploadError(
+                    f"{file.filename} is too large. The limit is {BULK_MAX_ARCHIVE_BYTES // (1024 * 1024)} MB.")
+            archive_path = spooled[0]
+            try:
+                with zipfile.ZipFile(archive_path) as archive:
+                    for member in archive.infolist():
+                        name = member.filename
+                        if member.is_dir() or name.startswith('__MACOSX/') or not name.lower().endswith('.pdf'):
+                            continue
+                        # Oversized or corrupt members are not inflated; they fail as individual items
+                        if member.file_size > MAX_UPLOAD_BYTES:
+                            add(os.path.basename(name), None)
+                            continue
+                        try:
+                            with archive.open(member) as source:
+                                add(os.path.basename(name), source)
+                        except (zipfile.BadZipFile, OSError):
+                            add(os.path.basename(name), None)
+            except zipfile.BadZipFile:
+                raise BulkUploadError(f"{file.filename} is not a valid ZIP archive.")
+            finally:
+                os.remove(archive_path)
+    except BaseException:
+        discard_uploads(items)
+        raise
+    return items
+
+
+class BulkAnalyzer:
+    """
+    Runs career guidance analysis for many resumes as durable jobs, one per resume, on a JobQueue.
+    The items of one upload form a job group whose id is the bulk job id, so a bulk job survives a
+    restart and can be polled from any process sharing the queue database. Finished jobs are kept
+    for the queue's retention period; submit() refuses new work while max_active jobs are in progress.
+    """
+
+    KIND = 'career_bulk_item'
+
+    def __init__(self, analyze, queue_path, workers=BULK_WORKERS, max_active=BULK_MAX_ACTIVE_JOBS,
+                 retention_seconds=BULK_RETENTION_SECONDS):
+        self.analyze = analyze
+        self.max_active = max_active
+        self.queue = JobQueue(queue_path, {self.KIND: self._run_item}, workers=workers,
+                              retention_seconds=retention_seconds)
+
+    def start(self):
+        """Start the queue's workers (see app.start_background_work)"""
+        self.queue.start()
+
+    def submit(self, uploads):
+        """
+        Queue one analysis per (filename, path) upload from collect_uploads and return the new job id.
+        Raises BulkBusyError, discarding the uploads, when max_active bulk jobs are still in progress.
+        """
+        payloads = [{'index': index, 'filename': filename, 'path': path}
+                    for index, (filename, path) in enumerate(uploads)]
+        try:
+            job_id = self.queue.enqueue_group(self.KIND, payloads, max_active_groups=self.max_active)
+        except BaseException:
+            discard_uploads(uploads)
+            raise
+        if job_id is None:
+            discard_uploads(uploads)
+            raise BulkBusyError("Too many bulk analyses in progress. Please try again later.")
+        return job_id
+
+    def _run_item(self, index, filename, path):
+        if path is None:
+            raise FileTooLargeError(f"File is too large. The limit is {MAX_UPLOAD_BYTES // (1024 * 1024)} MB.")
+        # The spooled copy goes once this attempt has an outcome; if the process dies first, the
+        # job is claimed again and finds it still there
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            if not filename.lower().endswith('.pdf'):
+                raise ExtractionError('Only PDF files are supported for career guidance.')
+            resume_text, resume_id = extract_resume_bytes(data, filename.lower())
+            if not resume_text.strip():
+                raise ExtractionError('Could not extract text from the PDF. Please ensure the file is not corrupted.')
+            return {'resume_id': resume_id, 'result': self.analyze(resume_text)}
+        finally:
+            discard_uploads([(filename, path)])
+
+    def status(self, job_id, include_results=True):
+        """Per-item status plus aggregate progress, or None for an unknown job"""
+        jobs = self.queue.group(job_id)
+        if not jobs:
+            return None
+
+        items = []
+        for job in sorted(jobs, key=lambda job: job['payload']['index']):
+            item = {'index': job['payload']['index'], 'filename': job['payload']['filename'], 'status': job['status']}
+            if job['result'] is not None:
+                item['resume_id'] = job['result']['resume_id']
+                if include_results:
+                    item['result'] = job['result']['result']
+            if job['error'] is not None:
+                item['error'] = job['error']
+            items.append(item)
+        total = len(items)
+        done = sum(1 for item in items if item['status'] == 'done')
+        failed = sum(1 for item in items if item['status'] == 'error')
+        running = sum(1 for item in items if item['status'] == 'running')
+        finished = done + failed
+        return {
+            'job_id': job_id,
+            'status': 'completed' if finished == total else ('running' if finished or running else 'queued'),
+            'total': total,
+            'completed': done,
+            'failed': failed,
+            'progress': round(finished / total, 4) if total else 1.0,
+            'items': items,
+        }
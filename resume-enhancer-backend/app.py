@@ -1,26 +1,55 @@
 # backend/app.py
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, request, jsonify, Response, stream_with_context
+import asyncio
 import os
-from groq import Groq
+import sys
+import json
+import time
 from dotenv import load_dotenv
-import markdown
-from docx import Document
-from io import BytesIO
-import PyPDF2
 from flask_cors import CORS
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
-from PIL import Image, ImageDraw, ImageFont
-import textwrap
+
+# Shared backend code lives in resume_core/ at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resume_core.extraction import (
+    ExtractionError, UnsupportedFileError, extract_resume_text, lookup_resume_text, text_cache,
+)
+from resume_core import extraction, llm_scheduler, metrics, singleflight, skills, warmup
+from resume_core.downloads import downloads
+from resume_core.event_loop import iterate_async, run_async, run_sync
+from resume_core.lazy import lazy_import
+from resume_core.job_queue import JobQueue
+from resume_core.llm_client import client  # shared, connection-pooled Groq client, built on first use
+from resume_core.llm_scheduler import BULK, RateLimitedError
+from resume_core.model_router import AllModelsFailedError, HedgeBudget, ModelRouter, exhausted_error
+from resume_core.prompt_budget import (
+    ANALYSIS_TOKEN_BUDGET, JOB_DESCRIPTION_TOKEN_BUDGET, RESUME_TOKEN_BUDGET, compact_text, completion_tokens,
+)
+from resume_core.singleflight import SingleFlight, replay_headers, request_key
+from pipeline import Stage, run_stages
+from llm_cache import cached_completion, llm_cache
+from streaming import EnhancementStream, sse_event
 
 # Load environment variables
 load_dotenv()
 
+markdown = lazy_import('markdown')
+
 app = Flask(__name__)
 CORS(app)  # allow all origins by default; tune for production
+# Oversized uploads are answered 413 before their body is read
+extraction.install(app)
+# Request and stage timings, token usage, error counts and render pool load on GET /metrics
+metrics.install(app)
+metrics.REGISTRY.add_collector(metrics.cache_collector('resume_text', text_cache))
+metrics.REGISTRY.add_collector(metrics.cache_collector('llm', llm_cache))
+# /download_docx, /download_pdf, /download_jpg and /render_stats
+app.register_blueprint(downloads)
+# Identical concurrent /tool requests share one pipeline run; an Idempotency-Key retry gets the first result
+tool_flight = SingleFlight('enhancer.tool')
+singleflight.install(app)
+# LLM calls queue behind the Groq rate limits; one no model can start in time is answered 429
+llm_scheduler.install(app)
 
 # Enhanced Prompt template for intelligent job-specific resume generation
 prompt_template = """You are an expert AI resume enhancement specialist with deep knowledge of ATS systems and hiring practices. Your task is to transform a general resume into a highly targeted, job-specific resume that will pass ATS screening and impress hiring managers.
@@ -94,17 +123,96 @@ Job Description: {job_description}
 Target Job Title: {job_title}
 
 Original Resume: {resume}
-
+{analysis}
 Create a complete, professional, job-specific resume that will help the candidate stand out and get interviews. The resume should look like it was specifically crafted for this exact job opportunity, while being truthful and based on the candidate's actual background.
 
 After the enhanced resume, provide a section titled "Enhancement Summary:" followed by a detailed explanation of how you made the resume job-specific and what improvements were made.
 """
 
-# Initialize Groq client
-client = Groq(api_key=os.environ.get("GROQ_API_KEY"))
+LARGE_MODEL = "llama-3.1-70b-versatile"
+FAST_MODEL = "llama-3.1-8b-instant"
+
+# Enhancement models in preference order, with the sampling settings each is called with
+ENHANCE_MODEL_PARAMS = {
+    LARGE_MODEL: {"temperature": 0.3, "max_tokens": 6144},
+    FAST_MODEL: {"temperature": 0.2, "max_tokens": 4096},
+}
+
+async def probe_model(model):
+    """Tiny request used to check whether an open circuit's model is back"""
+    await client.chat.completions.create(
+        model=model,
+        messages=[{"role": "user", "content": "ping"}],
+        max_tokens=1,
+    )
 
-def parse_resume_structure(resume_text):
-    """Parse resume text to extract structured information for better AI processing"""
+# Skips a model whose circuit is open (decommissioned or failing) instead of
+# paying for a failed call on every request
+enhance_router = ModelRouter(list(ENHANCE_MODEL_PARAMS), probe=probe_model)
+
+# Optional hedging: when the primary model is slower than its usual HEDGE_PERCENTILE latency,
+# race the same prompt on the fast model. HEDGE_MAX_RATE caps the share of calls that hedge.
+HEDGE_ENABLED = os.environ.get("HEDGE_ENABLED", "0").lower() in ("1", "true")
+HEDGE_MODEL = FAST_MODEL
+HEDGE_PERCENTILE = float(os.environ.get("HEDGE_PERCENTILE", "90"))
+HEDGE_MIN_DELAY_MS = float(os.environ.get("HEDGE_MIN_DELAY_MS", "2000"))
+HEDGE_DEFAULT_DELAY_MS = float(os.environ.get("HEDGE_DEFAULT_DELAY_MS", "20000"))
+hedge_budget = HedgeBudget(max_ratio=float(os.environ.get("HEDGE_MAX_RATE", "0.1")))
+
+def hedge_delay_ms(model):
+    """Delay before hedging: the model's rolling latency percentile, or a default until there is data"""
+    observed = enhance_router.latency_percentile(model, HEDGE_PERCENTILE)
+    if observed is None:
+        return HEDGE_DEFAULT_DELAY_MS
+    return max(HEDGE_MIN_DELAY_MS, observed)
+
+# /tool pipeline tiers, chosen with the `mode` parameter:
+# - fast: enhancement only, on the instant model
+# - standard: structure and job analyses on the instant model (cached), fed into the enhancement
+# - thorough: analyses and enhancement on the large model, falling back to the instant model
+PIPELINE_MODES = {
+    'fast': {'analysis_models': None, 'enhance_models': [FAST_MODEL]},
+    'standard': {'analysis_models': [FAST_MODEL], 'enhance_models': None},
+    'thorough': {'analysis_models': [LARGE_MODEL, FAST_MODEL], 'enhance_models': None},
+}
+DEFAULT_PIPELINE_MODE = os.environ.get("TOOL_DEFAULT_MODE", "standard")
+
+# Per-stage deadlines for the /tool pipeline (seconds)
+ANALYSIS_STAGE_TIMEOUT = float(os.environ.get("ANALYSIS_STAGE_TIMEOUT", "30"))
+ENHANCE_STAGE_TIMEOUT = float(os.environ.get("ENHANCE_STAGE_TIMEOUT", "120"))
+
+# Stage results used when a stage fails or misses its deadline
+RESUME_STRUCTURE_FALLBACK = "Resume structure parsing failed. Proceeding with enhancement..."
+JOB_ANALYSIS_FALLBACK = "Job analysis failed. Proceeding with enhancement..."
+ENHANCEMENT_FALLBACK = ("Error: Unable to process resume enhancement in time. Please try again.", "", None)
+
+# /tool/batch limits: postings per request and postings processed at the same time
+BATCH_MAX_JOBS = int(os.environ.get("BATCH_MAX_JOBS", "30"))
+BATCH_CONCURRENCY = int(os.environ.get("BATCH_CONCURRENCY", "4"))
+# Batch items get the analyses /tool gives the enhancement in this mode
+BATCH_PIPELINE_MODE = 'standard'
+
+# The pipelines below are coroutines, run on the process's event loop (resume_core.event_loop):
+# asgi.py's views await them, and the Flask views and job workers use the plain wrappers
+# run_tool_pipeline(), stream_enhancement() and stream_batch().
+
+async def analysis_completion(models, use_cache, call, **kwargs):
+    """
+    cached_completion on the first of models whose circuit is closed, falling back down the list.
+    Outcomes are not recorded on the router, so cache hits do not skew enhancement latencies.
+    """
+    errors = []
+    for model in enhance_router.candidates(models):
+        try:
+            return await cached_completion(client, use_cache=use_cache, call=call, model=model, **kwargs)
+        except Exception as e:
+            print(f"Error with {model}: {str(e)}")
+            errors.append(e)
+    raise exhausted_error(errors)
+
+def resume_structure_request(resume_text):
+    """Completion parameters (all but the model) for the resume structure analysis"""
+    resume_text = compact_text(resume_text, RESUME_TOKEN_BUDGET)
     parsing_prompt = f"""
     Parse this resume text and extract structured information in the following format:
     
@@ -148,31 +256,38 @@ def parse_resume_structure(resume_text):
     
     If any section is missing or unclear, mark it as "Not Found" or "Unclear".
     """
-    
+    return dict(
+        messages=[{"role": "user", "content": parsing_prompt}],
+        temperature=0.1,
+        max_tokens=completion_tokens(parsing_prompt, 2000),
+        top_p=0.9,
+        stream=False,
+        stop=None,
+    )
+
+async def parse_resume_structure(resume_text, use_cache=True, models=(FAST_MODEL,)):
+    """Parse resume text to extract structured information for better AI processing"""
     try:
-        completion = client.chat.completions.create(
-            model="llama-3.1-8b-instant",
-            messages=[{"role": "user", "content": parsing_prompt}],
-            temperature=0.1,
-            max_tokens=2000,
-            top_p=0.9,
-            stream=False,
-            stop=None,
-        )
-        return completion.choices[0].message.content
+        request_kwargs = await run_sync(resume_structure_request, resume_text)
+        return await analysis_completion(models, use_cache, 'resume_structure', **request_kwargs)
+    except RateLimitedError:
+        raise
     except Exception as e:
         return f"Parsing error: {str(e)}"
 
-def analyze_job_requirements(job_description, job_title):
-    """Analyze job description to extract key requirements and skills for intelligent resume enhancement"""
+def job_analysis_request(job_description, job_title):
+    """Completion parameters (all but the model) for the job description analysis"""
+    known_skills = ", ".join(skills.extract_skills(job_description)) or "none"
+    job_description = compact_text(job_description, JOB_DESCRIPTION_TOKEN_BUDGET)
     analysis_prompt = f"""
     Analyze this job description to extract key information for intelligent resume enhancement:
     
     Job Title: {job_title}
     Job Description: {job_description}
+    Skills already identified: {known_skills}
     
     Please extract and return:
-    1. **Required Technical Skills** - List all technical skills, programming languages, frameworks, tools mentioned
+    1. **Required Technical Skills** - Only technical skills, languages, frameworks or tools not already identified above
     2. **Required Soft Skills** - Leadership, communication, problem-solving, etc.
     3. **Key Technologies & Tools** - Specific software, platforms, methodologies mentioned
     4. **Important Keywords for ATS** - Exact phrases and terminology to include
@@ -185,332 +300,587 @@ def analyze_job_requirements(job_description, job_title):
     
     Format as a structured analysis that will help the AI select the most relevant experiences, projects, skills, and certifications from the candidate's resume.
     """
-    
+    return dict(
+        messages=[{"role": "user", "content": analysis_prompt}],
+        temperature=0.1,
+        max_tokens=completion_tokens(analysis_prompt, 1500),
+        top_p=0.9,
+        stream=False,
+        stop=None,
+    )
+
+async def analyze_job_requirements(job_description, job_title, use_cache=True, models=(FAST_MODEL,)):
+    """Analyze job description to extract key requirements and skills for intelligent resume enhancement"""
     try:
-        completion = client.chat.completions.create(
-            model="llama-3.1-8b-instant",
-            messages=[{"role": "user", "content": analysis_prompt}],
-            temperature=0.1,
-            max_tokens=1500,
-            top_p=0.9,
-            stream=False,
-            stop=None,
-        )
-        return completion.choices[0].message.content
+        request_kwargs = await run_sync(job_analysis_request, job_description, job_title)
+        return await analysis_completion(models, use_cache, 'job_analysis', **request_kwargs)
+    except RateLimitedError:
+        raise
     except Exception as e:
         return f"Analysis error: {str(e)}"
 
-def enhance_resume(job_description, resume, job_title=""):
-    prompt = prompt_template.format(
-        job_description=job_description, 
-        resume=resume, 
-        job_title=job_title
+def split_enhancement(full_response):
+    """Split the model response into the enhanced resume and the notes section"""
+    if "Enhancement Summary:" in full_response:
+        parts = full_response.split("Enhancement Summary:", 1)
+        return parts[0].strip(), "Enhancement Summary:" + parts[1].strip()
+    if "Changes Made:" in full_response:
+        parts = full_response.split("Changes Made:", 1)
+        return parts[0].strip(), "Changes Made:" + parts[1].strip()
+    return full_response, ""
+
+def skill_match_summary(gap):
+    """Prompt block listing the locally matched and missing skills, or "" when the JD names none"""
+    if not gap['matched'] and not gap['missing']:
+        return ""
+    lines = ["\nSkill Match (computed from the resume and job description):"]
+    if gap['matched']:
+        lines.append("- Job skills the candidate has: " + ", ".join(gap['matched']))
+    if gap['missing']:
+        lines.append("- Job skills not in the resume (do not claim them): " + ", ".join(gap['missing']))
+    if gap['additional']:
+        lines.append("- Other candidate skills: " + ", ".join(gap['additional']))
+    return "\n".join(lines) + "\n"
+
+def enhancement_prompt(job_description, resume, job_title="", resume_structure=None, job_analysis=None):
+    """
+    Enhancement prompt with the resume and job description compacted to their token budgets.
+    The local skill match and, when given, pre-computed structure and job analyses are included
+    for the model to work from.
+    """
+    analysis = skill_match_summary(skills.skill_gap(resume, job_description))
+    if resume_structure:
+        analysis += f"\nResume Structure Analysis:\n{compact_text(resume_structure, ANALYSIS_TOKEN_BUDGET)}\n"
+    if job_analysis:
+        analysis += f"\nJob Requirements Analysis:\n{compact_text(job_analysis, ANALYSIS_TOKEN_BUDGET)}\n"
+    return prompt_template.format(
+        job_description=compact_text(job_description, JOB_DESCRIPTION_TOKEN_BUDGET),
+        resume=compact_text(resume, RESUME_TOKEN_BUDGET),
+        job_title=job_title,
+        analysis=analysis,
+    )
+
+def model_params(model, prompt):
+    """Sampling settings for an enhancement model, with max_tokens sized to what the prompt leaves"""
+    params = ENHANCE_MODEL_PARAMS[model]
+    return dict(params, max_tokens=completion_tokens(prompt, params["max_tokens"]))
+
+def enhancement_request(model, prompt, stream=False):
+    """Completion parameters for the enhancement call on model"""
+    return dict(
+        model=model,
+        messages=[{"role": "user", "content": prompt}],
+        top_p=0.9,
+        stream=stream,
+        stop=None,
+        **model_params(model, prompt),
     )
+
+async def enhance_resume(job_description, resume, job_title="", models=None, resume_structure=None,
+                         job_analysis=None):
+    prompt = await run_sync(enhancement_prompt, job_description, resume, job_title, resume_structure, job_analysis)
     
-    # Try with the more powerful model first
+    async def call(model):
+        with metrics.llm_call('enhancement', model) as tracked:
+            completion = await client.chat.completions.create(**enhancement_request(model, prompt))
+            tracked.record(completion)
+        return completion.choices[0].message.content
+
+    # Most capable healthy model first, falling back down the route
     try:
-        completion = client.chat.completions.create(
-            model="llama-3.1-70b-versatile",  # Using more powerful model for better results
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3,  # Slightly higher for more creative but relevant content
-            max_tokens=6144,  # Increased token limit for comprehensive resume generation
-            top_p=0.9,
-            stream=False,
-            stop=None,
-        )
-        full_response = completion.choices[0].message.content
-        # Split the response into resume and notes
-        if "Enhancement Summary:" in full_response:
-            parts = full_response.split("Enhancement Summary:", 1)
-            enhanced_resume = parts[0].strip()
-            notes = "Enhancement Summary:" + parts[1].strip()
-        elif "Changes Made:" in full_response:
-            parts = full_response.split("Changes Made:", 1)
-            enhanced_resume = parts[0].strip()
-            notes = "Changes Made:" + parts[1].strip()
+        if HEDGE_ENABLED:
+            primary = enhance_router.candidates(models)[0]
+            full_response, model, hedged = await enhance_router.call_hedged(
+                call, HEDGE_MODEL, hedge_delay_ms(primary), hedge_budget, models)
         else:
-            enhanced_resume = full_response
-            notes = ""
-        return enhanced_resume, notes
-    except Exception as e:
-        print(f"Error with 70b model: {str(e)}")
-        # Fallback to the instant model if the 70b model fails
+            (full_response, model), hedged = await enhance_router.call(call, models), False
+        enhanced_resume, notes = split_enhancement(full_response)
+        return enhanced_resume, notes, {'model': model, 'hedged': hedged}
+    except AllModelsFailedError as e:
+        return f"Error: Unable to process resume enhancement. Please try again. Error details: {str(e)}", "", None
+
+def chunk_events(chunk, stream, tracked):
+    """SSE events for one streamed completion chunk; Groq reports usage on the final chunk"""
+    x_groq = getattr(chunk, 'x_groq', None)
+    if x_groq is not None:
+        tracked.record_usage(getattr(x_groq, 'usage', None))
+    if not chunk.choices:
+        return []
+    return [sse_event(channel, {'html': html}) for channel, html in stream.feed(chunk.choices[0].delta.content)]
+
+def stream_start_error(errors):
+    """SSE error event for a stream no model would start; a 429 travels as an event since the stream is already 200"""
+    error = exhausted_error(errors)
+    if isinstance(error, RateLimitedError):
+        return sse_event('error', {'error': 'The AI service is at capacity. Please try again shortly.',
+                                   'retry_after': error.retry_after})
+    return sse_event('error', {'error': 'Unable to process resume enhancement. Please try again.'})
+
+def analysis_event(resume_structure, job_analysis):
+    """SSE event with the analyses a streamed enhancement is given"""
+    return sse_event('analysis', {
+        'job_analysis': markdown.markdown(f"**Job Analysis:**\n{job_analysis}"),
+        'resume_structure': markdown.markdown(f"**Resume Structure Analysis:**\n{resume_structure}"),
+    })
+
+async def stream_enhancement_async(job_description, resume, job_title="", use_cache=True,
+                                   mode=DEFAULT_PIPELINE_MODE):
+    """
+    Yield SSE events for the enhanced resume as the model generates it. The mode's analyses (see
+    PIPELINE_MODES) run first and are sent as one event; the enhancement then streams on the mode's models.
+    Closing the generator closes the upstream stream.
+    """
+    tier = PIPELINE_MODES[mode]
+    usable = {}
+    if tier['analysis_models']:
+        resume_structure, job_analysis, stage_metadata, _ = await run_analyses(
+            job_description, resume, job_title, use_cache, tier['analysis_models'])
+        yield await run_sync(analysis_event, resume_structure, job_analysis)
+        usable = usable_analyses(resume_structure, job_analysis, stage_metadata)
+    prompt = await run_sync(enhancement_prompt, job_description, resume, job_title, **usable)
+
+    # Same model order as enhance_resume; fallback is only possible before any token is sent
+    chunks = None
+    errors = []
+    for model in enhance_router.candidates(tier['enhance_models']):
+        started = time.perf_counter()
+        tracked = metrics.LlmCall('enhancement_stream', model)
         try:
-            completion = client.chat.completions.create(
-                model="llama-3.1-8b-instant",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.2,
-                max_tokens=4096,
-                top_p=0.9,
-                stream=False,
-                stop=None,
-            )
-            full_response = completion.choices[0].message.content
-            # Split the response into resume and notes
-            if "Enhancement Summary:" in full_response:
-                parts = full_response.split("Enhancement Summary:", 1)
-                enhanced_resume = parts[0].strip()
-                notes = "Enhancement Summary:" + parts[1].strip()
-            elif "Changes Made:" in full_response:
-                parts = full_response.split("Changes Made:", 1)
-                enhanced_resume = parts[0].strip()
-                notes = "Changes Made:" + parts[1].strip()
-            else:
-                enhanced_resume = full_response
-                notes = ""
-            return enhanced_resume, notes
-        except Exception as e2:
-            print(f"Error with 8b model: {str(e2)}")
-            return f"Error: Unable to process resume enhancement. Please try again. Error details: {str(e2)}", ""
-
-def create_pdf_resume(text):
-    """Create a PDF resume from text content"""
+            chunks = await client.chat.completions.create(**enhancement_request(model, prompt, stream=True))
+            break
+        except RateLimitedError as e:
+            print(f"Skipping {model}: {str(e)}")
+            errors.append(e)
+        except Exception as e:
+            print(f"Error starting stream with {model}: {str(e)}")
+            tracked.finish(e)
+            enhance_router.record_failure(model, e)
+            errors.append(e)
+    if chunks is None:
+        yield stream_start_error(errors)
+        return
+
+    yield sse_event('start', {'model': model, 'mode': mode})
+    stream = EnhancementStream()
     try:
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
-        
-        # Get styles
-        styles = getSampleStyleSheet()
-        
-        # Create custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            spaceAfter=30,
-            alignment=1,  # Center alignment
-            textColor=colors.darkblue
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=14,
-            spaceAfter=12,
-            spaceBefore=12,
-            textColor=colors.darkblue
-        )
-        
-        normal_style = ParagraphStyle(
-            'CustomNormal',
-            parent=styles['Normal'],
-            fontSize=10,
-            spaceAfter=6
-        )
-        
-        # Parse the text and create content
-        content = []
-        lines = text.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                content.append(Spacer(1, 6))
-                continue
-                
-            # Check if it's a title (usually the first line or very short)
-            if len(line) < 50 and not line.startswith('•') and not line.startswith('-') and not line.startswith('*'):
-                if len(content) < 3:  # Likely the name/title
-                    content.append(Paragraph(line, title_style))
-                else:
-                    content.append(Paragraph(line, heading_style))
-            else:
-                # Regular content
-                content.append(Paragraph(line, normal_style))
-        
-        doc.build(content)
-        buffer.seek(0)
-        return buffer
+        async for chunk in chunks:
+            for event in chunk_events(chunk, stream, tracked):
+                yield event
+        for channel, html in stream.finish():
+            yield sse_event(channel, {'html': html})
     except Exception as e:
-        print(f"Error creating PDF: {str(e)}")
-        return None
+        print(f"Error while streaming enhancement: {str(e)}")
+        tracked.finish(e)
+        enhance_router.record_failure(model, e)
+        yield sse_event('error', {'error': f'Stream interrupted: {str(e)}'})
+        return
+    finally:
+        await chunks.close()
+    tracked.finish()
+    enhance_router.record_success(model, (time.perf_counter() - started) * 1000)
+
+    enhanced_resume, notes = stream.result()
+    yield sse_event('done', {'enhanced_text': enhanced_resume, 'notes': notes})
+
+def stream_enhancement(*args, **kwargs):
+    """stream_enhancement_async() as a plain generator, for the Flask view"""
+    return iterate_async(stream_enhancement_async(*args, **kwargs))
+
+async def parse_batch_structure(resume, use_cache=True):
+    """The resume structure stage, run once per batch: (resume_structure, stage metadata)"""
+    results, metadata = await run_stages([
+        Stage('resume_structure', parse_resume_structure,
+              (resume, use_cache, PIPELINE_MODES[BATCH_PIPELINE_MODE]['analysis_models']),
+              timeout=ANALYSIS_STAGE_TIMEOUT,
+              fallback=RESUME_STRUCTURE_FALLBACK),
+    ])
+    return results['resume_structure'], metadata['stages']
+
+async def enhance_for_job(resume, jd, job_title, structure, use_cache=True):
+    """
+    Run the per-posting stages for one batch item as run_tool_pipeline does in BATCH_PIPELINE_MODE:
+    the job analysis, then the enhancement with it and the batch's resume structure.
+    structure is the task of the batch's parse_batch_structure() call.
+    """
+    tier = PIPELINE_MODES[BATCH_PIPELINE_MODE]
+    results, metadata = await run_stages([
+        Stage('job_analysis', analyze_job_requirements, (jd, job_title, use_cache, tier['analysis_models']),
+              timeout=ANALYSIS_STAGE_TIMEOUT,
+              fallback=JOB_ANALYSIS_FALLBACK),
+    ])
+    job_analysis = results['job_analysis']
+    stage_metadata = metadata['stages']
+    total_ms = metadata['total_ms']
+
+    # Shielded: one posting being cancelled must not cancel the structure the others wait for
+    resume_structure, structure_stages = await asyncio.shield(structure)
+    usable = usable_analyses(resume_structure, job_analysis, dict(structure_stages, **stage_metadata))
+    results, metadata = await run_stages([
+        Stage('enhancement', enhance_resume, (jd, resume, job_title),
+              kwargs=dict(usable, models=tier['enhance_models']),
+              timeout=ENHANCE_STAGE_TIMEOUT,
+              fallback=ENHANCEMENT_FALLBACK),
+    ])
+    stage_metadata.update(metadata['stages'])
+    enhanced_resume, notes, served_by = results['enhancement']
+    return await run_sync(batch_item, job_title, enhanced_resume, notes, job_analysis, {
+        'stages': stage_metadata,
+        'total_ms': round(total_ms + metadata['total_ms'], 1),
+        'mode': BATCH_PIPELINE_MODE,
+        'served_by': served_by,
+    })
+
+def batch_item(job_title, enhanced_resume, notes, job_analysis, metadata):
+    """The result event payload for one batch posting"""
+    return {
+        'job_title': job_title,
+        'result_html': markdown.markdown(enhanced_resume),
+        'notes_html': markdown.markdown(notes),
+        'enhanced_text': enhanced_resume,
+        'job_analysis': markdown.markdown(f"**Job Analysis:**\n{job_analysis}"),
+        'metadata': metadata,
+    }
 
-def create_jpg_resume(text):
-    """Create a JPG resume from text content"""
+async def stream_batch_async(resume, jobs, resume_id=None, use_cache=True):
+    """
+    Yield SSE events for a batch: the resume is parsed once and its structure shared by every
+    posting's enhancement; postings run with bounded concurrency and each result is sent as soon
+    as it completes.
+    """
+    total = len(jobs)
+    yield sse_event('start', {'total': total, 'resume_id': resume_id or None})
+    slots = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def run_item(index, job):
+        async with slots:
+            try:
+                return index, await enhance_for_job(resume, job['jd'], job.get('job_title', ''), structure,
+                                                    use_cache), None
+            except Exception as e:
+                return index, None, e
+
+    # A batch is bulk work: its LLM calls queue behind interactive /tool requests
+    with llm_scheduler.priority(BULK):
+        # Started first, so it is running before any posting waits for it
+        structure = asyncio.ensure_future(parse_batch_structure(resume, use_cache))
+        items = [asyncio.ensure_future(run_item(index, job)) for index, job in enumerate(jobs)]
+    completed = 0
     try:
-        # Image dimensions
-        width, height = 2480, 3508  # A4 size at 300 DPI
-        image = Image.new('RGB', (width, height), 'white')
-        draw = ImageDraw.Draw(image)
-        
-        # Try to use a system font, fallback to default
         try:
-            font_large = ImageFont.truetype("arial.ttf", 48)
-            font_medium = ImageFont.truetype("arial.ttf", 32)
-            font_small = ImageFont.truetype("arial.ttf", 24)
-        except:
-            try:
-                font_large = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 48)
-                font_medium = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 32)
-                font_small = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 24)
-            except:
-                font_large = ImageFont.load_default()
-                font_medium = ImageFont.load_default()
-                font_small = ImageFont.load_default()
-        
-        # Parse and draw text
-        lines = text.split('\n')
-        y_position = 100
-        line_height = 60
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                y_position += 30
-                continue
-                
-            # Determine font size based on content
-            if len(line) < 50 and not line.startswith('•') and not line.startswith('-') and not line.startswith('*'):
-                if y_position < 200:  # Likely the name/title
-                    font = font_large
-                    color = (0, 0, 139)  # Dark blue
-                else:
-                    font = font_medium
-                    color = (0, 0, 139)  # Dark blue
+            resume_structure, _ = await asyncio.shield(structure)
+        except Exception as e:
+            print(f"Error parsing resume structure: {str(e)}")
+            resume_structure = RESUME_STRUCTURE_FALLBACK
+        yield sse_event('resume_structure', {
+            'html': await run_sync(markdown.markdown, f"**Resume Structure Analysis:**\n{resume_structure}")
+        })
+
+        for next_item in asyncio.as_completed(items):
+            index, item, error = await next_item
+            completed += 1
+            if error is None:
+                yield sse_event('result', {'index': index, 'completed': completed, 'total': total, **item})
             else:
-                font = font_small
-                color = (0, 0, 0)  # Black
-            
-            # Wrap long lines
-            wrapped_lines = textwrap.wrap(line, width=80)
-            for wrapped_line in wrapped_lines:
-                if y_position > height - 100:
-                    break
-                draw.text((100, y_position), wrapped_line, font=font, fill=color)
-                y_position += line_height
-        
-        # Save to buffer
-        buffer = BytesIO()
-        image.save(buffer, format='JPEG', quality=95)
-        buffer.seek(0)
-        return buffer
-    except Exception as e:
-        print(f"Error creating JPG: {str(e)}")
-        return None
-
-@app.route('/tool', methods=['POST'])
-def tool():
+                print(f"Error enhancing batch item {index}: {str(error)}")
+                yield sse_event('item_error', {'index': index, 'completed': completed, 'total': total,
+                                               'error': str(error)})
+        yield sse_event('done', {'completed': completed, 'total': total})
+    finally:
+        # Client went away: stop the postings still running
+        structure.cancel()
+        for task in items:
+            task.cancel()
+
+def stream_batch(*args, **kwargs):
+    """stream_batch_async() as a plain generator, for the Flask view"""
+    return iterate_async(stream_batch_async(*args, **kwargs))
+
+def read_resume_input():
     """
-    Accepts form-data:
-    - jd: job description text
-    - resume: optional resume text
-    - resume_file: optional file (pdf/docx)
-    Returns JSON: { result_html, notes_html, enhanced_text }
+    Read the resume from resume text, an uploaded resume_file or a resume_id from an earlier upload.
+    Returns (resume, resume_id, None) on success or (None, None, error_response) on invalid input.
     """
     # If JSON body (rare), read it too
-    jd = request.form.get('jd', '') or (request.json.get('jd') if request.is_json else '')
     resume = request.form.get('resume', '') or (request.json.get('resume') if request.is_json else '')
-    job_title = request.form.get('job_title', '') or (request.json.get('job_title') if request.is_json else '')
+    resume_id = request.form.get('resume_id', '') or (request.json.get('resume_id', '') if request.is_json else '')
 
-    # If file uploaded, extract text
+    # If file uploaded, extract text (cached by content hash)
     if 'resume_file' in request.files and request.files['resume_file'].filename:
-        file = request.files['resume_file']
-        filename = file.filename.lower()
         try:
-            if filename.endswith('.docx'):
-                doc = Document(file)
-                resume = '\n'.join([para.text for para in doc.paragraphs])
-            elif filename.endswith('.pdf'):
-                reader = PyPDF2.PdfReader(file)
-                resume = '\n'.join([page.extract_text() or '' for page in reader.pages])
-            else:
-                return jsonify({'error': 'Unsupported file format. Please upload DOCX or PDF.'}), 400
+            resume, resume_id = extract_resume_text(request.files['resume_file'])
+        except UnsupportedFileError:
+            return None, None, (jsonify({'error': 'Unsupported file format. Please upload DOCX or PDF.'}), 400)
+        except ExtractionError as e:
+            return None, None, (jsonify({'error': str(e)}), e.status_code)
         except Exception as e:
-            return jsonify({'error': f'Error processing file: {str(e)}'}), 500
+            return None, None, (jsonify({'error': f'Error processing file: {str(e)}'}), 500)
+        return resume, resume_id, None
 
-    if not jd:
-        return jsonify({'error': 'Please provide a job description.'}), 400
-    
-    # Check if either resume text or file is provided
-    has_resume_text = resume and resume.strip()
-    has_resume_file = 'resume_file' in request.files and request.files['resume_file'].filename
-    
-    if not has_resume_text and not has_resume_file:
-        return jsonify({'error': 'Please provide resume text or upload a file.'}), 400
+    if resume_id and not resume:
+        # A previously uploaded file, referenced by the resume_id returned for it
+        resume = lookup_resume_text(resume_id)
+        if resume is None:
+            return None, None, (jsonify({'error': 'Unknown or expired resume_id. Please upload the file again.'}), 404)
 
-    # Parse resume structure for better AI processing
-    try:
-        resume_structure = parse_resume_structure(resume)
-    except Exception as e:
-        print(f"Error parsing resume structure: {str(e)}")
-        resume_structure = "Resume structure parsing failed. Proceeding with enhancement..."
-    
-    # Analyze job requirements for better targeting
-    try:
-        job_analysis = analyze_job_requirements(jd, job_title)
-    except Exception as e:
-        print(f"Error analyzing job requirements: {str(e)}")
-        job_analysis = "Job analysis failed. Proceeding with enhancement..."
-    
-    # Enhance resume with job-specific intelligence
-    enhanced_resume, notes = enhance_resume(jd, resume, job_title)
+    if not resume or not resume.strip():
+        return None, None, (jsonify({'error': 'Please provide resume text or upload a file.'}), 400)
+    return resume, resume_id, None
 
-    # Render simple HTML (React will render this via dangerouslySetInnerHTML)
-    result_html = markdown.markdown(enhanced_resume)
-    notes_html = markdown.markdown(notes)
-    
-    # Include job analysis and resume structure in the response
-    analysis_html = markdown.markdown(f"**Job Analysis:**\n{job_analysis}")
-    structure_html = markdown.markdown(f"**Resume Structure Analysis:**\n{resume_structure}")
+def read_tool_request():
+    """
+    Read the /tool inputs from form-data or JSON, extracting text from an uploaded file.
+    Returns (inputs, None) on success or (None, error_response) on invalid input.
+    """
+    # If JSON body (rare), read it too
+    jd = request.form.get('jd', '') or (request.json.get('jd') if request.is_json else '')
+    job_title = request.form.get('job_title', '') or (request.json.get('job_title') if request.is_json else '')
+    no_cache = request.form.get('no_cache', '') or (request.json.get('no_cache', '') if request.is_json else '')
+    use_cache = str(no_cache).lower() not in ('1', 'true')
+    mode = (request.form.get('mode', '') or (request.json.get('mode', '') if request.is_json else '')
+            or DEFAULT_PIPELINE_MODE).lower()
+    if mode not in PIPELINE_MODES:
+        return None, (jsonify({'error': f"Unknown mode. Use one of: {', '.join(PIPELINE_MODES)}."}), 400)
+
+    resume, resume_id, error_response = read_resume_input()
+    if error_response:
+        return None, error_response
 
-    return jsonify({
+    if not jd:
+        return None, (jsonify({'error': 'Please provide a job description.'}), 400)
+
+    return {'jd': jd, 'resume': resume, 'job_title': job_title, 'use_cache': use_cache, 'resume_id': resume_id,
+            'mode': mode}, None
+
+async def run_analyses(jd, resume, job_title, use_cache, models):
+    """The resume structure and job analysis stages: (resume_structure, job_analysis, stage metadata, total_ms)"""
+    # Structure parsing and job analysis are independent, so run them concurrently
+    results, metadata = await run_stages([
+        Stage('resume_structure', parse_resume_structure, (resume, use_cache, models),
+              timeout=ANALYSIS_STAGE_TIMEOUT,
+              fallback=RESUME_STRUCTURE_FALLBACK),
+        Stage('job_analysis', analyze_job_requirements, (jd, job_title, use_cache, models),
+              timeout=ANALYSIS_STAGE_TIMEOUT,
+              fallback=JOB_ANALYSIS_FALLBACK),
+    ])
+    return results['resume_structure'], results['job_analysis'], metadata['stages'], metadata['total_ms']
+
+async def run_tool_pipeline_async(jd, resume, job_title='', use_cache=True, resume_id=None,
+                                  mode=DEFAULT_PIPELINE_MODE):
+    """Run the /tool pipeline for the given mode (see PIPELINE_MODES) and return the response payload"""
+    tier = PIPELINE_MODES[mode]
+    resume_structure = job_analysis = ""
+    stage_metadata = {}
+    total_ms = 0.0
+
+    if tier['analysis_models']:
+        resume_structure, job_analysis, stage_metadata, total_ms = await run_analyses(
+            jd, resume, job_title, use_cache, tier['analysis_models'])
+
+    results, metadata = await run_stages([
+        Stage('enhancement', enhance_resume, (jd, resume, job_title),
+              kwargs=dict(usable_analyses(resume_structure, job_analysis, stage_metadata), models=tier['enhance_models']),
+              timeout=ENHANCE_STAGE_TIMEOUT,
+              fallback=ENHANCEMENT_FALLBACK),
+    ])
+    stage_metadata.update(metadata['stages'])
+    metadata = {
+        'stages': stage_metadata,
+        'total_ms': round(total_ms + metadata['total_ms'], 1),
+        'mode': mode,
+    }
+    # Markdown rendering and the skill gap are CPU work
+    return await run_sync(tool_response, jd, resume, resume_id, results['enhancement'], job_analysis,
+                          resume_structure, metadata)
+
+def run_tool_pipeline(*args, **kwargs):
+    """run_tool_pipeline_async() for threads: the Flask view and the job queue workers"""
+    return run_async(run_tool_pipeline_async(*args, **kwargs))
+
+def usable_analyses(resume_structure, job_analysis, stage_metadata):
+    """Only successful analyses are worth handing to the enhancement"""
+    return {
+        name: value for name, value in (('resume_structure', resume_structure), ('job_analysis', job_analysis))
+        if stage_metadata.get(name, {}).get('status') == 'ok' and not value.startswith(('Parsing error', 'Analysis error'))
+    }
+
+def tool_response(jd, resume, resume_id, enhancement, job_analysis, resume_structure, metadata):
+    """The /tool response payload for an (enhanced_resume, notes, served_by) enhancement result"""
+    enhanced_resume, notes, served_by = enhancement
+    metadata['served_by'] = served_by
+
+    with metrics.span('markdown'):
+        # Render simple HTML (React will render this via dangerouslySetInnerHTML)
+        result_html = markdown.markdown(enhanced_resume)
+        notes_html = markdown.markdown(notes)
+
+        # Include job analysis and resume structure in the response
+        analysis_html = markdown.markdown(f"**Job Analysis:**\n{job_analysis}") if job_analysis else ""
+        structure_html = markdown.markdown(f"**Resume Structure Analysis:**\n{resume_structure}") if resume_structure else ""
+
+    return {
         'result_html': result_html,
         'notes_html': notes_html,
         'enhanced_text': enhanced_resume,
         'job_analysis': analysis_html,
-        'resume_structure': structure_html
-    })
+        'resume_structure': structure_html,
+        'skill_gap': skills.skill_gap(resume, jd),
+        'resume_id': resume_id or None,
+        'metadata': metadata
+    }
+
+# Durable queue for /tool?async=1; jobs survive restarts and are retried if a worker dies mid-job
+job_queue = JobQueue(
+    os.environ.get("JOB_QUEUE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "jobs.sqlite3")),
+    handlers={'tool': run_tool_pipeline},
+    workers=int(os.environ.get("JOB_WORKERS", "4")),
+    lease_seconds=float(os.environ.get("JOB_LEASE_SECONDS", "300")),
+)
+
+def start_background_work():
+    """
+    Start the job queue workers and the warm-up. Called by the server entry points (app.run below,
+    asgi.py's startup), not on import, so tools that import this module and the reloader's watcher
+    process neither claim jobs nor load what only a serving process needs.
+    A WSGI server should call it once per worker process after forking.
+    """
+    job_queue.start()
+    # Load the Groq client, renderers, extraction workers and skills matcher ahead of the first request (WARM_UP)
+    warmup.start([('markdown', lambda: markdown.markdown(''))])
+
+def enqueue_tool_job(inputs, idempotency_key=None):
+    """202 response for a /tool?async=1 request whose inputs were persisted as a job"""
+    # A retried submission gets the job of the first one instead of queueing the work twice
+    job_id, _ = tool_flight.do(request_key(dict(inputs, run='async')), job_queue.enqueue, 'tool', inputs,
+                               idempotency_key=idempotency_key)
+    status_url = f'/jobs/{job_id}'
+    return jsonify({'job_id': job_id, 'status': 'queued', 'status_url': status_url}), 202, {'Location': status_url}
 
-@app.route('/download_docx', methods=['POST'])
-def download_docx():
-    data = request.get_json()
-    text = data.get('text', '')
-    doc = Document()
-    for line in text.split('\n'):
-        doc.add_paragraph(line)
-    buf = BytesIO()
-    doc.save(buf)
-    buf.seek(0)
-    return send_file(buf,
-                     as_attachment=True,
-                     download_name='enhanced_resume.docx',
-                     mimetype='application/vnd.openxmlformats-officedocument.wordprocessingml.document')
-
-@app.route('/download_pdf', methods=['POST'])
-def download_pdf():
-    """Download resume as PDF"""
-    data = request.get_json()
-    text = data.get('text', '')
-    
-    if not text:
-        return jsonify({'error': 'No text provided'}), 400
-    
-    pdf_buffer = create_pdf_resume(text)
-    if not pdf_buffer:
-        return jsonify({'error': 'Failed to create PDF'}), 500
-    
-    return send_file(pdf_buffer,
-                     as_attachment=True,
-                     download_name='enhanced_resume.pdf',
-                     mimetype='application/pdf')
-
-@app.route('/download_jpg', methods=['POST'])
-def download_jpg():
-    """Download resume as JPG"""
-    data = request.get_json()
-    text = data.get('text', '')
-    
-    if not text:
-        return jsonify({'error': 'No text provided'}), 400
-    
-    jpg_buffer = create_jpg_resume(text)
-    if not jpg_buffer:
-        return jsonify({'error': 'Failed to create JPG'}), 500
-    
-    return send_file(jpg_buffer,
-                     as_attachment=True,
-                     download_name='enhanced_resume.jpg',
-                     mimetype='image/jpeg')
+@app.route('/tool', methods=['POST'])
+def tool():
+    """
+    Accepts form-data:
+    - jd: job description text
+    - resume: optional resume text
+    - resume_file: optional file (pdf/docx)
+    - resume_id: optional id returned for an earlier upload, instead of resume_file
+    - no_cache: optional, "1" to bypass the LLM response cache
+    - mode: optional, "fast", "standard" (default) or "thorough"; see PIPELINE_MODES
+    Returns JSON: { result_html, notes_html, enhanced_text, job_analysis, resume_structure, skill_gap, resume_id, metadata }
+    where metadata carries the mode, per-stage status and latency, and served_by { model, hedged } for the
+    enhancement, and skill_gap { matched, missing, additional } comes from the local skills matcher.
+    job_analysis and resume_structure are empty in fast mode.
+    With ?async=1 returns 202 { job_id, status, status_url } instead; poll GET /jobs/<job_id>
+    An optional Idempotency-Key header makes retries safe: a request repeating a key gets the result (or
+    job) of the first request that sent it, marked with Idempotent-Replayed: true
+    Returns 429 with Retry-After when the LLM rate limits of every model a stage may use would delay the
+    request past LLM_QUEUE_DEADLINE
+    """
+    inputs, error_response = read_tool_request()
+    if error_response:
+        return error_response
+
+    # Async mode: persist the job and let the background workers run it
+    if request.args.get('async', '').lower() in ('1', 'true'):
+        return enqueue_tool_job(inputs, request.headers.get('Idempotency-Key'))
+
+    payload, replayed = tool_flight.do(request_key(inputs), run_tool_pipeline,
+                                       idempotency_key=request.headers.get('Idempotency-Key'), **inputs)
+    return jsonify(payload), replay_headers(replayed)
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """
+    Status of an async /tool job: { job_id, status, result, error, attempts, created_at, updated_at }
+    status is one of queued, running, done, error; result holds the /tool response once done
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job.'}), 404
+    return jsonify(job)
+
+@app.route('/tool/stream', methods=['POST'])
+def tool_stream():
+    """
+    Same inputs as /tool, but streams the enhancement as Server-Sent Events:
+    - analysis: { job_analysis, resume_structure } HTML, before the enhancement starts (not in fast mode)
+    - start: { model, mode }
+    - resume: { html } fragment of the enhanced resume
+    - notes: { html } fragment of the enhancement summary
+    - done: { enhanced_text, notes }
+    - error: { error, retry_after } (retry_after when the LLM rate limit is reached)
+    """
+    inputs, error_response = read_tool_request()
+    if error_response:
+        return error_response
+
+    events = stream_enhancement(inputs['jd'], inputs['resume'], inputs['job_title'], inputs['use_cache'],
+                                inputs['mode'])
+    return Response(stream_with_context(events),
+                    mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/tool/batch', methods=['POST'])
+def tool_batch():
+    """
+    Tailor one resume to many job postings in a single request.
+    Accepts JSON { resume | resume_id, jobs: [{ jd, job_title }], no_cache } or form-data with
+    resume_file / resume / resume_id and jobs as a JSON-encoded string.
+    Streams Server-Sent Events:
+    - start: { total, resume_id }
+    - resume_structure: { html } (parsed once for the whole batch)
+    - result: { index, completed, total, job_title, result_html, notes_html, enhanced_text, job_analysis, metadata }
+    - item_error: { index, completed, total, error }
+    - done: { completed, total }
+    """
+    inputs, error_response = read_batch_request()
+    if error_response:
+        return error_response
+
+    events = stream_batch(inputs['resume'], inputs['jobs'], inputs['resume_id'], inputs['use_cache'])
+    return Response(events,
+                    mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def read_batch_request():
+    """
+    Read the /tool/batch inputs from JSON or form-data.
+    Returns (inputs, None) on success or (None, error_response) on invalid input.
+    """
+    jobs = request.form.get('jobs', '') or (request.json.get('jobs') if request.is_json else '')
+    if isinstance(jobs, str):
+        try:
+            jobs = json.loads(jobs) if jobs else []
+        except ValueError:
+            return None, (jsonify({'error': 'jobs must be a JSON list of {jd, job_title} objects.'}), 400)
+    if not isinstance(jobs, list) or not jobs:
+        return None, (jsonify({'error': 'Please provide at least one job description in jobs.'}), 400)
+    if len(jobs) > BATCH_MAX_JOBS:
+        return None, (jsonify({'error': f'Too many job descriptions. The limit is {BATCH_MAX_JOBS} per batch.'}), 400)
+    if not all(isinstance(job, dict) and job.get('jd') for job in jobs):
+        return None, (jsonify({'error': 'Every job needs a non-empty jd.'}), 400)
+
+    no_cache = request.form.get('no_cache', '') or (request.json.get('no_cache', '') if request.is_json else '')
+    use_cache = str(no_cache).lower() not in ('1', 'true')
+
+    resume, resume_id, error_response = read_resume_input()
+    if error_response:
+        return None, error_response
+    return {'resume': resume, 'jobs': jobs, 'resume_id': resume_id, 'use_cache': use_cache}, None
+
+@app.route('/cache_stats', methods=['GET'])
+def cache_stats():
+    """Hit/miss counters for the LLM response cache"""
+    return jsonify(llm_cache.stats())
+
+@app.route('/model_health', methods=['GET'])
+def model_health():
+    """Circuit state, error rate and latency per enhancement model, and the rate-limit buckets per model"""
+    return jsonify({'models': enhance_router.stats(), 'hedging': dict(hedge_budget.stats(), enabled=HEDGE_ENABLED),
+                    'rate_limits': llm_scheduler.scheduler.stats()})
 
 if __name__ == '__main__':
+    # The debug reloader runs this module twice: in a watcher process, and in the serving child it
+    # starts with WERKZEUG_RUN_MAIN set. Only the child serves requests, so only it runs jobs.
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_background_work()
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
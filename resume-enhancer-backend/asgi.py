@@ -0,0 +1,61 @@
+# backend/asgi.py
+# Async serving mode: the same API as app.py, with the LLM-bound endpoints (/tool, /tool/stream,
+# /tool/batch) awaiting app.py's pipelines on the server's event loop, so a request waiting on Groq
+# holds no thread or worker process. Everything else (downloads, stats, job status) is served by the
+# Flask app on a thread pool. Run with:
+#
+#     uvicorn asgi:application --port 5000
+from flask import Response, jsonify, request
+
+import app as backend
+from resume_core.asgi_bridge import AsgiBridge
+from resume_core.event_loop import run_sync
+from resume_core.singleflight import replay_headers, request_key
+
+application = AsgiBridge(backend.app)
+application.on_startup(backend.start_background_work)
+
+
+def event_stream(events):
+    """Server-Sent Events response streaming an async generator of events"""
+    return Response(events,
+                    mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@application.route('/tool', methods=['POST'])
+async def tool():
+    """/tool (see app.tool) with the pipeline awaited; upload extraction runs on the blocking pool"""
+    inputs, error_response = await run_sync(backend.read_tool_request)
+    if error_response:
+        return error_response
+
+    if request.args.get('async', '').lower() in ('1', 'true'):
+        return await run_sync(backend.enqueue_tool_job, inputs, request.headers.get('Idempotency-Key'))
+
+    payload, replayed = await backend.tool_flight.do_async(request_key(inputs), backend.run_tool_pipeline_async,
+                                                           idempotency_key=request.headers.get('Idempotency-Key'),
+                                                           **inputs)
+    return jsonify(payload), replay_headers(replayed)
+
+
+@application.route('/tool/stream', methods=['POST'])
+async def tool_stream():
+    """/tool/stream (see app.tool_stream) with the completion streamed over the async client"""
+    inputs, error_response = await run_sync(backend.read_tool_request)
+    if error_response:
+        return error_response
+
+    return event_stream(backend.stream_enhancement_async(inputs['jd'], inputs['resume'], inputs['job_title'],
+                                                         inputs['use_cache'], inputs['mode']))
+
+
+@application.route('/tool/batch', methods=['POST'])
+async def tool_batch():
+    """/tool/batch (see app.tool_batch); the postings' tasks are cancelled if the client goes away"""
+    inputs, error_response = await run_sync(backend.read_batch_request)
+    if error_response:
+        return error_response
+
+    return event_stream(backend.stream_batch_async(inputs['resume'], inputs['jobs'], inputs['resume_id'],
+                                                   inputs['use_cache']))
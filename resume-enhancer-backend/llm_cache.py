@@ -0,0 +1,51 @@
+# backend/llm_cache.py
+import hashlib
+import json
+import os
+
+from resume_core.event_loop import run_sync
+from resume_core.cache import TieredCache
+from resume_core.metrics import llm_call
+
+# Request fields that determine the completion text; anything else (stream, timeouts) is ignored
+KEY_FIELDS = ("model", "messages", "temperature", "max_tokens", "top_p", "stop")
+
+
+def make_key(request_kwargs):
+    """Hash the completion parameters that affect the output"""
+    payload = {field: request_kwargs.get(field) for field in KEY_FIELDS}
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+# Process-wide cache instance: in-memory LRU backed by SQLite, with TTL and size-based eviction
+CACHE_ENABLED = os.environ.get("LLM_CACHE_ENABLED", "1") != "0"
+llm_cache = TieredCache(
+    os.environ.get("LLM_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "llm_cache.sqlite3")),
+    table="llm_cache",
+    max_memory_entries=int(os.environ.get("LLM_CACHE_MEMORY_ENTRIES", "256")),
+    max_disk_bytes=int(os.environ.get("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+    ttl=float(os.environ.get("LLM_CACHE_TTL", str(7 * 24 * 3600))),
+)
+
+
+async def cached_completion(client, use_cache=True, call="completion", **kwargs):
+    """
+    Await client.chat.completions.create(**kwargs) through the cache and return the message text.
+    Pass use_cache=False to bypass the cache for a single call; call names the request in metrics.
+    Cache reads and writes (SQLite) run off the event loop.
+    """
+    use_cache = use_cache and CACHE_ENABLED and not kwargs.get("stream")
+    key = make_key(kwargs) if use_cache else None
+    if key is not None:
+        cached = await run_sync(llm_cache.get, key)
+        if cached is not None:
+            return cached
+
+    with llm_call(call, kwargs.get("model", "")) as tracked:
+        completion = await client.chat.completions.create(**kwargs)
+        tracked.record(completion)
+    content = completion.choices[0].message.content
+    if key is not None and content:
+        await run_sync(llm_cache.set, key, content)
+    return content
@@ -0,0 +1,81 @@
+# backend/pipeline.py
+import asyncio
+import time
+
+from resume_core.llm_scheduler import RateLimitedError
+from resume_core.metrics import current_endpoint, record_error, stage_duration
+
+
+class Stage:
+    """A named unit of work that does not depend on the output of other stages"""
+
+    def __init__(self, name, func, args=(), kwargs=None, timeout=60.0, fallback=None):
+        self.name = name
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.timeout = timeout
+        self.fallback = fallback
+
+
+def _timed_out(stage, endpoint):
+    print(f"Stage '{stage.name}' timed out after {stage.timeout}s")
+    record_error(stage.name, 'timeout')
+    stage_duration.observe(stage.timeout, endpoint=endpoint, stage=stage.name)
+    return stage.fallback, {"status": "timeout", "latency_ms": round(stage.timeout * 1000, 1)}
+
+
+def _finished(stage, value, error, latency_ms, endpoint):
+    stage_duration.observe(latency_ms / 1000, endpoint=endpoint, stage=stage.name)
+    if isinstance(error, RateLimitedError):
+        # Over the LLM rate limit: the request is answered 429 rather than with the fallback
+        raise error
+    if error is not None:
+        print(f"Stage '{stage.name}' failed: {str(error)}")
+        record_error(stage.name, error)
+        return stage.fallback, {"status": "error", "latency_ms": round(latency_ms, 1), "error": str(error)}
+    return value, {"status": "ok", "latency_ms": round(latency_ms, 1)}
+
+
+async def _timed_call(stage):
+    started = time.perf_counter()
+    try:
+        value = await stage.func(*stage.args, **stage.kwargs)
+        return value, None, (time.perf_counter() - started) * 1000
+    except Exception as e:
+        return None, e, (time.perf_counter() - started) * 1000
+
+
+async def run_stages(stages):
+    """
+    Start all stages (func is a coroutine function) as concurrent tasks and await each until its own
+    deadline; a stage past its deadline is cancelled. Returns (results, metadata) where results maps
+    stage name to its value (or its fallback on error/timeout; RateLimitedError is raised instead) and
+    metadata is { stages: { name: { status, latency_ms } }, total_ms } with status one of "ok", "error"
+    or "timeout".
+    """
+    started = time.perf_counter()
+    tasks = [(stage, asyncio.ensure_future(_timed_call(stage))) for stage in stages]
+    endpoint = current_endpoint()
+
+    results = {}
+    stage_metadata = {}
+    try:
+        # All stages start together, so waiting in deadline order never overshoots a deadline
+        for stage, task in sorted(tasks, key=lambda item: item[0].timeout):
+            remaining = stage.timeout - (time.perf_counter() - started)
+            try:
+                value, error, latency_ms = await asyncio.wait_for(task, timeout=max(remaining, 0))
+            except asyncio.TimeoutError:
+                results[stage.name], stage_metadata[stage.name] = _timed_out(stage, endpoint)
+                continue
+            results[stage.name], stage_metadata[stage.name] = _finished(stage, value, error, latency_ms, endpoint)
+    finally:
+        # The request itself was cancelled (client gone): stop the stages still running
+        for _, task in tasks:
+            task.cancel()
+
+    return results, {
+        "stages": stage_metadata,
+        "total_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
@@ -0,0 +1,66 @@
+# backend/streaming.py
+import json
+
+from resume_core.lazy import lazy_import
+
+markdown = lazy_import('markdown')
+
+# Markers the model uses to start the notes section after the enhanced resume
+NOTES_MARKERS = ("Enhancement Summary:", "Changes Made:")
+
+
+def sse_event(event, data):
+    """Format one Server-Sent Event; data is JSON-encoded so it never contains raw newlines"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class EnhancementStream:
+    """
+    Incrementally converts streamed completion text into HTML fragments.
+    Text is emitted one markdown block (paragraph, list, heading group) at a time on the
+    "resume" channel until a notes marker appears, after which it goes to the "notes" channel.
+    """
+
+    def __init__(self):
+        self.channel = "resume"
+        self.pending = ""
+        self.text = {"resume": "", "notes": ""}
+
+    def feed(self, delta):
+        """Consume a streamed delta and return a list of (channel, html) fragments ready to send"""
+        if not delta:
+            return []
+        self.pending += delta
+        fragments = []
+
+        if self.channel == "resume":
+            positions = [(self.pending.find(marker), marker) for marker in NOTES_MARKERS]
+            positions = [(pos, marker) for pos, marker in positions if pos >= 0]
+            if positions:
+                pos, _ = min(positions)
+                fragments.extend(self._emit(self.pending[:pos]))
+                self.pending = self.pending[pos:]
+                self.channel = "notes"
+
+        # Only whole blocks are rendered; a marker never spans a blank line, so this is safe
+        boundary = self.pending.rfind("\n\n")
+        if boundary >= 0:
+            fragments.extend(self._emit(self.pending[:boundary]))
+            self.pending = self.pending[boundary + 2:]
+        return fragments
+
+    def finish(self):
+        """Flush whatever is left once the model stops"""
+        fragments = self._emit(self.pending)
+        self.pending = ""
+        return fragments
+
+    def result(self):
+        """Full (enhanced_resume, notes) text, matching enhance_resume's return value"""
+        return self.text["resume"].strip(), self.text["notes"].strip()
+
+    def _emit(self, block_text):
+        self.text[self.channel] += block_text + "\n\n"
+        if not block_text.strip():
+            return []
+        return [(self.channel, markdown.markdown(block_text))]
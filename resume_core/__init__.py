@@ -0,0 +1 @@
+# resume_core: code shared by resume-enhancer-backend and career-guidance-backend
@@ -0,0 +1,149 @@
+# resume_core/asgi_bridge.py
+import asyncio
+import os
+
+from a2wsgi import WSGIMiddleware
+from a2wsgi.wsgi import Body, build_environ
+
+from resume_core.event_loop import run_sync, use_loop
+
+# Threads serving the Flask routes that stay synchronous (downloads, stats, uploads)
+SYNC_WORKERS = int(os.environ.get("ASGI_SYNC_WORKERS", "32"))
+
+
+async def _wait_for_disconnect(receive):
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+async def _send_chunks(chunks, send):
+    try:
+        async for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            if chunk:
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+    finally:
+        await chunks.aclose()
+
+
+class AsgiBridge:
+    """
+    ASGI application in front of a Flask app. Paths registered with route() are served by async views
+    on the event loop; every other request goes to the Flask app through a2wsgi's WSGIMiddleware.
+
+    Async views run inside a Flask request context, so request, jsonify, errorhandlers and the app's
+    before/after request hooks (CORS, metrics) behave as they do for Flask views. The request body is
+    read on demand, so views hand anything that touches request.form, request.files or request.json to
+    run_sync(). A view may return a Response whose body is an async generator; it is streamed, and
+    closed if the client goes away.
+
+    The server's event loop is the one run_async() uses, so LLM calls made from Flask routes and job
+    workers share the pooled AsyncGroq client with the async views.
+    """
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.wsgi = WSGIMiddleware(flask_app, workers=SYNC_WORKERS)
+        self._views = {}
+        self._startup = []
+        self._loop = None
+
+    def on_startup(self, func):
+        """Run blocking func on the blocking pool when the server starts (ASGI lifespan startup)"""
+        self._startup.append(func)
+        return func
+
+    def route(self, path, methods=("GET",)):
+        """Serve path with an async view (exact path match; no URL converters)"""
+        def decorator(view):
+            for method in methods:
+                self._views[(method.upper(), path)] = view
+            return view
+        return decorator
+
+    def _bind_loop(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            use_loop(loop)
+
+    async def __call__(self, scope, receive, send):
+        # Before any request or startup hook can reach run_async()
+        self._bind_loop()
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        view = self._views.get((scope["method"], scope["path"]))
+        if view is None:
+            await self.wsgi(scope, receive, send)
+        else:
+            await self._call_view(view, scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    for func in self._startup:
+                        await run_sync(func)
+                except Exception as e:
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _call_view(self, view, scope, receive, send):
+        app = self.flask_app
+        # Body reads block on receive(), so they only happen in views' run_sync() calls
+        environ = build_environ(scope, Body(asyncio.get_running_loop(), receive))
+        with app.request_context(environ):
+            try:
+                rv = app.preprocess_request()
+                if rv is None:
+                    rv = await view()
+                response = app.make_response(rv)
+            except Exception as e:
+                response = self._handle_error(e)
+            response = app.process_response(response)
+
+        headers = [(name.lower().encode("latin-1"), value.encode("latin-1"))
+                   for name, value in response.headers.to_wsgi_list()]
+        await send({"type": "http.response.start", "status": response.status_code, "headers": headers})
+        if hasattr(response.response, "__aiter__"):
+            await self._stream(response.response, receive, send)
+        else:
+            await send({"type": "http.response.body", "body": response.get_data()})
+        response.close()
+
+    def _handle_error(self, error):
+        """The Flask app's response for an exception raised by an async view"""
+        try:
+            return self.flask_app.make_response(self.flask_app.handle_user_exception(error))
+        except Exception as unhandled:
+            return self.flask_app.handle_exception(unhandled)
+
+    async def _stream(self, chunks, receive, send):
+        # A client that disconnects cancels the body: the generator (and any LLM stream it holds) is closed
+        sender = asyncio.ensure_future(_send_chunks(chunks, send))
+        watcher = asyncio.ensure_future(_wait_for_disconnect(receive))
+        try:
+            await asyncio.wait({sender, watcher}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            watcher.cancel()
+            if not sender.done():
+                sender.cancel()
+            try:
+                await sender
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                print(f"Error sending response body: {str(e)}")
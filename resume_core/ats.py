@@ -0,0 +1,170 @@
+# resume_core/ats.py
+import re
+from collections import Counter
+
+from resume_core.skills import skill_gap
+
+# Deterministic resume scoring: the same resume (and job description) always gets the same scores.
+# Each feature is a 0..1 value; the scores are weighted sums scaled to 0..100.
+ATS_WEIGHTS_WITH_JD = {'keywords': 0.40, 'sections': 0.25, 'contact': 0.15, 'formatting': 0.20}
+ATS_WEIGHTS = {'sections': 0.40, 'contact': 0.25, 'formatting': 0.35}
+RESUME_WEIGHTS = {'quantified': 0.35, 'action_verbs': 0.25, 'sections': 0.20, 'length': 0.20}
+
+# Section name -> heading words that introduce it; the first four are expected on every resume
+SECTIONS = {
+    'experience': ('experience', 'employment', 'work history', 'professional experience'),
+    'education': ('education', 'academic', 'qualifications'),
+    'skills': ('skills', 'technical skills', 'technologies', 'competencies'),
+    'summary': ('summary', 'profile', 'objective', 'about me'),
+    'projects': ('projects', 'portfolio'),
+    'certifications': ('certifications', 'certificates', 'licenses'),
+}
+CORE_SECTIONS = ('experience', 'education', 'skills', 'summary')
+
+ACTION_VERBS = frozenset("""
+achieved analyzed architected automated built collaborated created decreased delivered designed
+developed drove established implemented improved increased launched led managed mentored migrated
+optimized owned reduced refactored resolved scaled shipped spearheaded streamlined trained
+""".split())
+
+STOPWORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can could do does
+for from has have having he her his how i if in into is it its itself job may more most must
+need of on one or other our out over own role same she should so some such than that the their
+them then there these they this those through to under up very was we well were what when where
+which while who will with within work working would you your years year team teams strong ability
+experience including etc using use new
+""".split())
+
+WORDS_IDEAL_RANGE = (350, 900)
+JD_KEYWORD_LIMIT = 30
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#./-]*[a-z0-9+#]|[a-z0-9]")
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_PHONE = re.compile(r"(?:\+?\d[\d\s().-]{7,}\d)")
+_PROFILE_LINK = re.compile(r"linkedin\.com|github\.com|https?://", re.IGNORECASE)
+_BULLET = re.compile(r"^\s*(?:[•▪◦●\-*]|\d+[.)])\s+")
+# Any figure in an achievement line counts: 30%, $2M, 40 services, 4 engineers
+_QUANTITY = re.compile(r"\d")
+_TABLE_CHARS = re.compile(r"[│┃┆┊║|]{2,}|\t{2,}")
+
+
+def tokenize(text):
+    return [token.rstrip('.') for token in _TOKEN.findall(text.lower())]
+
+
+def _terms(tokens):
+    """Unigrams and adjacent non-stopword bigrams"""
+    words = [token for token in tokens if token not in STOPWORDS and not token.isdigit()]
+    bigrams = [f"{a} {b}" for a, b in zip(tokens, tokens[1:]) if a not in STOPWORDS and b not in STOPWORDS
+               and not a.isdigit() and not b.isdigit()]
+    return words, bigrams
+
+
+def jd_keywords(job_description, limit=JD_KEYWORD_LIMIT):
+    """The job description's most frequent meaningful terms, as {term: weight}"""
+    words, bigrams = _terms(tokenize(job_description))
+    counts = Counter(words)
+    # A phrase repeated in the JD ("machine learning") says more than either word alone
+    for bigram, count in Counter(bigrams).items():
+        if count > 1:
+            counts[bigram] = count * 1.5
+    return dict(counts.most_common(limit))
+
+
+def _find_sections(lines):
+    found = set()
+    for line in lines:
+        heading = line.strip().strip('#*:').strip().lower()
+        if not heading or len(heading) > 40:
+            continue
+        for section, names in SECTIONS.items():
+            if any(heading == name or heading.startswith(name + ' ') or heading.endswith(' ' + name)
+                   for name in names):
+                found.add(section)
+    return found
+
+
+def score_resume(resume_text, job_description=None):
+    """
+    Score a resume locally in milliseconds. Returns
+    { ats_score, resume_score, breakdown: { feature: 0..100 }, sections_found, sections_missing,
+      matched_keywords, missing_keywords, matched_skills, missing_skills } (keywords and skills only
+    when a job description is given)
+    """
+    lines = resume_text.split('\n')
+    tokens = tokenize(resume_text)
+    word_count = len(tokens)
+
+    sections = _find_sections(lines)
+    section_score = len(sections & set(CORE_SECTIONS)) / len(CORE_SECTIONS) * 0.8 + \
+        len(sections - set(CORE_SECTIONS)) / (len(SECTIONS) - len(CORE_SECTIONS)) * 0.2
+
+    contact_score = (
+        0.4 * bool(_EMAIL.search(resume_text))
+        + 0.4 * bool(_PHONE.search(resume_text))
+        + 0.2 * bool(_PROFILE_LINK.search(resume_text))
+    )
+
+    bullets = [_BULLET.sub('', line) for line in lines if _BULLET.match(line)]
+    statements = bullets or [line for line in lines if len(line.split()) >= 6]
+    quantified = sum(1 for line in statements if _QUANTITY.search(line)) / len(statements) if statements else 0.0
+    # Half the statements carrying a number is already a strong resume
+    quantified_score = min(1.0, quantified / 0.5)
+    led_by_verb = sum(1 for line in statements if line.split() and line.split()[0].lower().strip(',.') in ACTION_VERBS)
+    action_score = min(1.0, led_by_verb / len(statements) / 0.6) if statements else 0.0
+
+    low, high = WORDS_IDEAL_RANGE
+    if word_count < low:
+        length_score = word_count / low
+    elif word_count > high:
+        length_score = max(0.0, 1 - (word_count - high) / high)
+    else:
+        length_score = 1.0
+
+    long_lines = sum(1 for line in lines if len(line) > 200)
+    formatting_score = max(0.0, 1.0
+                           - (0.3 if _TABLE_CHARS.search(resume_text) else 0.0)
+                           - (0.3 if not bullets else 0.0)
+                           - min(0.2, long_lines * 0.05)
+                           - (0.2 if length_score < 0.5 else 0.0))
+
+    features = {
+        'sections': section_score,
+        'contact': contact_score,
+        'formatting': formatting_score,
+        'quantified': quantified_score,
+        'action_verbs': action_score,
+        'length': length_score,
+    }
+    result = {}
+    if job_description and job_description.strip():
+        keywords = jd_keywords(job_description)
+        words, bigrams = _terms(tokens)
+        present = set(words) | set(bigrams)
+        matched = [term for term in keywords if term in present]
+        total = sum(keywords.values())
+        keyword_coverage = sum(keywords[term] for term in matched) / total if total else 0.0
+        # Skills are matched through the taxonomy, so "k8s" covers a JD asking for Kubernetes
+        gap = skill_gap(resume_text, job_description)
+        wanted = len(gap['matched']) + len(gap['missing'])
+        if wanted:
+            features['keywords'] = (keyword_coverage + len(gap['matched']) / wanted) / 2
+        else:
+            features['keywords'] = keyword_coverage
+        ats_weights = ATS_WEIGHTS_WITH_JD
+        result['matched_keywords'] = matched
+        result['missing_keywords'] = [term for term in keywords if term not in present]
+        result['matched_skills'] = gap['matched']
+        result['missing_skills'] = gap['missing']
+    else:
+        ats_weights = ATS_WEIGHTS
+
+    result.update({
+        'ats_score': round(100 * sum(features[name] * weight for name, weight in ats_weights.items())),
+        'resume_score': round(100 * sum(features[name] * weight for name, weight in RESUME_WEIGHTS.items())),
+        'breakdown': {name: round(100 * value) for name, value in features.items()},
+        'sections_found': sorted(sections),
+        'sections_missing': [section for section in CORE_SECTIONS if section not in sections],
+    })
+    return result
@@ -0,0 +1,126 @@
+# resume_core/cache.py
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from resume_core.storage import create_private_file
+
+
+class TieredCache:
+    """
+    String cache with a bounded in-memory LRU in front of a persistent SQLite table.
+    The SQLite file can be shared by several processes. Entries expire after `ttl`
+    seconds (None = never); the table is trimmed to `max_disk_bytes` and/or
+    `max_disk_entries` by evicting the least recently used rows.
+    """
+
+    def __init__(self, path, table="cache", max_memory_entries=256, max_disk_bytes=None,
+                 max_disk_entries=None, ttl=None):
+        self.path = path
+        self.table = table
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.max_disk_entries = max_disk_entries
+        self.ttl = ttl
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "evictions": 0, "expired": 0}
+
+        create_private_file(path)
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._db.execute(f"CREATE INDEX IF NOT EXISTS {table}_last_access ON {table} (last_access)")
+        self._db.commit()
+
+    def _expired(self, created_at, now):
+        return self.ttl is not None and now - created_at >= self.ttl
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created_at = entry
+                if not self._expired(created_at, now):
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return value
+                del self._memory[key]
+
+            try:
+                row = self._db.execute(f"SELECT value, created_at FROM {self.table} WHERE key = ?", (key,)).fetchone()
+                if row is not None and self._expired(row[1], now):
+                    self._db.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                    self._db.commit()
+                    self._stats["expired"] += 1
+                    row = None
+                if row is not None:
+                    self._db.execute(f"UPDATE {self.table} SET last_access = ? WHERE key = ?", (now, key))
+                    self._db.commit()
+            except sqlite3.Error as e:
+                print(f"Cache read error ({self.table}): {str(e)}")
+                row = None
+
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+
+            self._stats["disk_hits"] += 1
+            self._remember(key, row[0], row[1])
+            return row[0]
+
+    def set(self, key, value):
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            self._remember(key, value, now)
+            try:
+                self._db.execute(
+                    f"INSERT OR REPLACE INTO {self.table} (key, value, size, created_at, last_access)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (key, value, size, now, now),
+                )
+                self._evict_disk()
+                self._db.commit()
+                self._stats["writes"] += 1
+            except sqlite3.Error as e:
+                print(f"Cache write error ({self.table}): {str(e)}")
+
+    def _remember(self, key, value, created_at):
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self):
+        count, total = self._db.execute(f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}").fetchone()
+        excess_rows = count - self.max_disk_entries if self.max_disk_entries is not None else 0
+        excess_bytes = total - self.max_disk_bytes if self.max_disk_bytes is not None else 0
+        if excess_rows <= 0 and excess_bytes <= 0:
+            return
+        # Walk rows oldest-access first until both limits are satisfied
+        victims = []
+        for key, size in self._db.execute(f"SELECT key, size FROM {self.table} ORDER BY last_access"):
+            victims.append((key,))
+            excess_rows -= 1
+            excess_bytes -= size
+            if excess_rows <= 0 and excess_bytes <= 0:
+                break
+        self._db.executemany(f"DELETE FROM {self.table} WHERE key = ?", victims)
+        self._stats["evictions"] += len(victims)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        lookups = hits + stats["misses"]
+        stats["hits"] = hits
+        stats["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+        return stats
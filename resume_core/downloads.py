@@ -0,0 +1,77 @@
+# resume_core/downloads.py
+from flask import Blueprint, request, jsonify, send_file
+
+from resume_core.rendering import create_docx_resume, create_jpg_resume, create_pdf_resume
+from resume_core.render_pool import RENDER_COSTS, RenderBusyError, render_pool
+
+# Download and render-stats routes, identical in both backends: app.register_blueprint(downloads)
+downloads = Blueprint('downloads', __name__)
+
+
+@downloads.app_errorhandler(RenderBusyError)
+def render_busy(e):
+    """Shed download load when the render memory budget is exhausted"""
+    return jsonify({'error': 'Too many downloads in progress. Please try again shortly.'}), 503, {'Retry-After': str(e.retry_after)}
+
+
+@downloads.route('/download_docx', methods=['POST'])
+def download_docx():
+    """Download resume as DOCX"""
+    data = request.get_json()
+    text = data.get('text', '')
+
+    if not text:
+        return jsonify({'error': 'No text provided'}), 400
+
+    docx_buffer = render_pool.run(create_docx_resume, text, cost=RENDER_COSTS['docx'])
+    if not docx_buffer:
+        return jsonify({'error': 'Failed to create DOCX'}), 500
+
+    return send_file(docx_buffer,
+                     as_attachment=True,
+                     download_name='enhanced_resume.docx',
+                     mimetype='application/vnd.openxmlformats-officedocument.wordprocessingml.document')
+
+
+@downloads.route('/download_pdf', methods=['POST'])
+def download_pdf():
+    """Download resume as PDF"""
+    data = request.get_json()
+    text = data.get('text', '')
+
+    if not text:
+        return jsonify({'error': 'No text provided'}), 400
+
+    pdf_buffer = render_pool.run(create_pdf_resume, text, cost=RENDER_COSTS['pdf'])
+    if not pdf_buffer:
+        return jsonify({'error': 'Failed to create PDF'}), 500
+
+    return send_file(pdf_buffer,
+                     as_attachment=True,
+                     download_name='enhanced_resume.pdf',
+                     mimetype='application/pdf')
+
+
+@downloads.route('/download_jpg', methods=['POST'])
+def download_jpg():
+    """Download resume as JPG"""
+    data = request.get_json()
+    text = data.get('text', '')
+
+    if not text:
+        return jsonify({'error': 'No text provided'}), 400
+
+    jpg_buffer = render_pool.run(create_jpg_resume, text, cost=RENDER_COSTS['jpg'])
+    if not jpg_buffer:
+        return jsonify({'error': 'Failed to create JPG'}), 500
+
+    return send_file(jpg_buffer,
+                     as_attachment=True,
+                     download_name='enhanced_resume.jpg',
+                     mimetype='image/jpeg')
+
+
+@downloads.route('/render_stats', methods=['GET'])
+def render_stats():
+    """Render executor latency, queue depth and memory budget usage"""
+    return jsonify(render_pool.stats())
@@ -0,0 +1,103 @@
+# resume_core/event_loop.py
+import asyncio
+import concurrent.futures
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from resume_core.metrics import wrap_context
+
+# Threads for blocking work awaited on the event loop: text extraction, cache I/O, markdown rendering.
+# LLM calls never hold one.
+BLOCKING_WORKERS = int(os.environ.get("BLOCKING_WORKERS", "32"))
+_executor = ThreadPoolExecutor(max_workers=BLOCKING_WORKERS, thread_name_prefix="blocking")
+
+_DONE = object()
+_loop = None
+_loop_pid = None
+_lock = threading.Lock()
+
+
+async def run_sync(func, *args, **kwargs):
+    """Await blocking func on the blocking pool; it runs with the caller's request context and metrics labels"""
+    call = wrap_context(func)
+    return await asyncio.get_running_loop().run_in_executor(_executor, lambda: call(*args, **kwargs))
+
+
+def use_loop(loop):
+    """Run the coroutines of run_async() on loop from now on: the ASGI server's, once it is serving"""
+    global _loop, _loop_pid
+    with _lock:
+        _loop, _loop_pid = loop, os.getpid()
+
+
+def _get_loop():
+    global _loop, _loop_pid
+    with _lock:
+        # A forked WSGI worker inherits the parent's loop but not the thread running it
+        if _loop is None or _loop_pid != os.getpid() or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="event-loop", daemon=True).start()
+            _loop, _loop_pid = loop, os.getpid()
+        return _loop
+
+
+def run_async(coro, context=None):
+    """
+    Run coroutine coro from a thread and return its result. Every LLM call of the process is made on
+    one event loop, so the pooled AsyncGroq client is shared: the ASGI server's, or in any other
+    process (Flask's server, a WSGI server, job workers) one started on first use.
+    coro runs in context, by default a copy of the caller's, so metrics labels and the LLM priority
+    carry over.
+    """
+    loop = _get_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("run_async() cannot wait on the event loop it is called from; await the coroutine")
+
+    context = context if context is not None else contextvars.copy_context()
+    result = concurrent.futures.Future()
+
+    def start():
+        task = loop.create_task(coro, context=context)
+        task.add_done_callback(lambda task: _settle(task, result))
+
+    loop.call_soon_threadsafe(start)
+    return result.result()
+
+
+def _settle(task, result):
+    if task.cancelled():
+        result.cancel()
+    elif task.exception() is not None:
+        result.set_exception(task.exception())
+    else:
+        result.set_result(task.result())
+
+
+async def _next(agen):
+    try:
+        return await agen.__anext__()
+    except StopAsyncIteration:
+        return _DONE
+
+
+def iterate_async(agen):
+    """
+    Async generator agen as a plain generator, for a thread (a Flask streaming response). Each step
+    runs on the event loop in one shared context; closing the generator closes agen there.
+    """
+    context = contextvars.copy_context()
+    try:
+        while True:
+            item = run_async(_next(agen), context)
+            if item is _DONE:
+                return
+            yield item
+    finally:
+        run_async(agen.aclose(), context)
@@ -0,0 +1,285 @@
+# resume_core/extraction.py
+import hashlib
+import multiprocessing
+import os
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+from flask import jsonify, request
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from resume_core.cache import TieredCache
+from resume_core.metrics import span
+from resume_core.prompt_budget import normalize_text, strip_page_furniture
+from resume_core.storage import data_path
+
+READ_CHUNK_SIZE = 64 * 1024
+
+# Limits for a single extraction job
+MAX_UPLOAD_BYTES = int(os.environ.get("EXTRACTION_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+# Largest request body read at all: one upload plus room for the other form fields
+MAX_REQUEST_BYTES = int(os.environ.get("MAX_REQUEST_BYTES", str(MAX_UPLOAD_BYTES + 1024 * 1024)))
+MAX_PDF_PAGES = int(os.environ.get("EXTRACTION_MAX_PAGES", "20"))
+MAX_TEXT_CHARS = int(os.environ.get("EXTRACTION_MAX_CHARS", "60000"))
+EXTRACTION_TIMEOUT = float(os.environ.get("EXTRACTION_TIMEOUT", "10"))
+EXTRACTION_WORKERS = int(os.environ.get("EXTRACTION_WORKERS", "2"))
+
+TIMEOUT_MESSAGE = "File took too long to process. Please upload a simpler PDF or DOCX."
+
+
+class ExtractionError(Exception):
+    """Base class for upload problems; status_code is the HTTP status to answer with"""
+    status_code = 422
+
+
+class UnsupportedFileError(ExtractionError):
+    """Raised when an uploaded file is not one of the accepted formats"""
+    status_code = 400
+
+
+class FileTooLargeError(ExtractionError):
+    """Raised when an upload exceeds the byte or page limit"""
+    status_code = 413
+
+
+class ExtractionTimeoutError(ExtractionError):
+    """Raised when extraction does not finish within EXTRACTION_TIMEOUT"""
+    status_code = 422
+
+
+def install(app, max_request_bytes=MAX_REQUEST_BYTES):
+    """Refuse request bodies over max_request_bytes with 413 before Flask reads them"""
+    app.config['MAX_CONTENT_LENGTH'] = max_request_bytes
+
+    @app.errorhandler(RequestEntityTooLarge)
+    def _request_too_large(e):
+        # A route may raise its own limit (request.max_content_length), so report the one that applied
+        limit = request.max_content_length or max_request_bytes
+        return jsonify({'error': f"Upload is too large. The limit is {limit // (1024 * 1024)} MB."}), 413
+
+
+# Extracted text keyed by the SHA-256 of the uploaded bytes. The default path is shared by both
+# services, so a PDF uploaded to /tool is already extracted for /career_guidance.
+text_cache = TieredCache(
+    os.environ.get("RESUME_TEXT_CACHE_PATH", data_path("resume_text_cache.sqlite3")),
+    table="resume_text",
+    max_memory_entries=int(os.environ.get("RESUME_TEXT_CACHE_MEMORY_ENTRIES", "128")),
+    max_disk_entries=int(os.environ.get("RESUME_TEXT_CACHE_ENTRIES", "2000")),
+    ttl=float(os.environ.get("RESUME_TEXT_CACHE_TTL", str(7 * 24 * 3600))),
+)
+
+
+def read_upload(file, max_bytes=MAX_UPLOAD_BYTES):
+    """Read an uploaded file, hashing the bytes as they are read. Returns (data, sha256 hex digest)"""
+    digest = hashlib.sha256()
+    buffer = BytesIO()
+    size = 0
+    while True:
+        chunk = file.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_bytes:
+            raise FileTooLargeError(f"File is too large. The limit is {max_bytes // (1024 * 1024)} MB.")
+        digest.update(chunk)
+        buffer.write(chunk)
+    return buffer.getvalue(), digest.hexdigest()
+
+
+# Set by the alarm handler; parsers may swallow the exception it raises, so the flag is checked too
+_alarm_fired = False
+
+
+def _on_soft_timeout(signum, frame):
+    global _alarm_fired
+    _alarm_fired = True
+    raise ExtractionTimeoutError(TIMEOUT_MESSAGE)
+
+
+def extract_text(data, filename, max_pages=MAX_PDF_PAGES, max_chars=MAX_TEXT_CHARS, timeout=None):
+    """
+    Extract plain text from PDF or DOCX bytes, stopping once max_chars have been collected.
+    When timeout is given (and the platform supports it) a SIGALRM aborts the job from inside.
+    """
+    global _alarm_fired
+    _alarm_fired = False
+    use_alarm = timeout is not None and hasattr(signal, "setitimer")
+    if use_alarm:
+        previous_handler = signal.signal(signal.SIGALRM, _on_soft_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        # Parsers are imported here, in the extraction worker, rather than with the app
+        if filename.endswith('.docx'):
+            from docx import Document
+
+            paragraphs = Document(BytesIO(data)).paragraphs
+            parts = (para.text for para in paragraphs)
+        elif filename.endswith('.pdf'):
+            import PyPDF2
+
+            reader = PyPDF2.PdfReader(BytesIO(data))
+            if len(reader.pages) > max_pages:
+                raise FileTooLargeError(f"PDF has {len(reader.pages)} pages. The limit is {max_pages}.")
+            parts = (page.extract_text() or '' for page in reader.pages)
+        else:
+            raise UnsupportedFileError(filename)
+
+        collected = []
+        length = 0
+        for part in parts:
+            collected.append(part)
+            length += len(part) + 1
+            if length >= max_chars:
+                break
+        if _alarm_fired:
+            raise ExtractionTimeoutError(TIMEOUT_MESSAGE)
+        # Page headers, hyphenation and whitespace noise are cleaned once, before caching
+        if filename.endswith('.pdf'):
+            collected = strip_page_furniture(collected)
+        return normalize_text('\n'.join(collected))[:max_chars]
+    except ExtractionError:
+        raise
+    except Exception as e:
+        if _alarm_fired:
+            raise ExtractionTimeoutError(TIMEOUT_MESSAGE)
+        raise ExtractionError(f"Error processing file: {str(e)}")
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+
+
+# Extraction runs in a small process pool so a hostile file cannot hold the request process's GIL
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def load_parsers():
+    """Import the PDF and DOCX parsers (run in each extraction worker as it starts, and by the warm-up)"""
+    import docx
+    import PyPDF2
+
+
+def _pool_context():
+    # Forking the app (request, job and probe threads) can copy a lock some other thread holds and
+    # deadlock the child; forkserver workers fork from a clean single-threaded server instead
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    # The server loads only what workers need, not the default __main__ (the whole app)
+    context.set_forkserver_preload(["resume_core.extraction"])
+    return context
+
+
+def warm_up():
+    """Start the extraction workers ahead of the first upload; each imports the parsers as it starts"""
+    pool = _get_pool()
+    for future in [pool.submit(os.getpid) for _ in range(EXTRACTION_WORKERS)]:
+        future.result()
+
+
+def _start_worker(pids):
+    """Extraction worker initializer: report the worker's PID, then import the parsers up front"""
+    pids.put(os.getpid())
+    load_parsers()
+
+
+class _WorkerPool:
+    """
+    ProcessPoolExecutor plus the PIDs of its workers. The executor has no public way to stop a
+    running job, so the workers report their PIDs as they start and terminate() kills them directly.
+    """
+
+    def __init__(self):
+        context = _pool_context()
+        self._pids = context.SimpleQueue()
+        self._known_pids = set()
+        # Workers import the parsers up front, so the first job's timeout is not spent importing
+        self.executor = ProcessPoolExecutor(max_workers=EXTRACTION_WORKERS, mp_context=context,
+                                            initializer=_start_worker, initargs=(self._pids,))
+
+    def submit(self, func, *args):
+        return self.executor.submit(func, *args)
+
+    def terminate(self):
+        while not self._pids.empty():
+            self._known_pids.add(self._pids.get())
+        for pid in self._known_pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError:
+                # Already gone
+                pass
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = _WorkerPool()
+        return _pool
+
+
+def _recycle_pool(pool):
+    """Kill a pool whose worker is stuck past the hard deadline; the next job starts a fresh one"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.terminate()
+
+
+def extract_text_isolated(data, filename, timeout=EXTRACTION_TIMEOUT):
+    """Run extract_text in the process pool with a soft (in-worker) and hard (parent-side) timeout"""
+    for attempt in range(2):
+        pool = _get_pool()
+        try:
+            future = pool.submit(extract_text, data, filename, MAX_PDF_PAGES, MAX_TEXT_CHARS, timeout)
+            # Give the in-worker alarm a moment to fire before killing the worker
+            return future.result(timeout=timeout + 2)
+        except FutureTimeoutError:
+            _recycle_pool(pool)
+            raise ExtractionTimeoutError(TIMEOUT_MESSAGE)
+        except BrokenProcessPool:
+            # Another job's timeout recycled the pool under us; retry once on a fresh pool
+            _recycle_pool(pool)
+            if attempt:
+                raise ExtractionError("Error processing file: extraction worker stopped unexpectedly.")
+
+
+def extract_resume_text(file, allowed_extensions=('.pdf', '.docx')):
+    """
+    Extract text from an uploaded resume, reusing earlier extractions of the same bytes.
+    Returns (text, resume_id); resume_id can be sent back later instead of the file.
+    Raises an ExtractionError subclass for unsupported, oversized, hostile or unreadable files.
+    """
+    filename = file.filename.lower()
+    if not filename.endswith(tuple(allowed_extensions)):
+        raise UnsupportedFileError(filename)
+
+    data, resume_id = read_upload(file)
+    return extract_resume_bytes(data, filename, resume_id)
+
+
+def extract_resume_bytes(data, filename, resume_id=None):
+    """Same as extract_resume_text for bytes already in memory (e.g. ZIP members). Returns (text, resume_id)"""
+    if resume_id is None:
+        resume_id = hashlib.sha256(data).hexdigest()
+    text = text_cache.get(resume_id)
+    if text is None:
+        with span('extract_text'):
+            text = extract_text_isolated(data, filename)
+        if text.strip():
+            text_cache.set(resume_id, text)
+    return text, resume_id
+
+
+def lookup_resume_text(resume_id):
+    """Return previously extracted text for a resume_id, or None if unknown or expired"""
+    if not resume_id:
+        return None
+    return text_cache.get(resume_id.strip().lower())
@@ -0,0 +1,298 @@
+# resume_core/job_queue.py
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+from resume_core.llm_scheduler import BULK, priority
+from resume_core.metrics import set_endpoint
+from resume_core.storage import create_private_file
+
+
+class JobQueue:
+    """
+    Durable local job queue backed by SQLite.
+    Jobs are claimed with a lease; a job whose lease runs out (its worker or process died)
+    goes back to the queue, so queued and in-flight work survives a restart. Several
+    processes may share one database file. Jobs queued together by enqueue_group share a
+    group id and are read back as a unit with group().
+    """
+
+    def __init__(self, path, handlers, workers=2, lease_seconds=300, max_attempts=3,
+                 retention_seconds=24 * 3600, poll_interval=0.5):
+        self.path = path
+        self.handlers = handlers
+        self.workers = workers
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retention_seconds = retention_seconds
+        self.poll_interval = poll_interval
+        self._local = threading.local()
+        self._wakeup = threading.Event()
+        self._threads = []
+        # Jobs this process is running: id -> attempt number, whose leases the heartbeat renews
+        self._held = {}
+        self._held_lock = threading.Lock()
+        self._last_cleanup = 0.0
+        self._host = socket.gethostname()
+        self._owner = f"{self._host}:{os.getpid()}"
+
+        create_private_file(path)
+        db = self._db()
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY, kind TEXT NOT NULL, payload TEXT NOT NULL,"
+            " status TEXT NOT NULL, result TEXT, error TEXT, attempts INTEGER NOT NULL DEFAULT 0,"
+            " created_at REAL NOT NULL, updated_at REAL NOT NULL, lease_until REAL, owner TEXT)"
+        )
+        db.execute("CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at)")
+        # Databases created before job groups existed get the column added in place
+        if 'group_id' not in {row[1] for row in db.execute("PRAGMA table_info(jobs)")}:
+            db.execute("ALTER TABLE jobs ADD COLUMN group_id TEXT")
+        db.execute("CREATE INDEX IF NOT EXISTS jobs_group ON jobs (group_id)")
+        db.commit()
+
+    def _db(self):
+        # One connection per thread; SQLite serialises writers across threads and processes
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._local.db = db
+        return db
+
+    def enqueue(self, kind, payload):
+        """Persist a job and return its id"""
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._db().execute(
+            "INSERT INTO jobs (id, kind, payload, status, created_at, updated_at) VALUES (?, ?, ?, 'queued', ?, ?)",
+            (job_id, kind, json.dumps(payload), now, now),
+        )
+        self._wakeup.set()
+        return job_id
+
+    def enqueue_group(self, kind, payloads, max_active_groups=None):
+        """
+        Persist one job per payload under a new group id and return it. With max_active_groups,
+        returns None instead (queueing nothing) while that many groups of this kind still have
+        queued or running jobs; the check and insert are one transaction, so it holds across processes.
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        group_id = uuid.uuid4().hex
+        now = time.time()
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            if max_active_groups is not None:
+                (active,) = db.execute(
+                    "SELECT COUNT(DISTINCT group_id) FROM jobs"
+                    " WHERE kind = ? AND group_id IS NOT NULL AND status IN ('queued', 'running')",
+                    (kind,),
+                ).fetchone()
+                if active >= max_active_groups:
+                    db.execute("ROLLBACK")
+                    return None
+            db.executemany(
+                "INSERT INTO jobs (id, kind, payload, status, created_at, updated_at, group_id)"
+                " VALUES (?, ?, ?, 'queued', ?, ?, ?)",
+                [(uuid.uuid4().hex, kind, json.dumps(payload), now, now, group_id) for payload in payloads],
+            )
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        self._wakeup.set()
+        return group_id
+
+    def group(self, group_id):
+        """The jobs of a group as [{ job_id, status, payload, result, error, attempts }], empty if unknown"""
+        rows = self._db().execute(
+            "SELECT id, status, payload, result, error, attempts FROM jobs WHERE group_id = ? ORDER BY created_at",
+            (group_id,),
+        ).fetchall()
+        return [{
+            'job_id': row[0],
+            'status': row[1],
+            'payload': json.loads(row[2]),
+            'result': json.loads(row[3]) if row[3] else None,
+            'error': row[4],
+            'attempts': row[5],
+        } for row in rows]
+
+    def get(self, job_id):
+        """Return { job_id, kind, status, result, error, attempts, created_at, updated_at } or None"""
+        row = self._db().execute(
+            "SELECT id, kind, status, result, error, attempts, created_at, updated_at FROM jobs WHERE id = ?",
+            (job_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            'job_id': row[0],
+            'kind': row[1],
+            'status': row[2],
+            'result': json.loads(row[3]) if row[3] else None,
+            'error': row[4],
+            'attempts': row[5],
+            'created_at': row[6],
+            'updated_at': row[7],
+        }
+
+    def stats(self):
+        rows = self._db().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def _claim(self):
+        """Atomically take the oldest runnable job: queued, or running with an expired lease"""
+        db = self._db()
+        now = time.time()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            # Jobs whose lease expired too many times are given up on
+            db.execute(
+                "UPDATE jobs SET status = 'error', error = 'Job abandoned after repeated worker failures.',"
+                " updated_at = ?, lease_until = NULL"
+                " WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+                (now, now, self.max_attempts),
+            )
+            row = db.execute(
+                "SELECT id, kind, payload, attempts + 1 FROM jobs"
+                " WHERE status = 'queued' OR (status = 'running' AND lease_until < ?)"
+                " ORDER BY created_at LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is not None:
+                db.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_until = ?, updated_at = ?,"
+                    " owner = ? WHERE id = ?",
+                    (now + self.lease_seconds, now, self._owner, row[0]),
+                )
+            db.execute("COMMIT")
+            return row
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    def _finish(self, job_id, attempt, status, result=None, error=None):
+        """Record the outcome of our attempt; False if the job's lease was lost to another worker meanwhile"""
+        cursor = self._db().execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ?, lease_until = NULL"
+            " WHERE id = ? AND owner = ? AND attempts = ? AND status = 'running'",
+            (status, json.dumps(result) if result is not None else None, error, time.time(),
+             job_id, self._owner, attempt),
+        )
+        if cursor.rowcount == 0:
+            print(f"Job {job_id} lost its lease before finishing; its outcome was discarded")
+            return False
+        return True
+
+    def _renew_leases(self):
+        with self._held_lock:
+            held = list(self._held.items())
+        db = self._db()
+        for job_id, attempt in held:
+            cursor = db.execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND owner = ? AND attempts = ? AND status = 'running'",
+                (time.time() + self.lease_seconds, job_id, self._owner, attempt),
+            )
+            if cursor.rowcount == 0:
+                print(f"Job {job_id} lease could not be renewed; another worker has claimed it")
+
+    def _heartbeat(self):
+        # A handler may legitimately run longer than one lease; renewing well before expiry keeps
+        # other workers from claiming a job that is still in progress here
+        while True:
+            time.sleep(self.lease_seconds / 3)
+            try:
+                self._renew_leases()
+            except sqlite3.Error as e:
+                print(f"Job queue heartbeat error: {str(e)}")
+
+    def _cleanup(self):
+        now = time.time()
+        if now - self._last_cleanup < 600:
+            return
+        self._last_cleanup = now
+        # A group is kept whole until its last job has finished, so its status stays complete
+        self._db().execute(
+            "DELETE FROM jobs WHERE status IN ('done', 'error') AND updated_at < ? AND (group_id IS NULL"
+            " OR group_id NOT IN (SELECT group_id FROM jobs WHERE group_id IS NOT NULL AND status IN ('queued', 'running')))",
+            (now - self.retention_seconds,),
+        )
+
+    def _worker(self):
+        while True:
+            try:
+                self._cleanup()
+                row = self._claim()
+            except sqlite3.Error as e:
+                print(f"Job queue error: {str(e)}")
+                row = None
+            if row is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+
+            job_id, kind, payload, attempt = row
+            set_endpoint(f'job:{kind}')
+            with self._held_lock:
+                self._held[job_id] = attempt
+            try:
+                # Background work: its LLM calls queue behind interactive requests
+                with priority(BULK):
+                    result = self.handlers[kind](**json.loads(payload))
+                self._finish(job_id, attempt, 'done', result=result)
+            except Exception as e:
+                print(f"Job {job_id} ({kind}) failed: {str(e)}")
+                try:
+                    self._finish(job_id, attempt, 'error', error=str(e))
+                except sqlite3.Error as db_error:
+                    # The worker carries on; the job's lease runs out and it is claimed again
+                    print(f"Job queue error: {str(db_error)}")
+            finally:
+                with self._held_lock:
+                    self._held.pop(job_id, None)
+
+    def _recover_orphans(self):
+        """Expire the leases of jobs held by processes on this host that no longer exist"""
+        rows = self._db().execute(
+            "SELECT id, owner FROM jobs WHERE status = 'running' AND owner LIKE ?", (f"{self._host}:%",)
+        ).fetchall()
+        for job_id, owner in rows:
+            pid = int(owner.rsplit(':', 1)[1])
+            if pid == os.getpid():
+                continue
+            try:
+                os.kill(pid, 0)
+                continue
+            except ProcessLookupError:
+                pass
+            except OSError:
+                # Exists but belongs to someone else, or the platform cannot tell; leave it to the lease
+                continue
+            self._db().execute("UPDATE jobs SET lease_until = 0 WHERE id = ? AND owner = ?", (job_id, owner))
+
+    def start(self):
+        """Start the background worker threads (idempotent)"""
+        if self._threads:
+            return
+        # Work interrupted by a restart on this host is picked up straight away
+        try:
+            self._recover_orphans()
+        except sqlite3.Error as e:
+            print(f"Job queue recovery error: {str(e)}")
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        thread = threading.Thread(target=self._heartbeat, name="job-heartbeat", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
@@ -0,0 +1,273 @@
+# resume_core/json_extract.py
+import json
+import re
+
+# Characters that may legitimately follow the closing quote of a string
+_AFTER_STRING = set(',:}]"')
+_STRING_OPENERS = {'"': '"', '“': '”', '”': '”', "'": "'"}
+_VALID_ESCAPES = set('"\\/bfnrtu')
+_CONTROL_ESCAPES = {'\n': '\\n', '\r': '\\r', '\t': '\\t', '\b': '\\b', '\f': '\\f'}
+_LITERALS = {'true': 'true', 'false': 'false', 'null': 'null', 'True': 'true', 'False': 'false', 'None': 'null'}
+_NUMBER = re.compile(r'-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?$')
+_HEX4 = re.compile(r'[0-9a-fA-F]{4}')
+_HEX_PREFIX = re.compile(r'[0-9a-fA-F]{0,3}$')
+# Run of string content that needs no special handling, consumed in one step
+_PLAIN_RUN = re.compile('[^"\'\\\\“”\x00-\x1f]+')
+_decoder = json.JSONDecoder()
+
+
+class JsonExtractionError(ValueError):
+    """Raised when no JSON object can be recovered from a model response"""
+
+
+class _Frame:
+    __slots__ = ('closer', 'expect', 'member_start')
+
+    def __init__(self, closer, expect, member_start):
+        self.closer = closer
+        # object: key, colon, value or comma; array: value or comma
+        self.expect = expect
+        self.member_start = member_start
+
+
+class JsonObjectScanner:
+    """
+    Single-pass, incremental extraction of the first JSON object in LLM output.
+
+    Text before the object (prose, code fences) and after it is ignored. While scanning, the usual
+    model mistakes are repaired: smart or single quotes used as delimiters, unescaped quotes and raw
+    newlines inside strings, invalid escapes, Python literals, trailing and missing commas.
+    feed() returns top-level (key, value) pairs as soon as each is complete; finish() closes
+    whatever a truncated response left open (dropping a dangling key) and returns the object.
+    """
+
+    def __init__(self):
+        self._out = []
+        self._stack = []
+        self._pending = ''
+        self._started = False
+        self._done = False
+        self._quote = None  # closing delimiter of the string being read, or None
+        self._is_key = False
+        self._escape = False
+        self._literal = []
+        self._comma = False
+        self._finishing = False
+        self.truncated = False
+
+    def feed(self, text):
+        """Scan more text; returns the top-level members completed by it"""
+        members = []
+        if self._done:
+            return members
+        text = self._pending + text
+        self._pending = ''
+        end = len(text)
+        i = 0
+        while i < end and not self._done:
+            c = text[i]
+            if self._quote is not None:
+                if not self._escape:
+                    run = _PLAIN_RUN.match(text, i)
+                    if run:
+                        self._out.append(run.group())
+                        i = run.end()
+                        continue
+                if self._escape:
+                    self._escape = False
+                    if c == 'u':
+                        if _HEX4.match(text, i + 1):
+                            self._out.append('\\u')
+                        elif not self._finishing and _HEX_PREFIX.match(text, i + 1):
+                            # "\u00" at the end of this text: the rest of the escape may come with the next feed
+                            self._pending = '\\' + text[i:]
+                            return members
+                        else:
+                            # "\user" is a backslash followed by text, not a unicode escape
+                            self._out.append('\\\\u')
+                    elif c in _VALID_ESCAPES:
+                        self._out.append('\\' + c)
+                    elif c == "'":
+                        self._out.append("'")
+                    else:
+                        # Not a JSON escape ("C:\Users"): keep the backslash and read c as content
+                        self._out.append('\\\\')
+                        continue
+                elif c == '\\':
+                    self._escape = True
+                elif c == self._quote or (c == '"' and self._quote != "'") or (c == '“' and self._quote == '”'):
+                    # A quote only ends the string if structure follows; otherwise it is content
+                    j = i + 1
+                    while j < end and text[j].isspace():
+                        j += 1
+                    if j == end:
+                        # Cannot decide yet: keep the rest for the next feed (or finish)
+                        self._pending = text[i:]
+                        return members
+                    if text[j] in _AFTER_STRING:
+                        self._close_string(members)
+                    else:
+                        self._out.append('\\"' if c == '"' else c)
+                elif c in _CONTROL_ESCAPES:
+                    self._out.append(_CONTROL_ESCAPES[c])
+                elif c < ' ':
+                    self._out.append('\\u%04x' % ord(c))
+                elif c == '"':
+                    self._out.append('\\"')
+                else:
+                    self._out.append(c)
+            elif not self._started:
+                if c == '{':
+                    self._started = True
+                    self._out.append('{')
+                    self._stack.append(_Frame('}', 'key', 1))
+            else:
+                self._structural(c, members)
+            i += 1
+        return members
+
+    def _structural(self, c, members):
+        frame = self._stack[-1]
+        if self._literal and not (c.isalnum() or c in '+-._'):
+            self._flush_literal(members)
+            frame = self._stack[-1]
+        if c in _STRING_OPENERS:
+            if frame.expect in ('key', 'value', 'comma'):
+                is_key = frame.closer == '}' and frame.expect in ('key', 'comma')
+                self._begin_member(frame)
+                self._quote = _STRING_OPENERS[c]
+                self._is_key = is_key
+                self._out.append('"')
+        elif c == ':':
+            if frame.expect == 'colon':
+                self._out.append(':')
+                frame.expect = 'value'
+        elif c == ',':
+            if frame.expect == 'comma':
+                frame.expect = 'key' if frame.closer == '}' else 'value'
+                self._comma = True
+        elif c in '{[':
+            if frame.expect in ('value', 'comma') and not (frame.closer == '}' and frame.expect == 'comma'):
+                self._begin_member(frame)
+                self._out.append(c)
+                self._stack.append(_Frame('}' if c == '{' else ']', 'key' if c == '{' else 'value', len(self._out)))
+        elif c in '}]':
+            self._close_frame(members)
+        elif c.isalnum() or c in '+-._':
+            if frame.expect in ('key', 'value', 'comma') and not self._literal:
+                self._begin_member(frame)
+            self._literal.append(c)
+        # Anything else outside a string (stray prose, backticks, whitespace) is dropped
+
+    def _begin_member(self, frame):
+        if frame.expect == 'comma' or self._comma:
+            # New member: remember where it starts so a truncated one can be dropped
+            frame.member_start = len(self._out)
+            self._out.append(',')
+            self._comma = False
+            frame.expect = 'key' if frame.closer == '}' else 'value'
+        elif frame.expect == 'key' or (frame.closer == ']' and frame.expect == 'value'):
+            frame.member_start = len(self._out)
+
+    def _flush_literal(self, members):
+        word = ''.join(self._literal)
+        self._literal = []
+        frame = self._stack[-1]
+        if frame.expect == 'key':
+            # Unquoted key
+            self._out.append(json.dumps(word))
+            frame.expect = 'colon'
+            return
+        if word in _LITERALS:
+            self._out.append(_LITERALS[word])
+        elif _NUMBER.match(word):
+            self._out.append(word)
+        else:
+            self._out.append(json.dumps(word))
+        self._value_done(members)
+
+    def _close_string(self, members):
+        self._quote = None
+        self._out.append('"')
+        frame = self._stack[-1]
+        if self._is_key:
+            frame.expect = 'colon'
+        else:
+            self._value_done(members)
+
+    def _value_done(self, members):
+        frame = self._stack[-1]
+        frame.expect = 'comma'
+        if len(self._stack) == 1:
+            member = ''.join(self._out[frame.member_start:]).lstrip(',')
+            try:
+                members.extend(json.loads('{' + member + '}').items())
+            except ValueError:
+                pass
+
+    def _close_frame(self, members):
+        frame = self._stack[-1]
+        # A trailing comma is simply not written; a key without a value is dropped
+        self._comma = False
+        if frame.closer == '}' and frame.expect in ('colon', 'value'):
+            del self._out[frame.member_start:]
+        self._stack.pop()
+        self._out.append(frame.closer)
+        if not self._stack:
+            self._done = True
+        else:
+            self._value_done(members)
+
+    def finish(self):
+        """Close anything a truncated response left open and return the parsed object"""
+        self._finishing = True
+        if self._pending:
+            pending, self._pending = self._pending, ''
+            if pending.startswith('\\'):
+                # A \u escape cut short by the end of input
+                self.feed(pending)
+            else:
+                # End of input counts as structure, so a pending quote closes its string
+                self.feed(pending + ',')
+        if not self._started:
+            raise JsonExtractionError("No JSON object found in the response")
+        if not self._done:
+            self.truncated = True
+            if self._quote is not None:
+                self._escape = False
+                if self._is_key:
+                    self._quote = None
+                    del self._out[self._stack[-1].member_start:]
+                    self._stack[-1].expect = 'comma'
+                else:
+                    self._close_string([])
+            if self._literal:
+                word = ''.join(self._literal)
+                if word in _LITERALS or _NUMBER.match(word):
+                    self._flush_literal([])
+                else:
+                    self._literal = []
+                    del self._out[self._stack[-1].member_start:]
+                    self._stack[-1].expect = 'comma'
+            while self._stack:
+                self._close_frame([])
+        try:
+            return json.loads(''.join(self._out))
+        except ValueError as e:
+            raise JsonExtractionError(f"Could not repair JSON: {str(e)}")
+
+
+def extract_json_object(text):
+    """Return the first JSON object in text, repaired and completed if necessary"""
+    start = text.find('{')
+    if start >= 0:
+        # Well-formed output is decoded by the C parser; only broken output takes the repair pass
+        try:
+            value, _ = _decoder.raw_decode(text, start)
+            if isinstance(value, dict):
+                return value
+        except ValueError:
+            pass
+    scanner = JsonObjectScanner()
+    scanner.feed(text)
+    return scanner.finish()
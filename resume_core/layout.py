@@ -0,0 +1,77 @@
+# resume_core/layout.py
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict, namedtuple
+
+# One line of the resume: kind is "title", "heading", "bullet", "text" or "blank"
+Block = namedtuple("Block", ["kind", "text"])
+
+BULLET_MARKERS = ('•', '-', '*')
+# Short lines that are not bullets are treated as headings (the renderers' long-standing rule)
+HEADING_MAX_LENGTH = 50
+# Short lines among the first few non-blank lines are the candidate's name/title
+TITLE_LINES = 2
+
+_MARKDOWN_HEADING = re.compile(r'^#{1,6}\s+')
+_WHOLE_LINE_BOLD = re.compile(r'^\*\*(.+?)\*\*:?$')
+_BULLET = re.compile(r'^(?:•\s*|[-*]\s+)')
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+LAYOUT_CACHE_SIZE = int(os.environ.get("LAYOUT_CACHE_SIZE", "128"))
+
+
+def _classify(line, position):
+    """Return (kind, text) for a stripped, non-empty line; position counts non-blank lines seen before it"""
+    if _MARKDOWN_HEADING.match(line):
+        text = _MARKDOWN_HEADING.sub('', line).strip('* ')
+        return ("title" if position < TITLE_LINES and line.startswith('# ') else "heading"), text
+
+    bold = _WHOLE_LINE_BOLD.match(line)
+    if bold:
+        line = bold.group(1).strip()
+    elif _BULLET.match(line):
+        return "bullet", _BULLET.sub('', line, count=1).strip()
+    elif line.startswith(BULLET_MARKERS):
+        # e.g. "**Python** developer" or "-5% churn": never a heading, but not a list item either
+        return "text", line
+
+    if len(line) < HEADING_MAX_LENGTH:
+        return ("title" if position < TITLE_LINES else "heading"), line
+    return "text", line
+
+
+def _parse(text):
+    blocks = []
+    position = 0
+    for raw_line in text.split('\n'):
+        line = raw_line.strip()
+        if not line:
+            blocks.append(Block("blank", ""))
+            continue
+        kind, content = _classify(line, position)
+        blocks.append(Block(kind, content))
+        position += 1
+    return tuple(blocks)
+
+
+def parse_layout(text):
+    """
+    Parse enhanced resume text into a tuple of Blocks shared by the PDF, DOCX and JPG renderers.
+    Results are cached by a hash of the text, so exporting several formats parses once.
+    """
+    key = hashlib.sha256(text.encode('utf-8')).hexdigest()
+    with _cache_lock:
+        blocks = _cache.get(key)
+        if blocks is not None:
+            _cache.move_to_end(key)
+            return blocks
+
+    blocks = _parse(text)
+    with _cache_lock:
+        _cache[key] = blocks
+        while len(_cache) > LAYOUT_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return blocks
@@ -0,0 +1,30 @@
+# resume_core/lazy.py
+import importlib
+import importlib.util
+import sys
+import types
+
+
+class _LazyModule(types.ModuleType):
+    """Stands in for a module until its first attribute access, which imports the real one"""
+
+    def __getattr__(self, attr):
+        # The import system's per-module lock makes threads racing here wait for one import, so no
+        # caller ever sees a half-initialized module (importlib's LazyLoader can, before Python 3.12)
+        module = importlib.import_module(self.__name__)
+        # Later lookups find the attributes directly instead of coming through here
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+def lazy_import(name):
+    """
+    Return module `name` without executing it yet: the import runs on first attribute access.
+    Lets a module keep `markdown.markdown(...)`-style call sites while its import stays cheap.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    if importlib.util.find_spec(name) is None:
+        raise ImportError(f"No module named {name!r}", name=name)
+    return _LazyModule(name)
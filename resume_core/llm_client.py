@@ -0,0 +1,72 @@
+# resume_core/llm_client.py
+import os
+import threading
+from types import SimpleNamespace
+
+from resume_core.llm_scheduler import scheduler
+
+_client = None
+_lock = threading.Lock()
+
+
+def get_client():
+    """
+    Process-wide AsyncGroq client over one pooled, keep-alive connection pool, used on the event loop
+    of resume_core.event_loop. Every call site in both backends shares it; the pool is sized for
+    hundreds of concurrent requests, since an awaiting request holds no thread.
+    """
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                # groq (with pydantic and httpx) is the slowest import in the apps; load it on first use
+                import httpx
+                from groq import AsyncGroq
+
+                http_client = httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=int(os.environ.get("GROQ_ASYNC_MAX_CONNECTIONS", "512")),
+                        max_keepalive_connections=int(os.environ.get("GROQ_ASYNC_MAX_KEEPALIVE", "128")),
+                        keepalive_expiry=float(os.environ.get("GROQ_KEEPALIVE_EXPIRY", "60")),
+                    ),
+                    timeout=httpx.Timeout(float(os.environ.get("GROQ_TIMEOUT", "120")), connect=10.0),
+                )
+                _client = AsyncGroq(
+                    api_key=os.environ.get("GROQ_API_KEY"),
+                    http_client=http_client,
+                    # The model router handles failover, so SDK-level retries are kept short
+                    max_retries=int(os.environ.get("GROQ_MAX_RETRIES", "1")),
+                )
+    return _client
+
+
+class ScheduledCompletions:
+    """chat.completions whose create() is admitted by the rate-limit scheduler (see llm_scheduler)"""
+
+    def __init__(self, factory):
+        self._factory = factory
+
+    async def create(self, **kwargs):
+        # The raw response carries the x-ratelimit-* headers the scheduler adapts to
+        return await scheduler.call(
+            lambda: self._factory().chat.completions.with_raw_response.create(**kwargs), kwargs)
+
+
+class LazyClient:
+    """
+    Stands in for a shared client at module level; the real one is built on first attribute access.
+    With completions, chat.completions.create() goes through it instead of straight to the client.
+    """
+
+    def __init__(self, factory, completions=None):
+        self._factory = factory
+        if completions is not None:
+            self.chat = SimpleNamespace(completions=completions(factory))
+
+    def __getattr__(self, name):
+        return getattr(self._factory(), name)
+
+
+# What the apps bind to `client`: `await client.chat.completions.create(...)`, queued behind the
+# per-model rate limits
+client = LazyClient(get_client, ScheduledCompletions)
@@ -0,0 +1,410 @@
+# resume_core/llm_scheduler.py
+import asyncio
+import contextvars
+import heapq
+import itertools
+import math
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import jsonify
+
+from resume_core.metrics import current_endpoint, llm_queue_wait, llm_rate_limited
+from resume_core.prompt_budget import prompt_tokens
+
+# Call priorities; a lower value is admitted first
+INTERACTIVE = 0
+BULK = 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BULK: "bulk"}
+
+# Longest a call may wait for rate-limit capacity. An interactive request that would wait longer is
+# answered 429 with Retry-After; background jobs can afford to wait much longer.
+QUEUE_DEADLINES = {
+    INTERACTIVE: float(os.environ.get("LLM_QUEUE_DEADLINE", "10")),
+    BULK: float(os.environ.get("LLM_BULK_QUEUE_DEADLINE", "300")),
+}
+# Share of each minute's tokens and requests that bulk calls leave for interactive ones
+INTERACTIVE_RESERVE = float(os.environ.get("LLM_INTERACTIVE_RESERVE", "0.2"))
+# Completion tokens reserved for a call that does not set max_tokens
+DEFAULT_COMPLETION_TOKENS = 1024
+
+
+def parse_limits(spec):
+    """{model: (rpm, tpm)} from "model=rpm:tpm,model=rpm:tpm"; 0 leaves a limit unknown"""
+    limits = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        model, _, values = entry.partition("=")
+        rpm, _, tpm = values.partition(":")
+        limits[model.strip()] = (int(rpm or 0), int(tpm or 0))
+    return limits
+
+
+# Groq does not report requests per minute, so RPM is configured; a TPM left at 0 is learned from the
+# x-ratelimit-limit-tokens header of the first response
+DEFAULT_RPM = int(os.environ.get("LLM_RPM", "0"))
+DEFAULT_TPM = int(os.environ.get("LLM_TPM", "0"))
+MODEL_LIMITS = parse_limits(os.environ.get("LLM_RATE_LIMITS", ""))
+
+_priority = contextvars.ContextVar("llm_priority", default=INTERACTIVE)
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+class RateLimitedError(Exception):
+    """Raised when a call would wait longer than its deadline for rate-limit capacity"""
+
+    def __init__(self, model, retry_after):
+        self.model = model
+        self.retry_after = max(1, math.ceil(retry_after))
+        super().__init__(f"Rate limit reached for {model}. Retry after {self.retry_after}s.")
+
+
+@contextmanager
+def priority(level):
+    """LLM calls made in this block (and in work it hands to wrap_context executors) queue at level"""
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def install(app):
+    """Answer RateLimitedError with 429 and Retry-After instead of a degraded result"""
+
+    @app.errorhandler(RateLimitedError)
+    def _rate_limited(e):
+        return (jsonify({'error': 'The AI service is at capacity. Please try again shortly.',
+                         'retry_after': e.retry_after}),
+                429, {'Retry-After': str(e.retry_after)})
+
+
+def estimate_tokens(request_kwargs):
+    """Tokens a call can use at most: the estimated prompt plus max_tokens"""
+    completion = request_kwargs.get("max_tokens") or DEFAULT_COMPLETION_TOKENS
+    return prompt_tokens(request_kwargs.get("messages") or []) + completion
+
+
+def parse_duration(value):
+    """Seconds in a Groq reset header ("7.66s", "2m59.56s", "250ms") or a plain number, or None"""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def _header_int(headers, name):
+    try:
+        return int(float(headers.get(name)))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """per_minute units refilled continuously; a limit of 0 is unknown and never makes a call wait"""
+
+    def __init__(self, per_minute):
+        self.capacity = per_minute
+        self.level = float(per_minute)
+        self.updated = time.monotonic()
+
+    def refill(self, now):
+        if self.capacity:
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.capacity / 60.0)
+        self.updated = now
+
+    def cost(self, amount):
+        """What one call of amount takes: a call larger than the whole bucket is admitted once it is full"""
+        return min(amount, self.capacity) if self.capacity else amount
+
+    def wait(self, amount, reserve=0.0):
+        """Seconds until amount is available with a reserve share of the capacity left over"""
+        if not self.capacity:
+            return 0.0
+        needed = max(amount, min(amount + reserve * self.capacity, self.capacity))
+        return max(0.0, needed - self.level) * 60.0 / self.capacity
+
+    def take(self, amount):
+        if self.capacity:
+            self.level -= self.cost(amount)
+
+    def give(self, amount):
+        if self.capacity:
+            self.level = min(self.capacity, self.level + amount)
+
+    def set_limit(self, per_minute):
+        if per_minute and per_minute != self.capacity:
+            # A newly learned limit starts full; a changed one keeps the tokens already spent
+            self.level = per_minute if not self.capacity else min(self.level, per_minute)
+            self.capacity = per_minute
+
+
+class ModelLimits:
+    """Request and token buckets for one model, plus a block set by the API (429 or exhausted quota)"""
+
+    def __init__(self, rpm, tpm):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.blocked_until = 0.0
+        self.queue = []
+
+    def refill(self, now):
+        self.requests.refill(now)
+        self.tokens.refill(now)
+
+    def wait(self, requests, tokens, level, now):
+        reserve = INTERACTIVE_RESERVE if level != INTERACTIVE else 0.0
+        return max(self.blocked_until - now, self.requests.wait(requests, reserve), self.tokens.wait(tokens, reserve))
+
+
+class _Waiter:
+    """One queued call; woken when it reaches the head of its model's queue or capacity is returned"""
+
+    __slots__ = ("model", "tokens", "level", "seq", "deadline_at", "enqueued", "loop", "event")
+
+    def __init__(self, model, tokens, level, seq, deadline_at, loop):
+        self.model = model
+        self.tokens = tokens
+        self.level = level
+        self.seq = seq
+        self.deadline_at = deadline_at
+        self.enqueued = time.monotonic()
+        self.loop = loop
+        self.event = asyncio.Event()
+
+    def __lt__(self, other):
+        return (self.level, self.seq) < (other.level, other.seq)
+
+    def wake(self):
+        self.loop.call_soon_threadsafe(self.event.set)
+
+
+class Reservation:
+    """Tokens taken for one admitted call; settle() returns what the call did not use"""
+
+    __slots__ = ("scheduler", "model", "tokens")
+
+    def __init__(self, scheduler, model, tokens):
+        self.scheduler = scheduler
+        self.model = model
+        self.tokens = tokens
+
+    def settle(self, usage):
+        total = getattr(usage, "total_tokens", None) if usage is not None else None
+        if total is not None and total < self.tokens:
+            self.scheduler.refund(self.model, self.tokens - total)
+
+    def cancel(self):
+        """The API did not process the call (connection error, 429): its tokens go back"""
+        self.scheduler.refund(self.model, self.tokens)
+
+
+class RateLimitScheduler:
+    """
+    Admission control for LLM calls against the provider's per-model requests-per-minute and
+    tokens-per-minute limits. Each call reserves one request and its estimated prompt tokens plus
+    max_tokens; unused tokens are returned when the response reports its usage. Calls queue per model
+    in priority order (interactive before bulk, then first come first served), and bulk calls leave
+    INTERACTIVE_RESERVE of each bucket free. The x-ratelimit-* response headers correct the buckets
+    (other processes share the same quota) and a 429's retry-after blocks the model.
+
+    A call whose projected wait exceeds its deadline is refused with RateLimitedError straight away,
+    so the request can be answered 429 instead of timing out or degrading to a fallback.
+    """
+
+    def __init__(self, limits=None, default_rpm=DEFAULT_RPM, default_tpm=DEFAULT_TPM, deadlines=None):
+        self.limits = MODEL_LIMITS if limits is None else limits
+        self.default_rpm = default_rpm
+        self.default_tpm = default_tpm
+        self.deadlines = deadlines or QUEUE_DEADLINES
+        self._models = {}
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+
+    def _model(self, model):
+        limits = self._models.get(model)
+        if limits is None:
+            rpm, tpm = self.limits.get(model, (self.default_rpm, self.default_tpm))
+            limits = self._models[model] = ModelLimits(rpm, tpm)
+        return limits
+
+    async def call(self, send, request_kwargs):
+        """
+        Await send() once the call is admitted; it returns the SDK's raw response. Returns the parsed
+        completion (or stream). An API 429 is queued once more if its retry-after fits the deadline.
+        """
+        model = request_kwargs.get("model", "")
+        tokens = estimate_tokens(request_kwargs)
+        deadline_at = time.monotonic() + self.deadlines[_priority.get()]
+        for attempt in range(2):
+            reservation = await self.acquire(model, tokens, deadline_at)
+            try:
+                raw = await send()
+            except Exception as e:
+                reservation.cancel()
+                self._check_rate_limited(model, e, attempt)
+                continue
+            completion = await raw.parse()
+            # Settled before the headers are applied: the API's remaining count already includes this call
+            reservation.settle(getattr(completion, "usage", None))
+            self.observe(model, raw.headers)
+            return completion
+
+    def _check_rate_limited(self, model, error, attempt):
+        """Re-raise anything but an API 429; a second 429 becomes RateLimitedError"""
+        response = getattr(error, "response", None)
+        if getattr(error, "status_code", None) != 429 or response is None:
+            raise error
+        self.observe(model, response.headers)
+        if attempt:
+            with self._lock:
+                retry_after = self._model(model).blocked_until - time.monotonic()
+            self._rejected(model, _priority.get())
+            raise RateLimitedError(model, retry_after) from error
+
+    async def acquire(self, model, tokens, deadline_at):
+        """Wait until the call is admitted; raises RateLimitedError if that would pass deadline_at"""
+        waiter = self._enqueue(model, tokens, deadline_at, asyncio.get_running_loop())
+        try:
+            while True:
+                admitted = self._poll(waiter)
+                if isinstance(admitted, Reservation):
+                    return admitted
+                try:
+                    await asyncio.wait_for(waiter.event.wait(), admitted)
+                except asyncio.TimeoutError:
+                    pass
+                waiter.event.clear()
+        except BaseException:
+            self._abandon(waiter)
+            raise
+
+    def _projected_wait(self, limits, tokens, level, now):
+        # Everything queued at the same or a higher priority goes first
+        ahead = [waiter for waiter in limits.queue if waiter.level <= level]
+        tokens = sum(limits.tokens.cost(waiter.tokens) for waiter in ahead) + limits.tokens.cost(tokens)
+        return limits.wait(len(ahead) + 1, tokens, level, now)
+
+    def _enqueue(self, model, tokens, deadline_at, loop):
+        level = _priority.get()
+        now = time.monotonic()
+        with self._lock:
+            limits = self._model(model)
+            limits.refill(now)
+            projected = self._projected_wait(limits, tokens, level, now)
+            if now + projected > deadline_at:
+                rejected = True
+            else:
+                rejected = False
+                waiter = _Waiter(model, tokens, level, next(self._seq), deadline_at, loop)
+                heapq.heappush(limits.queue, waiter)
+        if rejected:
+            self._rejected(model, level)
+            raise RateLimitedError(model, projected)
+        return waiter
+
+    def _poll(self, waiter):
+        """A Reservation once the waiter is admitted, else seconds to sleep before checking again"""
+        now = time.monotonic()
+        admitted = False
+        with self._lock:
+            limits = self._model(waiter.model)
+            limits.refill(now)
+            if limits.queue[0] is waiter:
+                wait = limits.wait(1, limits.tokens.cost(waiter.tokens), waiter.level, now)
+                admitted = wait <= 0
+                if admitted:
+                    heapq.heappop(limits.queue)
+                    limits.requests.take(1)
+                    limits.tokens.take(waiter.tokens)
+                    # Nothing is taken from a bucket whose limit is not known yet, so nothing can be refunded
+                    taken = limits.tokens.cost(waiter.tokens) if limits.tokens.capacity else 0
+                    if limits.queue:
+                        limits.queue[0].wake()
+            else:
+                # Not at the head: sleep until woken (the head moved on) or the deadline
+                wait = waiter.deadline_at - now
+            expired = not admitted and (now >= waiter.deadline_at or now + wait > waiter.deadline_at)
+            if expired:
+                projected = self._projected_wait(limits, waiter.tokens, waiter.level, now)
+        if admitted:
+            llm_queue_wait.observe(now - waiter.enqueued, model=waiter.model, priority=PRIORITY_NAMES[waiter.level])
+            return Reservation(self, waiter.model, taken)
+        if expired:
+            self._rejected(waiter.model, waiter.level)
+            raise RateLimitedError(waiter.model, projected)
+        return max(wait, 0.001)
+
+    def _abandon(self, waiter):
+        """Take a waiter that gave up (deadline, cancellation) out of its queue"""
+        with self._lock:
+            queue = self._model(waiter.model).queue
+            if waiter not in queue:
+                return
+            was_head = queue[0] is waiter
+            queue.remove(waiter)
+            heapq.heapify(queue)
+            if was_head and queue:
+                queue[0].wake()
+
+    def _rejected(self, model, level):
+        llm_rate_limited.inc(endpoint=current_endpoint(), model=model, priority=PRIORITY_NAMES[level])
+
+    def refund(self, model, tokens):
+        with self._lock:
+            limits = self._model(model)
+            limits.tokens.give(tokens)
+            if limits.queue:
+                limits.queue[0].wake()
+
+    def observe(self, model, headers):
+        """Adapt to the API's own view of the quota from x-ratelimit-* and retry-after response headers"""
+        now = time.monotonic()
+        limit_tokens = _header_int(headers, "x-ratelimit-limit-tokens")
+        remaining_tokens = _header_int(headers, "x-ratelimit-remaining-tokens")
+        remaining_requests = _header_int(headers, "x-ratelimit-remaining-requests")
+        reset_requests = parse_duration(headers.get("x-ratelimit-reset-requests"))
+        retry_after = parse_duration(headers.get("retry-after"))
+        with self._lock:
+            limits = self._model(model)
+            limits.refill(now)
+            if limit_tokens:
+                limits.tokens.set_limit(limit_tokens)
+            if remaining_tokens is not None and limits.tokens.capacity:
+                limits.tokens.level = min(limits.tokens.level, remaining_tokens)
+            # Groq's request headers count a daily quota: once it is spent, nothing is sent until it resets
+            if remaining_requests == 0 and reset_requests:
+                limits.blocked_until = max(limits.blocked_until, now + reset_requests)
+            if retry_after:
+                limits.blocked_until = max(limits.blocked_until, now + retry_after)
+
+    def stats(self):
+        """Bucket levels and queue depth per model"""
+        now = time.monotonic()
+        with self._lock:
+            stats = {}
+            for model, limits in self._models.items():
+                limits.refill(now)
+                stats[model] = {
+                    'rpm': limits.requests.capacity or None,
+                    'requests_available': round(limits.requests.level, 1) if limits.requests.capacity else None,
+                    'tpm': limits.tokens.capacity or None,
+                    'tokens_available': round(limits.tokens.level) if limits.tokens.capacity else None,
+                    'blocked_for': round(max(0.0, limits.blocked_until - now), 1),
+                    'queued': {name: sum(1 for waiter in limits.queue if waiter.level == level)
+                               for level, name in PRIORITY_NAMES.items()},
+                }
+            return stats
+
+
+# Process-wide scheduler; every call through llm_client's shared clients is admitted by it
+scheduler = RateLimitScheduler()
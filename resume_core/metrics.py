@@ -0,0 +1,314 @@
+# resume_core/metrics.py
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import Response, request
+
+# Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Route of the request being served, so work done for it on other threads is labelled with it
+_endpoint = contextvars.ContextVar("metrics_endpoint", default="background")
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter with a fixed set of label names"""
+
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def lines(self):
+        with self._lock:
+            values = list(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, key)} {_number(value)}" for key, value in values]
+
+
+class Histogram:
+    """Cumulative-bucket histogram with a fixed set of label names"""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DURATION_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket counts (last one is +Inf), then sum
+                state = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            state[index] += 1
+            state[-1] += value
+
+    def lines(self):
+        with self._lock:
+            values = [(key, list(state)) for key, state in self._values.items()]
+        lines = []
+        for key, state in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), state):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, [('le', _number(bound))])} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(state[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    """
+    Metrics of one process. Counters and histograms are updated on the hot path; collectors are
+    functions called only at scrape time, for values other components already track (cache stats).
+    A collector returns [(name, kind, documentation, [(labels_dict, value), ...]), ...].
+    """
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def counter(self, name, documentation, labelnames=()):
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DURATION_BUCKETS):
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector):
+        self._collectors.append(collector)
+
+    def render(self):
+        out = []
+        for metric in self._metrics:
+            out.append(f"# HELP {metric.name} {metric.documentation}")
+            out.append(f"# TYPE {metric.name} {metric.kind}")
+            out.extend(metric.lines())
+        # Several collectors may report the same family (one per cache); each is written once
+        families = {}
+        for collector in self._collectors:
+            try:
+                collected = collector()
+            except Exception as e:
+                print(f"Metrics collector error: {str(e)}")
+                continue
+            for name, kind, documentation, samples in collected:
+                families.setdefault(name, (kind, documentation, []))[2].extend(samples)
+        for name, (kind, documentation, samples) in families.items():
+            out.append(f"# HELP {name} {documentation}")
+            out.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                out.append(f"{name}{_labels(labels, labels.values())} {_number(value)}")
+        return "\n".join(out) + "\n"
+
+
+REGISTRY = Registry()
+
+http_request_duration = REGISTRY.histogram(
+    "http_request_duration_seconds", "Time to produce the response, by route", ("endpoint", "method", "status"))
+stage_duration = REGISTRY.histogram(
+    "stage_duration_seconds", "Time spent in each processing stage", ("endpoint", "stage"))
+llm_request_duration = REGISTRY.histogram(
+    "llm_request_duration_seconds", "LLM call latency", ("endpoint", "call", "model", "outcome"))
+llm_prompt_tokens = REGISTRY.counter(
+    "llm_prompt_tokens_total", "Prompt tokens reported by the LLM API", ("endpoint", "call", "model"))
+llm_completion_tokens = REGISTRY.counter(
+    "llm_completion_tokens_total", "Completion tokens reported by the LLM API", ("endpoint", "call", "model"))
+errors = REGISTRY.counter(
+    "errors_total", "Errors by stage and exception type", ("endpoint", "stage", "type"))
+llm_queue_wait = REGISTRY.histogram(
+    "llm_queue_wait_seconds", "Time LLM calls waited for rate-limit capacity", ("model", "priority"))
+llm_rate_limited = REGISTRY.counter(
+    "llm_rate_limited_total", "LLM calls refused because the rate-limit wait exceeded their deadline",
+    ("endpoint", "model", "priority"))
+coalesced_requests = REGISTRY.counter(
+    "coalesced_requests_total", "Requests answered by another request's computation, by source (inflight, idempotency)",
+    ("endpoint", "source"))
+render_admissions = REGISTRY.counter(
+    "render_admissions_total",
+    "Downloads by admission outcome: immediate, queued (waited for budget) or rejected (answered 503)",
+    ("endpoint", "renderer", "outcome"))
+render_queue_wait = REGISTRY.histogram(
+    "render_queue_wait_seconds", "Time downloads waited for render memory budget before starting", ("renderer",))
+render_duration = REGISTRY.histogram(
+    "render_duration_seconds", "Time to render a download once admitted", ("renderer",))
+
+
+def current_endpoint():
+    return _endpoint.get()
+
+
+def set_endpoint(endpoint):
+    """Label metrics recorded from now on in this context (thread or task) with endpoint"""
+    _endpoint.set(endpoint)
+
+
+def record_error(stage, error):
+    """Count an error; error is an exception or a short type name such as "timeout" """
+    errors.inc(endpoint=_endpoint.get(), stage=stage,
+               type=error if isinstance(error, str) else type(error).__name__)
+
+
+@contextmanager
+def span(stage):
+    """Time a block as one stage; an exception escaping it is counted and re-raised"""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        record_error(stage, e)
+        raise
+    finally:
+        stage_duration.observe(time.perf_counter() - started, endpoint=_endpoint.get(), stage=stage)
+
+
+class LlmCall:
+    """
+    One LLM request: record() counts the tokens of the completion (or of a usage object),
+    finish() observes the latency once the response is complete
+    """
+
+    __slots__ = ("call", "model", "started")
+
+    def __init__(self, call, model):
+        self.call = call
+        self.model = model
+        self.started = time.perf_counter()
+
+    def record(self, completion):
+        self.record_usage(getattr(completion, "usage", None))
+
+    def record_usage(self, usage):
+        if usage is None:
+            return
+        endpoint = _endpoint.get()
+        llm_prompt_tokens.inc(getattr(usage, "prompt_tokens", 0) or 0, endpoint=endpoint, call=self.call, model=self.model)
+        llm_completion_tokens.inc(getattr(usage, "completion_tokens", 0) or 0,
+                                  endpoint=endpoint, call=self.call, model=self.model)
+
+    def finish(self, error=None):
+        if error is not None:
+            record_error(f"llm.{self.call}", error)
+        llm_request_duration.observe(time.perf_counter() - self.started, endpoint=_endpoint.get(), call=self.call,
+                                     model=self.model, outcome="ok" if error is None else "error")
+
+
+@contextmanager
+def llm_call(call, model):
+    """
+    Time one LLM request and count its tokens:
+
+        with llm_call("enhancement", model) as tracked:
+            completion = await client.chat.completions.create(...)
+            tracked.record(completion)
+    """
+    tracked = LlmCall(call, model)
+    try:
+        yield tracked
+    except Exception as e:
+        tracked.finish(e)
+        raise
+    tracked.finish()
+
+
+def wrap_context(func):
+    """func bound to the caller's context, for executors that would otherwise lose the endpoint label"""
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.run(func, *args, **kwargs)
+
+
+def cache_collector(name, cache):
+    """Scrape-time lookup counters from a TieredCache's stats()"""
+    def collect():
+        stats = cache.stats()
+        return [
+            ("cache_lookups_total", "counter", "Cache lookups by result", [
+                ({"cache": name, "result": "memory_hit"}, stats["memory_hits"]),
+                ({"cache": name, "result": "disk_hit"}, stats["disk_hits"]),
+                ({"cache": name, "result": "miss"}, stats["misses"]),
+            ]),
+        ]
+    return collect
+
+
+def render_pool_collector(pool):
+    """Scrape-time queue depth, concurrency and memory budget usage from a RenderPool's stats()"""
+    def collect():
+        stats = pool.stats()
+        return [
+            ("render_queue_depth", "gauge", "Downloads waiting for render budget or a worker", [({}, stats["queue_depth"])]),
+            ("render_in_flight", "gauge", "Downloads admitted and not yet rendered", [({}, stats["in_flight"])]),
+            ("render_reserved_bytes", "gauge", "Render memory budget reserved by admitted downloads",
+             [({}, stats["reserved_bytes"])]),
+            ("render_memory_budget_bytes", "gauge", "Render memory budget", [({}, stats["memory_budget_bytes"])]),
+        ]
+    return collect
+
+
+def install(app):
+    """
+    Time every request of a Flask app by route and serve the registry, including the render
+    pool's admission and queue series, on GET /metrics
+    """
+    # Imported here: the render pool records into this module's series
+    from resume_core.render_pool import render_pool
+    REGISTRY.add_collector(render_pool_collector(render_pool))
+
+    @app.before_request
+    def _start_timer():
+        request.environ["metrics.started"] = time.perf_counter()
+        set_endpoint(request.url_rule.rule if request.url_rule else "unmatched")
+
+    @app.after_request
+    def _observe(response):
+        started = request.environ.get("metrics.started")
+        if started is not None:
+            # Streamed bodies are still being sent; this is the time to the first byte
+            http_request_duration.observe(time.perf_counter() - started, endpoint=_endpoint.get(),
+                                          method=request.method, status=response.status_code)
+        return response
+
+    def metrics():
+        """Prometheus metrics for this process"""
+        return Response(REGISTRY.render(), content_type=CONTENT_TYPE)
+
+    app.add_url_rule("/metrics", "metrics", metrics, methods=["GET"])
@@ -0,0 +1,331 @@
+# resume_core/model_router.py
+import asyncio
+import threading
+import time
+from collections import deque
+
+from resume_core.event_loop import run_async
+from resume_core.llm_scheduler import RateLimitedError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class AllModelsFailedError(Exception):
+    """Raised when every model in the route failed for a call"""
+
+
+class HedgeBudget:
+    """
+    Caps hedged calls at max_ratio of all hedge-eligible calls over a rolling window,
+    so hedging cannot come close to doubling token spend
+    """
+
+    def __init__(self, max_ratio=0.1, window_seconds=300.0):
+        self.max_ratio = max_ratio
+        self.window_seconds = window_seconds
+        self._calls = deque()
+        self._hedges = deque()
+        self._lock = threading.Lock()
+
+    def _trim(self, now):
+        for events in (self._calls, self._hedges):
+            while events and now - events[0] > self.window_seconds:
+                events.popleft()
+
+    def note_call(self):
+        with self._lock:
+            self._calls.append(time.time())
+
+    def try_acquire(self):
+        """Reserve a hedge if the rolling hedge rate stays within the cap"""
+        now = time.time()
+        with self._lock:
+            self._trim(now)
+            if len(self._hedges) + 1 > self.max_ratio * max(len(self._calls), 1):
+                return False
+            self._hedges.append(now)
+            return True
+
+    def stats(self):
+        with self._lock:
+            self._trim(time.time())
+            calls, hedges = len(self._calls), len(self._hedges)
+        return {
+            'calls': calls,
+            'hedges': hedges,
+            'hedge_rate': round(hedges / calls, 4) if calls else 0.0,
+            'max_rate': self.max_ratio,
+        }
+
+
+class ModelHealth:
+    """Rolling outcomes and circuit state for one model"""
+
+    def __init__(self, name, window_seconds):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.samples = deque()  # (timestamp, ok, latency_ms)
+        self.consecutive_failures = 0
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.open_for = 0.0
+        self.last_error = None
+
+    def _trim(self, now):
+        while self.samples and now - self.samples[0][0] > self.window_seconds:
+            self.samples.popleft()
+
+    def error_rate(self, now):
+        self._trim(now)
+        if not self.samples:
+            return 0.0
+        return sum(1 for _, ok, _ in self.samples if not ok) / len(self.samples)
+
+    def latency_percentile(self, percentile, now):
+        self._trim(now)
+        latencies = sorted(latency for _, ok, latency in self.samples if ok)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(len(latencies) * percentile / 100))]
+
+
+class ModelRouter:
+    """
+    Routes a call across models in preference order with a circuit breaker per model.
+    A model's circuit opens after `failure_threshold` consecutive failures, when its rolling
+    error rate crosses `error_rate_threshold`, or straight away on "model gone" / rate-limit
+    errors. Open models are skipped, so traffic goes directly to a healthy model. A background
+    thread probes open circuits (half-open) with `await probe(model)` and closes them once it succeeds.
+    A call refused by the rate-limit scheduler (RateLimitedError) is not a model failure and does not
+    touch the circuit: the call moves on to the next model, and RateLimitedError is only raised when
+    the scheduler refused every model tried.
+    """
+
+    def __init__(self, models, probe=None, failure_threshold=3, error_rate_threshold=0.5,
+                 min_samples=5, window_seconds=120.0, open_seconds=30.0, probe_interval=5.0):
+        self.models = list(models)
+        self.probe = probe
+        self.failure_threshold = failure_threshold
+        self.error_rate_threshold = error_rate_threshold
+        self.min_samples = min_samples
+        self.open_seconds = open_seconds
+        self.probe_interval = probe_interval
+        self._health = {name: ModelHealth(name, window_seconds) for name in self.models}
+        self._lock = threading.Lock()
+        self._probe_thread = None
+
+    def candidates(self, models=None):
+        """
+        Models to try, in preference order, skipping open and half-open circuits.
+        models restricts the route to a subset (keeping the router's order).
+        """
+        route = [name for name in self.models if models is None or name in models]
+        with self._lock:
+            available = [name for name in route if self._health[name].state == CLOSED]
+            if available:
+                return available
+            # Everything is open: try the model that has been open the longest rather than fail outright
+            return [min(route, key=lambda name: self._health[name].opened_at)]
+
+    def record_success(self, model, latency_ms):
+        with self._lock:
+            health = self._health[model]
+            health.samples.append((time.time(), True, latency_ms))
+            health.consecutive_failures = 0
+            health.state = CLOSED
+            health.last_error = None
+
+    def record_failure(self, model, error):
+        now = time.time()
+        with self._lock:
+            health = self._health[model]
+            health.samples.append((now, False, 0.0))
+            health.consecutive_failures += 1
+            health.last_error = str(error)[:300]
+            trip = (
+                _is_fatal(error)
+                or health.consecutive_failures >= self.failure_threshold
+                or (len(health.samples) >= self.min_samples
+                    and health.error_rate(now) >= self.error_rate_threshold)
+            )
+            if trip and health.state != OPEN:
+                health.state = OPEN
+                health.opened_at = now
+                health.open_for = _retry_after(error) or self.open_seconds
+                print(f"Circuit opened for {model}: {health.last_error}")
+        if trip:
+            self._ensure_prober()
+
+    async def call(self, func, models=None):
+        """
+        Await func(model) on the first healthy model (of models, if given), failing over down the route.
+        Returns (result, model). If none succeed, raises exhausted_error() of the errors.
+        """
+        errors = []
+        for model in self.candidates(models):
+            try:
+                return await self._timed(func, model), model
+            except Exception as e:
+                errors.append(e)
+        raise exhausted_error(errors)
+
+    async def call_hedged(self, func, hedge_model, hedge_after_ms, budget, models=None):
+        """
+        Like call(), but if the first model has not answered after hedge_after_ms, the same call is
+        also started on hedge_model and whichever succeeds first wins; the other call is cancelled.
+        Hedges are only launched while budget allows. Returns (result, model, hedged).
+        """
+        candidates = self.candidates(models)
+        primary = candidates[0]
+        if primary == hedge_model or hedge_model not in candidates:
+            result, model = await self.call(func, models)
+            return result, model, False
+
+        budget.note_call()
+        tasks = {asyncio.ensure_future(self._timed(func, primary)): primary}
+        hedged = False
+        errors = []
+        pending = set(tasks)
+        try:
+            done, pending = await asyncio.wait(pending, timeout=hedge_after_ms / 1000.0)
+            if not done and budget.try_acquire():
+                print(f"Hedging {primary} with {hedge_model} after {hedge_after_ms:.0f} ms")
+                hedge = asyncio.ensure_future(self._timed(func, hedge_model))
+                tasks[hedge] = hedge_model
+                pending.add(hedge)
+                hedged = True
+
+            # First success wins; a failure just leaves the remaining racer (if any) to finish
+            while done or pending:
+                for task in done:
+                    if task.exception() is not None:
+                        errors.append(task.exception())
+                        continue
+                    return task.result(), tasks[task], hedged
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in pending:
+                task.cancel()
+
+        # Both racers failed: carry on down the route with the models not tried yet
+        for model in candidates:
+            if model in tasks.values():
+                continue
+            try:
+                return await self._timed(func, model), model, hedged
+            except Exception as e:
+                errors.append(e)
+        raise exhausted_error(errors)
+
+    async def _timed(self, func, model):
+        # Outcomes are recorded even for a discarded racer, so latency percentiles stay honest; a
+        # racer cancelled because the other won raises CancelledError, which is not an outcome
+        started = time.perf_counter()
+        try:
+            result = await func(model)
+        except RateLimitedError as e:
+            print(f"Skipping {model}: {str(e)}")
+            raise
+        except Exception as e:
+            print(f"Error with {model}: {str(e)}")
+            self.record_failure(model, e)
+            raise
+        self.record_success(model, (time.perf_counter() - started) * 1000)
+        return result
+
+    def latency_percentile(self, model, percentile):
+        """Rolling latency percentile (ms) of successful calls, or None without data"""
+        with self._lock:
+            return self._health[model].latency_percentile(percentile, time.time())
+
+    def _ensure_prober(self):
+        if self.probe is None:
+            return
+        with self._lock:
+            if self._probe_thread is not None and self._probe_thread.is_alive():
+                return
+            self._probe_thread = threading.Thread(target=self._probe_loop, name="model-probe", daemon=True)
+            self._probe_thread.start()
+
+    def _probe_loop(self):
+        # Runs while any circuit is open; exits once every model is healthy again
+        while True:
+            time.sleep(self.probe_interval)
+            now = time.time()
+            with self._lock:
+                due = [h for h in self._health.values() if h.state == OPEN and now - h.opened_at >= h.open_for]
+                for health in due:
+                    health.state = HALF_OPEN
+                still_open = any(h.state != CLOSED for h in self._health.values())
+            for health in due:
+                try:
+                    run_async(self.probe(health.name))
+                    # Only the circuit state changes: a 1-token ping's latency is no sample of a real
+                    # call's, and would pull down the percentile hedge delays are taken from
+                    with self._lock:
+                        health.consecutive_failures = 0
+                        health.state = CLOSED
+                        health.last_error = None
+                    print(f"Circuit closed for {health.name}")
+                except Exception as e:
+                    with self._lock:
+                        health.state = OPEN
+                        health.opened_at = time.time()
+                        health.open_for = _retry_after(e) or self.open_seconds
+                        health.last_error = str(e)[:300]
+            if not still_open:
+                return
+
+    def stats(self):
+        now = time.time()
+        with self._lock:
+            return {
+                name: {
+                    'state': health.state,
+                    'error_rate': round(health.error_rate(now), 4),
+                    'requests': len(health.samples),
+                    'consecutive_failures': health.consecutive_failures,
+                    'latency_p50_ms': _round(health.latency_percentile(50, now)),
+                    'latency_p95_ms': _round(health.latency_percentile(95, now)),
+                    'last_error': health.last_error,
+                }
+                for name, health in self._health.items()
+            }
+
+
+def exhausted_error(errors):
+    """
+    The error to raise once every model of a route failed with errors: the RateLimitedError with the
+    soonest retry if the scheduler refused them all, otherwise AllModelsFailedError with the last error
+    """
+    if errors and all(isinstance(e, RateLimitedError) for e in errors):
+        return min(errors, key=lambda e: e.retry_after)
+    return AllModelsFailedError(str(errors[-1] if errors else None))
+
+
+def _round(value):
+    return round(value, 1) if value is not None else None
+
+
+def _status_code(error):
+    return getattr(error, 'status_code', None) or getattr(getattr(error, 'response', None), 'status_code', None)
+
+
+def _is_fatal(error):
+    # Decommissioned/unknown model: no point sending the next request there. Rate limits are not
+    # failures; the scheduler holds requests back and refuses them with RateLimitedError instead
+    return _status_code(error) == 404 or 'decommissioned' in str(error)
+
+
+def _retry_after(error):
+    if isinstance(error, RateLimitedError):
+        return float(error.retry_after)
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
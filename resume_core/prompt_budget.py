@@ -0,0 +1,147 @@
+# resume_core/prompt_budget.py
+import math
+import os
+import re
+from collections import Counter
+from functools import lru_cache
+
+# Token budgets for the user-supplied parts of a prompt
+RESUME_TOKEN_BUDGET = int(os.environ.get("PROMPT_RESUME_TOKENS", "3000"))
+JOB_DESCRIPTION_TOKEN_BUDGET = int(os.environ.get("PROMPT_JD_TOKENS", "1500"))
+# Budget for each pre-analysis (resume structure, job requirements) passed on to the enhancement
+ANALYSIS_TOKEN_BUDGET = int(os.environ.get("PROMPT_ANALYSIS_TOKENS", "1000"))
+# Tokens one call may use in total (prompt + completion); max_tokens is whatever the prompt leaves
+CALL_TOKEN_LIMIT = int(os.environ.get("PROMPT_CALL_TOKEN_LIMIT", "12000"))
+MIN_COMPLETION_TOKENS = int(os.environ.get("PROMPT_MIN_COMPLETION_TOKENS", "512"))
+# Chat formatting tokens added per message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+TRUNCATION_MARKER = "[...]"
+
+_PIECE = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+_HYPHENATED_BREAK = re.compile(r"(\w)-\n(\w)")
+_INLINE_SPACE = re.compile(r"[ \t\f\v\u00a0]+")
+_PAGE_NUMBER = re.compile(r"^(?:page\s*)?\d{1,3}(?:\s*(?:of|/)\s*\d{1,3})?$|^-\s*\d{1,3}\s*-$", re.IGNORECASE)
+# Short lines among the first/last few lines of most PDF pages are running headers/footers
+PAGE_EDGE_LINES = 3
+FURNITURE_MAX_LENGTH = 80
+
+
+def count_tokens(text):
+    """
+    Estimate Llama 3 tokens locally without a tokenizer download: short words are one token,
+    long words about four characters each, digits go in groups of three and each other symbol
+    is one. Errs slightly high so budgets stay safe.
+    """
+    total = 0
+    for piece in _PIECE.findall(text):
+        first = piece[0]
+        if first.isdigit():
+            total += math.ceil(len(piece) / 3)
+        elif first.isascii() and first.isalpha():
+            total += 1 if len(piece) <= 6 else math.ceil(len(piece) / 4)
+        else:
+            total += 1
+    return total
+
+
+def strip_page_furniture(pages):
+    """
+    Remove running headers and footers from a list of page texts: short lines found near the
+    top or bottom of most pages (and of at least three). The first page keeps its copy (often the name).
+    """
+    if len(pages) < 3:
+        return pages
+    edges = Counter()
+    for page in pages:
+        lines = [line.strip() for line in page.split("\n") if line.strip()]
+        edges.update(set(lines[:PAGE_EDGE_LINES] + lines[-PAGE_EDGE_LINES:]))
+    threshold = max(3, len(pages) * 0.6)
+    furniture = {line for line, count in edges.items() if count >= threshold and len(line) <= FURNITURE_MAX_LENGTH}
+    if not furniture:
+        return pages
+    return [pages[0]] + [
+        "\n".join(line for line in page.split("\n") if line.strip() not in furniture)
+        for page in pages[1:]
+    ]
+
+
+def normalize_text(text):
+    """
+    Clean up extracted resume text: join words hyphenated across line breaks, collapse runs of
+    whitespace and blank lines, and drop page numbers and immediately repeated lines
+    """
+    text = _HYPHENATED_BREAK.sub(r"\1\2", text.replace("\r\n", "\n").replace("\r", "\n"))
+    kept = []
+    for raw_line in text.split("\n"):
+        line = _INLINE_SPACE.sub(" ", raw_line).strip()
+        if not line:
+            if kept and kept[-1]:
+                kept.append("")
+            continue
+        if _PAGE_NUMBER.match(line) or (kept and kept[-1] == line):
+            continue
+        kept.append(line)
+    return "\n".join(kept).strip()
+
+
+def fit_text(text, max_tokens):
+    """
+    Shorten text to about max_tokens. Every paragraph keeps a share of the budget proportional
+    to its size, from its first line (usually a section heading or role) down, so later sections
+    such as skills and certifications are not simply cut off.
+    """
+    total = count_tokens(text)
+    if total <= max_tokens:
+        return text
+
+    paragraphs = [p for p in re.split(r"\n\s*\n", text) if p.strip()]
+    budget = max_tokens - count_tokens(TRUNCATION_MARKER) * len(paragraphs)
+    fitted = []
+    for paragraph in paragraphs:
+        lines = paragraph.split("\n")
+        share = max(0, budget) * count_tokens(paragraph) / total
+        kept, used = [], 0
+        for index, line in enumerate(lines):
+            cost = count_tokens(line)
+            if index and used + cost > share:
+                kept.append(TRUNCATION_MARKER)
+                break
+            kept.append(line)
+            used += cost
+        fitted.append("\n".join(kept))
+    result = "\n\n".join(fitted)
+
+    # Many tiny paragraphs (or one huge line) can still overshoot; cut from the end
+    lines = result.split("\n")
+    used = 0
+    for index, line in enumerate(lines):
+        cost = count_tokens(line)
+        if used + cost > max_tokens:
+            if index == 0:
+                # Roughly four characters per token
+                return line[:max_tokens * 4]
+            return "\n".join(lines[:index])
+        used += cost
+    return result
+
+
+@lru_cache(maxsize=64)
+def compact_text(text, max_tokens):
+    """normalize_text() then fit_text(); cached, since /tool sends the same resume to several calls"""
+    return fit_text(normalize_text(text), max_tokens)
+
+
+def prompt_tokens(messages):
+    """Estimated prompt tokens of a chat message list or a prompt string, with per-message overhead"""
+    if isinstance(messages, str):
+        messages = [{"content": messages}]
+    return sum(count_tokens(m["content"]) + MESSAGE_OVERHEAD_TOKENS for m in messages)
+
+
+def completion_tokens(messages, requested, limit=CALL_TOKEN_LIMIT):
+    """
+    max_tokens for a call: what the prompt leaves of the per-call limit, capped at the requested
+    amount and never below MIN_COMPLETION_TOKENS. messages is a chat message list or a prompt string.
+    """
+    return max(MIN_COMPLETION_TOKENS, min(requested, limit - prompt_tokens(messages)))
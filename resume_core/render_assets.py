@@ -0,0 +1,97 @@
+# resume_core/render_assets.py
+import os
+import threading
+
+# Font used by the JPG renderer. Set RESUME_FONT_PATH to a .ttf file to skip probing the defaults.
+FONT_PATH = os.environ.get("RESUME_FONT_PATH", "")
+DEFAULT_FONT_CANDIDATES = ("arial.ttf", "/System/Library/Fonts/Arial.ttf")
+
+# Sizes the JPG renderer uses for name, headings and body text
+JPG_FONT_SIZES = {"large": 48, "medium": 32, "small": 24}
+
+_fonts = {}
+_font_paths = {}
+_styles = None
+_lock = threading.Lock()
+
+
+def _resolve_font_path(family):
+    """Find the first loadable font file for a family once; None means use PIL's default font"""
+    from PIL import ImageFont
+
+    if family in _font_paths:
+        return _font_paths[family]
+    candidates = (family,) if family else DEFAULT_FONT_CANDIDATES
+    resolved = None
+    for candidate in candidates:
+        try:
+            ImageFont.truetype(candidate, 12)
+            resolved = candidate
+            break
+        except (OSError, ImportError):
+            continue
+    if resolved is None:
+        print(f"No TrueType font found in {candidates}; using PIL's default font")
+    _font_paths[family] = resolved
+    return resolved
+
+
+def get_font(size, family=None):
+    """Return a cached PIL font for (family, size); family defaults to RESUME_FONT_PATH"""
+    family = family if family is not None else FONT_PATH
+    key = (family, size)
+    font = _fonts.get(key)
+    if font is None:
+        with _lock:
+            font = _fonts.get(key)
+            if font is None:
+                from PIL import ImageFont
+
+                path = _resolve_font_path(family)
+                font = ImageFont.truetype(path, size) if path else ImageFont.load_default()
+                _fonts[key] = font
+    return font
+
+
+def get_paragraph_styles():
+    """Return the shared reportlab styles for the PDF renderer: title, heading and normal"""
+    global _styles
+    if _styles is None:
+        with _lock:
+            if _styles is None:
+                from reportlab.lib import colors
+                from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+                base = getSampleStyleSheet()
+                _styles = {
+                    "title": ParagraphStyle(
+                        'CustomTitle',
+                        parent=base['Heading1'],
+                        fontSize=24,
+                        spaceAfter=30,
+                        alignment=1,  # Center alignment
+                        textColor=colors.darkblue
+                    ),
+                    "heading": ParagraphStyle(
+                        'CustomHeading',
+                        parent=base['Heading2'],
+                        fontSize=14,
+                        spaceAfter=12,
+                        spaceBefore=12,
+                        textColor=colors.darkblue
+                    ),
+                    "normal": ParagraphStyle(
+                        'CustomNormal',
+                        parent=base['Normal'],
+                        fontSize=10,
+                        spaceAfter=6
+                    ),
+                }
+    return _styles
+
+
+def warm_up():
+    """Load every font and style the renderers use so the first download does not pay for it"""
+    for size in JPG_FONT_SIZES.values():
+        get_font(size)
+    get_paragraph_styles()
@@ -0,0 +1,122 @@
+# resume_core/render_pool.py
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from resume_core.metrics import current_endpoint, record_error, render_admissions, render_duration, render_queue_wait, span
+
+MB = 1024 * 1024
+
+# Rough peak memory per render: the JPG canvas alone is 2480x3508 RGB (~26 MB) plus the encoded buffer
+RENDER_COSTS = {
+    "jpg": 32 * MB,
+    "pdf": 8 * MB,
+    "docx": 4 * MB,
+}
+
+
+class RenderBusyError(Exception):
+    """Raised when a render cannot be admitted within the queue timeout"""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Renderer is busy. Retry after {retry_after}s.")
+        self.retry_after = retry_after
+
+
+class RenderPool:
+    """
+    Dedicated executor for PDF/JPG/DOCX rendering.
+    Each job reserves an estimated number of bytes from a global memory budget before it is
+    admitted; jobs that cannot be admitted within `queue_timeout` seconds raise RenderBusyError.
+    """
+
+    def __init__(self, max_workers=4, memory_budget=256 * MB, queue_timeout=5.0):
+        self.max_workers = max_workers
+        self.memory_budget = memory_budget
+        self.queue_timeout = queue_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="render")
+        self._cond = threading.Condition()
+        self._reserved = 0
+        self._waiting = 0
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._latencies = deque(maxlen=512)
+
+    def run(self, func, *args, cost=8 * MB, **kwargs):
+        """Run func(*args, **kwargs) on the render executor once `cost` bytes of budget are free"""
+        # A single job larger than the whole budget is still allowed to run on its own
+        cost = min(cost, self.memory_budget)
+        queued_at = time.monotonic()
+        deadline = queued_at + self.queue_timeout
+        outcome = 'immediate'
+        with self._cond:
+            self._waiting += 1
+            try:
+                while self._reserved + cost > self.memory_budget:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._rejected += 1
+                        record_error(func.__name__, 'busy')
+                        render_admissions.inc(endpoint=current_endpoint(), renderer=func.__name__, outcome='rejected')
+                        raise RenderBusyError(self._retry_after())
+                    outcome = 'queued'
+                    self._cond.wait(remaining)
+            finally:
+                self._waiting -= 1
+            self._reserved += cost
+            self._in_flight += 1
+        render_admissions.inc(endpoint=current_endpoint(), renderer=func.__name__, outcome=outcome)
+        render_queue_wait.observe(time.monotonic() - queued_at, renderer=func.__name__)
+
+        started = time.perf_counter()
+        try:
+            with span(func.__name__):
+                return self._executor.submit(func, *args, **kwargs).result()
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            render_duration.observe(elapsed_ms / 1000, renderer=func.__name__)
+            with self._cond:
+                self._reserved -= cost
+                self._in_flight -= 1
+                self._completed += 1
+                self._latencies.append(elapsed_ms)
+                self._cond.notify_all()
+
+    def _retry_after(self):
+        # Expected time for the current backlog to drain through the workers
+        average_s = (sum(self._latencies) / len(self._latencies) / 1000) if self._latencies else 1.0
+        backlog = self._waiting + self._in_flight
+        return max(1, math.ceil(average_s * backlog / self.max_workers))
+
+    def stats(self):
+        with self._cond:
+            latencies = sorted(self._latencies)
+            stats = {
+                "workers": self.max_workers,
+                "in_flight": self._in_flight,
+                "queue_depth": self._waiting + max(0, self._in_flight - self.max_workers),
+                "reserved_bytes": self._reserved,
+                "memory_budget_bytes": self.memory_budget,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+        if latencies:
+            stats["latency_ms"] = {
+                "avg": round(sum(latencies) / len(latencies), 1),
+                "p50": round(latencies[len(latencies) // 2], 1),
+                "p95": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 1),
+                "max": round(latencies[-1], 1),
+            }
+        return stats
+
+
+# Process-wide pool shared by all download endpoints
+render_pool = RenderPool(
+    max_workers=int(os.environ.get("RENDER_WORKERS", "4")),
+    memory_budget=int(os.environ.get("RENDER_MEMORY_BUDGET_MB", "256")) * MB,
+    queue_timeout=float(os.environ.get("RENDER_QUEUE_TIMEOUT", "5")),
+)
@@ -0,0 +1,123 @@
+# resume_core/rendering.py
+import textwrap
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+from resume_core import render_assets
+from resume_core.layout import parse_layout
+
+# Every renderer consumes the same parse_layout() blocks, so the formats agree on
+# what is a title, heading, bullet or body line.
+# reportlab, python-docx and Pillow are imported on first use (or by the warm-up), not with the app.
+
+
+def create_pdf_resume(text):
+    """Create a PDF resume from text content"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+    try:
+        buffer = BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
+
+        # Shared styles, built once per process
+        styles = render_assets.get_paragraph_styles()
+        block_styles = {
+            'title': styles['title'],
+            'heading': styles['heading'],
+            'bullet': styles['normal'],
+            'text': styles['normal'],
+        }
+
+        content = []
+        for block in parse_layout(text):
+            if block.kind == 'blank':
+                content.append(Spacer(1, 6))
+                continue
+            # Paragraph treats its input as markup, so model output must be escaped
+            line = escape(block.text)
+            if block.kind == 'bullet':
+                line = '• ' + line
+            content.append(Paragraph(line, block_styles[block.kind]))
+
+        doc.build(content)
+        buffer.seek(0)
+        return buffer
+    except Exception as e:
+        print(f"Error creating PDF: {str(e)}")
+        return None
+
+
+def create_docx_resume(text):
+    """Create a DOCX resume from text content"""
+    from docx import Document
+
+    try:
+        doc = Document()
+        for block in parse_layout(text):
+            if block.kind == 'title':
+                doc.add_heading(block.text, level=0)
+            elif block.kind == 'heading':
+                doc.add_heading(block.text, level=2)
+            elif block.kind == 'bullet':
+                doc.add_paragraph(block.text, style='List Bullet')
+            else:
+                doc.add_paragraph(block.text)
+        buf = BytesIO()
+        doc.save(buf)
+        buf.seek(0)
+        return buf
+    except Exception as e:
+        print(f"Error creating DOCX: {str(e)}")
+        return None
+
+
+def create_jpg_resume(text):
+    """Create a JPG resume from text content"""
+    from PIL import Image, ImageDraw
+
+    try:
+        # Image dimensions
+        width, height = 2480, 3508  # A4 size at 300 DPI
+        image = Image.new('RGB', (width, height), 'white')
+        draw = ImageDraw.Draw(image)
+
+        # Fonts are resolved and loaded once per process (see RESUME_FONT_PATH)
+        sizes = render_assets.JPG_FONT_SIZES
+        dark_blue = (0, 0, 139)
+        black = (0, 0, 0)
+        block_fonts = {
+            'title': (render_assets.get_font(sizes['large']), dark_blue),
+            'heading': (render_assets.get_font(sizes['medium']), dark_blue),
+            'bullet': (render_assets.get_font(sizes['small']), black),
+            'text': (render_assets.get_font(sizes['small']), black),
+        }
+
+        y_position = 100
+        line_height = 60
+
+        for block in parse_layout(text):
+            if block.kind == 'blank':
+                y_position += 30
+                continue
+            if y_position > height - 100:
+                break
+
+            font, color = block_fonts[block.kind]
+            line = '- ' + block.text if block.kind == 'bullet' else block.text
+
+            # Wrap long lines
+            for wrapped_line in textwrap.wrap(line, width=80):
+                if y_position > height - 100:
+                    break
+                draw.text((100, y_position), wrapped_line, font=font, fill=color)
+                y_position += line_height
+
+        # Save to buffer
+        buffer = BytesIO()
+        image.save(buffer, format='JPEG', quality=95)
+        buffer.seek(0)
+        return buffer
+    except Exception as e:
+        print(f"Error creating JPG: {str(e)}")
+        return None
@@ -0,0 +1,220 @@
+# resume_core/singleflight.py
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import Future
+
+from flask import jsonify
+
+from resume_core.event_loop import run_sync
+from resume_core.cache import TieredCache
+from resume_core.metrics import coalesced_requests, current_endpoint
+from resume_core.storage import data_path
+
+# How long a completed result stays retrievable by its Idempotency-Key
+IDEMPOTENCY_RETENTION = float(os.environ.get("IDEMPOTENCY_RETENTION", str(24 * 3600)))
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+# Completed results by Idempotency-Key. On disk so a retry that lands on another worker process
+# of the same service is still answered; keys are namespaced by flight.
+idempotency_store = TieredCache(
+    os.environ.get("IDEMPOTENCY_CACHE_PATH", data_path("idempotency.sqlite3")),
+    table="idempotency",
+    max_memory_entries=int(os.environ.get("IDEMPOTENCY_MEMORY_ENTRIES", "256")),
+    max_disk_bytes=int(os.environ.get("IDEMPOTENCY_MAX_BYTES", str(64 * 1024 * 1024))),
+    ttl=IDEMPOTENCY_RETENTION,
+)
+
+
+class IdempotencyError(Exception):
+    """A request whose Idempotency-Key cannot be honoured; status_code is the HTTP status to answer with"""
+    status_code = 422
+
+
+class InvalidIdempotencyKeyError(IdempotencyError):
+    """Raised for an empty or overlong Idempotency-Key"""
+    status_code = 400
+
+
+class IdempotencyKeyReusedError(IdempotencyError):
+    """Raised when an Idempotency-Key is sent again with different inputs"""
+    status_code = 422
+
+
+def _normalize(value):
+    # Line endings and trailing whitespace differ between browsers and clipboard sources but
+    # never change the answer
+    if isinstance(value, str):
+        lines = value.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+        return "\n".join(line.rstrip() for line in lines).strip()
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def request_key(inputs):
+    """Hash of a request's normalized inputs; identical requests get the same key"""
+    encoded = json.dumps(_normalize(inputs), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def replay_headers(replayed):
+    """Response headers marking a result that was produced for an earlier request"""
+    return {REPLAYED_HEADER: "true"} if replayed else {}
+
+
+def install(app):
+    """Answer IdempotencyError with its status code"""
+
+    @app.errorhandler(IdempotencyError)
+    def _idempotency_error(e):
+        return jsonify({'error': str(e)}), e.status_code
+
+
+class SingleFlight:
+    """
+    Runs one computation per distinct request at a time. A request whose key (see request_key) matches
+    one already in flight waits for that computation and gets its result instead of starting another.
+
+    A caller may also pass the client's Idempotency-Key: a request repeating a key is answered with the
+    in-progress or completed result of the first request that sent it, for IDEMPOTENCY_RETENTION
+    seconds. Only successful results are retained, so a retry after a failure runs again.
+
+    do() is for threads, do_async() for the event loop; both share the same in-flight table, so a
+    request served by the sync pool and one served by an async view still coalesce. Both return
+    (result, replayed), where replayed is True when the result belongs to an earlier Idempotency-Key
+    request. Results must be JSON-serializable to be retained.
+    """
+
+    def __init__(self, name, store=idempotency_store):
+        self.name = name
+        self.store = store
+        self._lock = threading.Lock()
+        self._inflight = {}
+        # Idempotency-Key -> (request key, future) until the result is in the store
+        self._pending_keys = {}
+        # Computations started by do_async, referenced until they finish
+        self._tasks = set()
+
+    def do(self, key, func, *args, idempotency_key=None, **kwargs):
+        """func(*args, **kwargs), shared with identical concurrent requests"""
+        store_key = self._store_key(idempotency_key)
+        if store_key is not None:
+            stored = self.store.get(store_key)
+            if stored is not None:
+                return self._replay(key, stored), True
+
+        future, leader, replayed = self._join(key, store_key)
+        if leader:
+            try:
+                future.set_result(func(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                self._leave(key, future)
+        return self._settle(future, key, store_key), replayed
+
+    async def do_async(self, key, func, *args, idempotency_key=None, **kwargs):
+        """await func(*args, **kwargs), shared with identical concurrent requests"""
+        store_key = self._store_key(idempotency_key)
+        if store_key is not None:
+            stored = await run_sync(self.store.get, store_key)
+            if stored is not None:
+                return self._replay(key, stored), True
+
+        future, leader, replayed = self._join(key, store_key)
+        if leader:
+            # The computation is a task of its own, so the leader's client disconnecting cancels only
+            # the leader's wait and the followers still get the result
+            task = asyncio.get_running_loop().create_task(self._lead(future, key, store_key, func, args, kwargs))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        await asyncio.shield(asyncio.wrap_future(future))
+        return future.result(), replayed
+
+    async def _lead(self, future, key, store_key, func, args, kwargs):
+        try:
+            future.set_result(await func(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            self._leave(key, future)
+        if store_key is None:
+            return
+        # Retained here rather than by a waiter, since every waiter may have gone away by now
+        if future.exception() is None:
+            await run_sync(self._settle, future, key, store_key)
+        else:
+            self._release(store_key, future)
+
+    def _store_key(self, idempotency_key):
+        if idempotency_key is None:
+            return None
+        idempotency_key = idempotency_key.strip()
+        if not idempotency_key or len(idempotency_key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+            raise InvalidIdempotencyKeyError(
+                f"Idempotency-Key must be 1 to {MAX_IDEMPOTENCY_KEY_LENGTH} characters.")
+        return f"{self.name}:{idempotency_key}"
+
+    def _replay(self, key, stored):
+        entry = json.loads(stored)
+        if entry["key"] != key:
+            raise IdempotencyKeyReusedError("This Idempotency-Key was already used for a different request.")
+        coalesced_requests.inc(endpoint=current_endpoint(), source="idempotency")
+        return entry["result"]
+
+    def _join(self, key, store_key):
+        """(future, leader, replayed) for this request, registering a new computation if there is none"""
+        with self._lock:
+            pending = self._pending_keys.get(store_key) if store_key is not None else None
+            if pending is not None:
+                if pending[0] != key:
+                    raise IdempotencyKeyReusedError("This Idempotency-Key was already used for a different request.")
+                future, leader, source = pending[1], False, "idempotency"
+            elif key in self._inflight:
+                future, leader, source = self._inflight[key], False, "inflight"
+            else:
+                future, leader, source = Future(), True, None
+                self._inflight[key] = future
+            if store_key is not None and pending is None:
+                self._pending_keys[store_key] = (key, future)
+        if source is not None:
+            coalesced_requests.inc(endpoint=current_endpoint(), source=source)
+        return future, leader, source == "idempotency"
+
+    def _leave(self, key, future):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def _settle(self, future, key, store_key):
+        """The future's result, retained under store_key first so later retries find it"""
+        try:
+            result = future.result()
+        except BaseException:
+            self._release(store_key, future)
+            raise
+        if store_key is not None:
+            try:
+                self.store.set(store_key, json.dumps({"key": key, "result": result}))
+            except (TypeError, ValueError) as e:
+                print(f"Idempotency store error ({self.name}): {str(e)}")
+            self._release(store_key, future)
+        return result
+
+    def _release(self, store_key, future):
+        if store_key is None:
+            return
+        with self._lock:
+            pending = self._pending_keys.get(store_key)
+            if pending is not None and pending[1] is future:
+                del self._pending_keys[store_key]
+
+    def stats(self):
+        with self._lock:
+            return {"inflight": len(self._inflight), "pending_idempotency_keys": len(self._pending_keys)}
@@ -0,0 +1,135 @@
+# resume_core/skills.py
+import json
+import os
+import threading
+from collections import deque
+
+TAXONOMY_PATH = os.environ.get(
+    "SKILLS_TAXONOMY_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "skills_taxonomy.json"),
+)
+
+# Characters that make a match part of a longer token ("java" in "javascript", "ml" in "html")
+_WORD_EXTRA = set('+#_')
+
+
+def _joins_before(char):
+    return char.isalnum() or char in _WORD_EXTRA or char in '.@'
+
+
+def _joins_after(text, index):
+    char = text[index]
+    if char.isalnum() or char in _WORD_EXTRA:
+        return True
+    # "vue" in "vue.js", but not "Python." at the end of a sentence
+    return char == '.' and index + 1 < len(text) and text[index + 1].isalnum()
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over every canonical skill name and alias in the taxonomy.
+    find() scans text once, whatever the number of patterns, and returns canonical names.
+    Entries marked "exact" (Go, R, Swift...) only match with their canonical casing,
+    so everyday words do not count as skills.
+    """
+
+    def __init__(self, taxonomy):
+        self.categories = {}
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for name, entry in taxonomy.items():
+            self.categories[name] = entry.get('category')
+            self._add(name.lower(), name, name if entry.get('exact') else None)
+            for alias in entry.get('aliases', ()):
+                self._add(alias.lower(), name, None)
+        self._build()
+
+    def _add(self, pattern, canonical, exact):
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = next_node
+        self._out[node].append((len(pattern), canonical, exact))
+
+    def _build(self):
+        # Breadth-first failure links; each node also reports the matches of its failure node
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find(self, text):
+        """Canonical skills mentioned in text, in order of first mention"""
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few characters lowercase to two; keep positions aligned with the original
+            lowered = ''.join(c.lower() if len(c.lower()) == 1 else c for c in text)
+        goto, fail, out = self._goto, self._fail, self._out
+        end = len(lowered)
+        found = {}
+        node = 0
+        for index, char in enumerate(lowered):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for length, canonical, exact in out[node]:
+                if canonical in found:
+                    continue
+                start = index - length + 1
+                if start > 0 and _joins_before(lowered[start - 1]):
+                    continue
+                if index + 1 < end and _joins_after(lowered, index + 1):
+                    continue
+                if exact is not None and text[start:index + 1] != exact:
+                    continue
+                found[canonical] = None
+        return list(found)
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def get_matcher():
+    """The process-wide matcher, compiled from the taxonomy file on first use"""
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                with open(TAXONOMY_PATH, encoding='utf-8') as f:
+                    _matcher = SkillMatcher(json.load(f))
+    return _matcher
+
+
+def extract_skills(text):
+    """Canonical skill names found in text"""
+    return get_matcher().find(text or '')
+
+
+def skill_gap(resume_text, job_description):
+    """
+    Compare resume and job description skills:
+    { matched: in both, missing: wanted by the job but not in the resume, additional: resume only }
+    """
+    resume_skills = extract_skills(resume_text)
+    job_skills = extract_skills(job_description)
+    resume_set, job_set = set(resume_skills), set(job_skills)
+    return {
+        'matched': [skill for skill in job_skills if skill in resume_set],
+        'missing': [skill for skill in job_skills if skill not in resume_set],
+        'additional': [skill for skill in resume_skills if skill not in job_set],
+    }
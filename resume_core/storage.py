@@ -0,0 +1,33 @@
+# resume_core/storage.py
+import os
+
+# Private on-disk state shared by both services (extracted resume text, idempotent results, job
+# payloads). It holds PII, so it lives in a directory only this user can read rather than the
+# host's shared temp dir.
+DATA_DIR = os.environ.get(
+    "RESUME_DATA_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data"),
+)
+
+
+def data_path(name):
+    """Default location of a data file `name` inside DATA_DIR"""
+    return os.path.join(DATA_DIR, name)
+
+
+def private_dir(path):
+    """Create directory `path` (0700 if new) and return it"""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    return path
+
+
+def create_private_file(path):
+    """
+    Create `path` with 0600 permissions unless it already exists. SQLite gives its -wal and -shm
+    files the mode of the database file, so this covers those too.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        private_dir(directory)
+    os.close(os.open(path, os.O_CREAT | os.O_WRONLY, 0o600))
+    return path
@@ -0,0 +1,49 @@
+# resume_core/warmup.py
+import os
+import threading
+import time
+
+# Heavy dependencies are imported on first use. Warm-up loads them ahead of the first request,
+# when a server entry point starts the app's background work (not on import):
+#   background (default) - in a daemon thread, so the app starts serving immediately
+#   eager                - before the server starts serving (slower start, no first-request cost)
+#   off                  - never; each dependency loads when a request first needs it
+WARM_UP_MODE = os.environ.get("WARM_UP", "background").lower()
+
+
+def _core_hooks():
+    from resume_core import extraction, render_assets, skills
+    from resume_core.llm_client import get_client
+
+    return [
+        ('llm_client', get_client),
+        ('render_assets', render_assets.warm_up),
+        # The PDF and DOCX parsers are loaded in the extraction workers, not in this process
+        ('extraction_workers', extraction.warm_up),
+        ('skills', skills.get_matcher),
+    ]
+
+
+def run(hooks=()):
+    """Run the shared warm-up hooks, then the app's own (name, callable) hooks"""
+    started = time.perf_counter()
+    for name, hook in _core_hooks() + list(hooks):
+        try:
+            hook()
+        except Exception as e:
+            # A failed warm-up only means the first request pays for it
+            print(f"Warm-up step '{name}' failed: {str(e)}")
+    print(f"Warm-up finished in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+
+def start(hooks=(), mode=None):
+    """Warm up according to WARM_UP (or mode): in the background, inline, or not at all"""
+    mode = (mode or WARM_UP_MODE).lower()
+    if mode == 'off':
+        return None
+    if mode == 'eager':
+        run(hooks)
+        return None
+    thread = threading.Thread(target=run, args=(hooks,), name="warm-up", daemon=True)
+    thread.start()
+    return thread
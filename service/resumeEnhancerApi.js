@@ -3,11 +3,20 @@ import axios from 'axios';
 
 const BASE = import.meta.env.VITE_RESUME_ENHANCER_API || 'http://localhost:5001';
 
-export async function enhanceResume(payload) {
+// One key per logical request; a caller that resends the same request passes the same key, so the
+// backend runs the enhancement once and answers the repeat with the first result
+function newIdempotencyKey() {
+  return globalThis.crypto?.randomUUID?.() || `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+}
+
+export async function enhanceResume(payload, idempotencyKey = newIdempotencyKey()) {
   // payload: FormData or {text, jobDescription}
   const url = `${BASE}/tool`;
   const res = await axios.post(url, payload, {
-    headers: payload instanceof FormData ? {'Content-Type': 'multipart/form-data'} : {'Content-Type':'application/json'},
+    headers: {
+      'Content-Type': payload instanceof FormData ? 'multipart/form-data' : 'application/json',
+      'Idempotency-Key': idempotencyKey,
+    },
   });
   return res.data;
 }
@@ -0,0 +1,6 @@
+# tests/conftest.py
+import os
+import sys
+
+# resume_core is imported from the repo root, as the backends do
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,57 @@
+# tests/test_bulk.py
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'career-guidance-backend'))
+
+from bulk import BulkAnalyzer, BulkBusyError  # noqa: E402
+
+
+def spool(tmp_path, name, data=b'not a resume'):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def wait_until_completed(analyzer, job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status = analyzer.status(job_id)
+        if status['status'] == 'completed':
+            return status
+        time.sleep(0.02)
+    raise AssertionError("bulk job did not complete")
+
+
+def test_items_fail_individually(tmp_path):
+    analyzer = BulkAnalyzer(lambda text: {'ok': True}, str(tmp_path / "jobs.sqlite3"), workers=2)
+    analyzer.queue.poll_interval = 0.02
+    analyzer.start()
+    notes = spool(tmp_path, 'notes.txt')
+    job_id = analyzer.submit([('notes.txt', notes), ('huge.pdf', None)])
+
+    status = wait_until_completed(analyzer, job_id)
+    assert (status['total'], status['completed'], status['failed']) == (2, 0, 2)
+    assert [item['filename'] for item in status['items']] == ['notes.txt', 'huge.pdf']
+    assert 'Only PDF' in status['items'][0]['error']
+    assert 'too large' in status['items'][1]['error']
+    assert not os.path.exists(notes)
+
+
+def test_unknown_job(tmp_path):
+    assert BulkAnalyzer(lambda text: None, str(tmp_path / "jobs.sqlite3")).status('missing') is None
+
+
+def test_rejects_submissions_while_full_of_live_jobs(tmp_path):
+    # No workers are started, so the first job stays queued
+    analyzer = BulkAnalyzer(lambda text: None, str(tmp_path / "jobs.sqlite3"), max_active=1)
+    first = analyzer.submit([('a.pdf', spool(tmp_path, 'a.pdf'))])
+    rejected = spool(tmp_path, 'b.pdf')
+    with pytest.raises(BulkBusyError):
+        analyzer.submit([('b.pdf', rejected)])
+    assert not os.path.exists(rejected)
+    # The live job is still there to poll
+    assert analyzer.status(first)['status'] == 'queued'
@@ -0,0 +1,30 @@
+# tests/test_cache.py
+import os
+import stat
+import sys
+
+import pytest
+
+from resume_core.cache import TieredCache
+
+
+def test_round_trip_and_disk_hit(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    TieredCache(path).set("k", "v")
+    fresh = TieredCache(path)
+    assert fresh.get("k") == "v"
+    assert fresh.stats()["disk_hits"] == 1
+
+
+def test_expired_entries_miss(tmp_path):
+    cache = TieredCache(str(tmp_path / "cache.sqlite3"), ttl=0)
+    cache.set("k", "v")
+    assert cache.get("k") is None
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX permissions")
+def test_database_is_private(tmp_path):
+    path = tmp_path / "data" / "cache.sqlite3"
+    TieredCache(str(path)).set("k", "v")
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert stat.S_IMODE(os.stat(path.parent).st_mode) == 0o700
@@ -0,0 +1,46 @@
+# tests/test_extraction.py
+import time
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+import pytest
+
+from resume_core import extraction
+from resume_core.extraction import UnsupportedFileError
+
+
+def docx_bytes(*paragraphs):
+    from docx import Document
+
+    doc = Document()
+    for paragraph in paragraphs:
+        doc.add_paragraph(paragraph)
+    buf = BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def test_extracts_docx_in_worker():
+    text = extraction.extract_text_isolated(docx_bytes("Jane Doe", "Python developer"), "resume.docx")
+    assert text.splitlines() == ["Jane Doe", "Python developer"]
+
+
+def test_unsupported_file():
+    with pytest.raises(UnsupportedFileError):
+        extraction.extract_text(b"plain", "resume.txt")
+
+
+def test_recycle_kills_stuck_worker():
+    pool = extraction._get_pool()
+    # Block every worker, so each one has started and reported its PID
+    stuck = [pool.submit(time.sleep, 60) for _ in range(extraction.EXTRACTION_WORKERS)]
+    time.sleep(1)
+    started = time.monotonic()
+    extraction._recycle_pool(pool)
+    for future in stuck:
+        with pytest.raises(BrokenProcessPool):
+            future.result(timeout=10)
+    assert time.monotonic() - started < 10
+    # The next job gets a fresh pool
+    assert extraction._get_pool() is not pool
+
@@ -0,0 +1,54 @@
+# tests/test_job_queue.py
+import time
+
+from resume_core.job_queue import JobQueue
+
+
+def wait_for(queue, job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.get(job_id)
+        if job['status'] in ('done', 'error'):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_runs_jobs_and_records_errors(tmp_path):
+    def fail():
+        raise ValueError("bad input")
+
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), {'echo': lambda value: {'value': value}, 'fail': fail},
+                     poll_interval=0.02)
+    queue.start()
+    assert wait_for(queue, queue.enqueue('echo', {'value': 3}))['result'] == {'value': 3}
+    failed = wait_for(queue, queue.enqueue('fail', {}))
+    assert failed['status'] == 'error' and failed['error'] == "bad input"
+
+
+def test_heartbeat_keeps_long_job_leased(tmp_path):
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.5)
+        return 'ok'
+
+    # The handler outlives several leases; without renewal the second worker would run it again
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), {'slow': slow}, lease_seconds=0.15, poll_interval=0.02)
+    queue.start()
+    job = wait_for(queue, queue.enqueue('slow', {}))
+    assert job['status'] == 'done'
+    assert job['attempts'] == 1
+    assert len(calls) == 1
+
+
+def test_finish_ignored_after_lease_lost(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), {'noop': lambda: None})
+    job_id = queue.enqueue('noop', {})
+    claimed_id, _, _, attempt = queue._claim()
+    assert claimed_id == job_id
+    # Another process takes the job over once our lease has expired
+    queue._db().execute("UPDATE jobs SET owner = 'elsewhere:1', attempts = attempts + 1 WHERE id = ?", (job_id,))
+    assert not queue._finish(job_id, attempt, 'done', result='stale')
+    assert queue.get(job_id)['status'] == 'running'
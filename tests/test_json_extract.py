@@ -0,0 +1,78 @@
+# tests/test_json_extract.py
+import pytest
+
+from resume_core.json_extract import JsonExtractionError, JsonObjectScanner, extract_json_object
+
+
+def scan_in_chunks(text, size):
+    scanner = JsonObjectScanner()
+    for start in range(0, len(text), size):
+        scanner.feed(text[start:start + size])
+    return scanner.finish()
+
+
+def test_clean_object():
+    assert extract_json_object('{"a": 1, "b": [true, null]}') == {"a": 1, "b": [True, None]}
+
+
+def test_trailing_commas():
+    assert extract_json_object('{"skills": ["python", "sql",], "years": 3,}') == {"skills": ["python", "sql"], "years": 3}
+
+
+def test_code_fence_and_prose():
+    text = 'Here is the analysis:\n```json\n{"score": 82, "gaps": ["docker"]}\n```\nLet me know!'
+    assert extract_json_object(text) == {"score": 82, "gaps": ["docker"]}
+
+
+def test_truncated_response():
+    scanner = JsonObjectScanner()
+    scanner.feed('{"summary": "Strong backend engineer", "skills": ["python", "go')
+    assert scanner.finish() == {"summary": "Strong backend engineer", "skills": ["python", "go"]}
+    assert scanner.truncated
+
+
+def test_single_quotes_and_python_literals():
+    assert extract_json_object("{'name': 'Ana', 'remote': True, 'manager': None}") == {"name": "Ana", "remote": True, "manager": None}
+
+
+def test_escaped_single_quote_in_single_quoted_string():
+    assert extract_json_object("{'note': 'it\\'s fine'}") == {"note": "it's fine"}
+
+
+def test_raw_newlines_in_strings():
+    assert extract_json_object('{"summary": "line one\nline two\ttabbed"}') == {"summary": "line one\nline two\ttabbed"}
+
+
+def test_invalid_escapes_keep_backslash():
+    assert extract_json_object('{"path": "C:\\Users\\x", "re": "\\d+"}') == {"path": "C:\\Users\\x", "re": "\\d+"}
+
+
+def test_backslash_before_quote_stays_escape():
+    assert extract_json_object('{"q": "say \\"hi\\""}') == {"q": 'say "hi"'}
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('{"a": "\\u00e9t\\u"}', "\u00e9t\\u"),
+    ('{"a": "\\user"}', "\\user"),
+    ('{"a": "\\u12"}', "\\u12"),
+    ('{"a": "caf\\u00e9"}', "caf\u00e9"),
+])
+def test_short_unicode_escapes(text, expected):
+    assert extract_json_object(text) == {"a": expected}
+
+
+def test_unicode_escape_truncated_at_end_of_input():
+    scanner = JsonObjectScanner()
+    scanner.feed('{"a": "x\\u00')
+    assert scanner.finish() == {"a": "x\\u00"}
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7])
+def test_chunked_feed_matches_whole_input(size):
+    text = '```json\n{"path": "C:\\Users\\x", "name": "Jos\\u00e9", "tags": [\'a\', "b",],}\n```'
+    assert scan_in_chunks(text, size) == {"path": "C:\\Users\\x", "name": "Jos\u00e9", "tags": ["a", "b"]}
+
+
+def test_no_object():
+    with pytest.raises(JsonExtractionError):
+        extract_json_object("I could not analyze this resume.")
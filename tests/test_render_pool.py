@@ -0,0 +1,42 @@
+# tests/test_render_pool.py
+import threading
+
+import pytest
+
+from resume_core.metrics import REGISTRY, render_pool_collector
+from resume_core.render_pool import MB, RenderBusyError, RenderPool
+
+
+def test_rejects_when_budget_stays_full():
+    pool = RenderPool(max_workers=2, memory_budget=10 * MB, queue_timeout=0.05)
+    started, release = threading.Event(), threading.Event()
+
+    def hold():
+        started.set()
+        release.wait(5)
+
+    holder = threading.Thread(target=pool.run, args=(hold,), kwargs={'cost': 10 * MB})
+    holder.start()
+    started.wait(5)
+    with pytest.raises(RenderBusyError) as busy:
+        pool.run(lambda: None, cost=1 * MB)
+    assert busy.value.retry_after >= 1
+
+    gauges = {name: samples[0][1] for name, _, _, samples in render_pool_collector(pool)()}
+    assert gauges['render_in_flight'] == 1
+    assert gauges['render_reserved_bytes'] == 10 * MB
+    release.set()
+    holder.join(5)
+    assert pool.stats()['rejected'] == 1
+    assert 'renderer="<lambda>",outcome="rejected"} 1' in REGISTRY.render()
+
+
+def test_queued_job_runs_once_budget_frees():
+    pool = RenderPool(max_workers=2, memory_budget=10 * MB, queue_timeout=5)
+    release = threading.Event()
+    holder = threading.Thread(target=pool.run, args=(release.wait, 5), kwargs={'cost': 10 * MB})
+    holder.start()
+    threading.Timer(0.05, release.set).start()
+    assert pool.run(lambda: 'rendered', cost=1 * MB) == 'rendered'
+    holder.join(5)
+    assert pool.stats()['completed'] == 2
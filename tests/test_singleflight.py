@@ -0,0 +1,66 @@
+# tests/test_singleflight.py
+import asyncio
+import threading
+
+import pytest
+
+from resume_core.cache import TieredCache
+from resume_core.singleflight import IdempotencyKeyReusedError, SingleFlight
+
+
+@pytest.fixture
+def flight(tmp_path):
+    return SingleFlight("test", store=TieredCache(str(tmp_path / "idempotency.sqlite3"), table="idempotency"))
+
+
+def test_concurrent_identical_requests_share_one_call(flight):
+    calls = []
+    release = threading.Event()
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return {"ok": True}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("k", compute))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    while flight.stats()["inflight"] == 0:
+        pass
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert len(calls) == 1
+    assert [result for result, _ in results] == [{"ok": True}] * 4
+
+
+def test_idempotency_key_replays_and_rejects_other_inputs(flight):
+    assert flight.do("k1", lambda: 1, idempotency_key="abc") == (1, False)
+    assert flight.do("k1", lambda: 2, idempotency_key="abc") == (1, True)
+    with pytest.raises(IdempotencyKeyReusedError):
+        flight.do("k2", lambda: 3, idempotency_key="abc")
+
+
+def test_leader_cancellation_does_not_reach_followers(flight):
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def scenario():
+        leader = asyncio.create_task(flight.do_async("k", compute, idempotency_key="abc"))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(flight.do_async("k", compute))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(scenario()) == ("done", False)
+    assert len(calls) == 1
+    # The abandoned leader's result is still retained for its Idempotency-Key
+    assert flight.do("k", lambda: "again", idempotency_key="abc") == ("done", True)